@@ -0,0 +1,96 @@
+"""Meet de cold start van de backend.
+
+Gebruik (vanuit backend/):
+    python scripts/bench_startup.py [--runs 5] [--port 8765]
+
+Meet per run in een vers proces:
+- hoe lang ``import src.app`` duurt;
+- hoe lang het duurt tot uvicorn op /health antwoordt;
+- hoe lang het duurt tot /ready 200 geeft (warm-up klaar).
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Dummy credentials zodat de Azure clients geconstrueerd kunnen worden
+_ENV = {
+    "AZURE_OPENAI_API_KEY": "bench",
+    "AZURE_OPENAI_ENDPOINT": "https://bench.openai.azure.com/",
+}
+
+
+def measure_import() -> float:
+    code = (
+        "import time; t = time.perf_counter(); import src.app; "
+        "print(time.perf_counter() - t)"
+    )
+    output = subprocess.check_output(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **_ENV},
+    )
+    return float(output.strip())
+
+
+def measure_server(port: int, timeout: float = 60.0) -> tuple[float, float]:
+    """Start uvicorn en geef (tijd tot /health, tijd tot /ready) terug."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app:app", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **_ENV},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        health = _wait_for(f"http://127.0.0.1:{port}/health", started, timeout)
+        ready = _wait_for(f"http://127.0.0.1:{port}/ready", started, timeout)
+        return health, ready
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _wait_for(url: str, started: float, timeout: float) -> float:
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.02)
+    raise TimeoutError(f"{url} antwoordde niet binnen {timeout} seconden")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    servers = [measure_server(args.port) for _ in range(args.runs)]
+
+    def row(label: str, values: list[float]) -> str:
+        return (
+            f"{label:<22} median {statistics.median(values):6.3f}s   "
+            f"min {min(values):6.3f}s   max {max(values):6.3f}s"
+        )
+
+    print(row("import src.app", imports))
+    print(row("eerste /health", [health for health, _ in servers]))
+    print(row("eerste /ready 200", [ready for _, ready in servers]))
+
+
+if __name__ == "__main__":
+    main()
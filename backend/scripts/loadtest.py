@@ -0,0 +1,443 @@
+"""Loadtest van één backend-worker met lokale stand-ins voor alle externe diensten.
+
+Gebruik (vanuit backend/):
+    python scripts/loadtest.py [--levels 1,4,16,64] [--llm-median 0.8] [--fetch-median 0.15]
+
+Per concurrency-niveau start een vers serverproces waarin Azure OpenAI,
+de zoekbackends, het ophalen van webpagina's en de e-mail zijn vervangen door
+stand-ins met lognormaal verdeelde latency. Daarna doorlopen N gelijktijdige
+clients elk de gebruikersflow: /api/search-tool, /api/check (SSE),
+/api/lead en /api/report. Gerapporteerd worden de doorvoer, de tijd tot het
+eerste SSE-event, de p50/p99 van de checkduur, de event-loop lag van de
+server (uit /metrics) en het piek-RSS van het serverproces.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Dummy credentials; alle aanroepen gaan naar de stand-ins
+_ENV = {
+    "AZURE_OPENAI_API_KEY": "loadtest",
+    "AZURE_OPENAI_ENDPOINT": "https://loadtest.openai.azure.com/",
+    "WARM_UP_ON_STARTUP": "false",
+}
+
+
+def sample_latency(median: float, sigma: float) -> float:
+    """Lognormale latency: de mediaan ligt vast, sigma bepaalt de staart."""
+    if median <= 0:
+        return 0.0
+    return random.lognormvariate(0.0, sigma) * median
+
+
+# --- Serverkant: stand-ins ----------------------------------------------------
+
+
+def install_stand_ins(args: argparse.Namespace) -> None:
+    """Vervang Azure OpenAI, zoeken, fetch en e-mail door lokale stand-ins."""
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+    from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+    from src.agent import llm
+    from src.agent.progress import TOTAL_CHECKS
+    from src.api import routes
+    from src.config import settings
+    from src.fetch import client
+    from src.search import fanout
+    from src.search.backends import StandInBackend
+
+    pages = args.pages_per_check
+
+    def final_answer(tool_name: str) -> str:
+        checks = [
+            {
+                "name": f"Check {i + 1}",
+                "description": "Stand-in check",
+                "status": random.choice(["green", "orange", "red"]),
+                "finding": "Gevonden in de stand-in privacy policy. " * 4,
+                "sources": [{"url": f"https://{tool_name}.example/privacy", "title": "Privacy"}],
+            }
+            for i in range(TOTAL_CHECKS)
+        ]
+        return json.dumps(
+            {
+                "tool_name": tool_name,
+                "tool_url": f"https://{tool_name}.example",
+                "overall_status": "orange",
+                "summary": "Stand-in resultaat voor de loadtest.",
+                "categories": [
+                    {"name": "Dataopslag & Verwerking", "status": "orange", "summary": "", "checks": checks}
+                ],
+                "sub_processors": [
+                    {"name": f"Sub {i}", "purpose": "Hosting", "data_location": "EU", "status": "green"}
+                    for i in range(5)
+                ],
+                "sources_consulted": [],
+            }
+        )
+
+    class StandInChatModel(BaseChatModel):
+        """Speelt een ReAct-run na: zoeken, discovery, N fetches, dan de JSON."""
+
+        @property
+        def _llm_type(self) -> str:
+            return "loadtest-stand-in"
+
+        def bind_tools(self, tools, **kwargs):
+            return self
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            raise NotImplementedError
+
+        def _next_message(self, messages) -> AIMessage:
+            prompt = str(next(m for m in messages if isinstance(m, HumanMessage)).content)
+            if "voor de tool:" not in prompt:
+                # /api/search-tool: naam-extractie
+                query = prompt.split('"')[1] if '"' in prompt else "tool"
+                return AIMessage(content=json.dumps([{"name": query, "url": ""}]))
+
+            tool_name = prompt.split("voor de tool:")[1].split(". Zoek")[0].strip()
+            tool_name = tool_name.lower().replace(" ", "-")
+            done = sum(isinstance(m, ToolMessage) for m in messages)
+            if done == 0:
+                call = ("web_search", {"query": f"{tool_name} privacy policy"})
+            elif done == 1:
+                call = ("find_compliance_pages", {"domain": f"{tool_name}.example"})
+            elif done < 2 + pages:
+                call = ("fetch_webpage", {"url": f"https://{tool_name}.example/page-{done}"})
+            else:
+                return AIMessage(content=final_answer(tool_name))
+            name, tool_args = call
+            return AIMessage(
+                content="",
+                tool_calls=[{"name": name, "args": tool_args, "id": f"call_{uuid.uuid4().hex[:8]}"}],
+            )
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            await asyncio.sleep(sample_latency(args.llm_median, args.sigma))
+            return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+        async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+            message = self._next_message(messages)
+            await asyncio.sleep(sample_latency(args.llm_median, args.sigma))
+            usage = {"input_tokens": 3000, "output_tokens": 500, "total_tokens": 3500}
+            if message.tool_calls:
+                call = message.tool_calls[0]
+                yield ChatGenerationChunk(
+                    message=AIMessageChunk(
+                        content="",
+                        tool_call_chunks=[
+                            {
+                                "name": call["name"],
+                                "args": json.dumps(call["args"]),
+                                "id": call["id"],
+                                "index": 0,
+                            }
+                        ],
+                        usage_metadata=usage,
+                    )
+                )
+                return
+            text = message.content
+            step = 64
+            for start in range(0, len(text), step):
+                # Ongeveer de doorvoer van een echte deployment
+                await asyncio.sleep(step / 4 / args.llm_tokens_per_second)
+                yield ChatGenerationChunk(message=AIMessageChunk(content=text[start:start + step]))
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage))
+
+    def build_chat_model(call_type: str, temperature: float, response_format: dict | None = None):
+        # Geen response_format: de stand-in geeft het eindresultaat al als geldige JSON
+        return llm.ResilientChatModel(
+            call_type=call_type,
+            targets=[StandInChatModel()],
+            timeout=settings.llm_timeout_seconds,
+            max_retries=settings.llm_max_retries,
+        )
+
+    def search_results(query: str, max_results: int):
+        slug = query.split()[0].lower()
+        return [
+            (f"{slug} result {i}", f"https://{slug}.example/{i}", "...")
+            for i in range(max_results)
+        ]
+
+    page_html = (
+        "<html><head><title>Privacy</title></head><body><main>"
+        + "<p>We process personal data in the EU and use sub-processors.</p>" * 80
+        + "</main></body></html>"
+    ).encode()
+
+    async def fetch_handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(sample_latency(args.fetch_median, args.sigma))
+        if request.url.path in ("/robots.txt", "/sitemap.xml", "/sitemap_index.xml"):
+            return httpx.Response(404)
+        return httpx.Response(200, content=page_html, headers={"content-type": "text/html"})
+
+    async def send_lead_email(lead) -> bool:
+        await asyncio.sleep(sample_latency(args.fetch_median, args.sigma))
+        return True
+
+    llm.build_chat_model = build_chat_model
+    fanout._service = fanout.SearchService(
+        [
+            StandInBackend(
+                "stand-in",
+                search_results,
+                latency=lambda: sample_latency(args.search_median, args.sigma),
+            )
+        ],
+        fanout=1,
+    )
+    routes.send_lead_email = send_lead_email
+    client._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(fetch_handler), follow_redirects=True
+    )
+
+
+def serve(args: argparse.Namespace) -> None:
+    import logging
+
+    import uvicorn
+
+    from src.app import app
+
+    # Alleen waarschuwingen (zoals geblokkeerde event loops) tijdens de meting
+    logging.getLogger().setLevel(logging.WARNING)
+
+    install_stand_ins(args)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+# --- Clientkant -----------------------------------------------------------------
+
+
+class ClientResult:
+    def __init__(self):
+        self.ok = False
+        self.first_event: float | None = None
+        self.check_seconds: float | None = None
+        self.search_seconds: float | None = None
+        self.report_seconds: float | None = None
+        self.error: str | None = None
+
+
+async def run_client(http: httpx.AsyncClient, base: str, tool_name: str) -> ClientResult:
+    result = ClientResult()
+    try:
+        started = time.perf_counter()
+        response = await http.get(f"{base}/api/search-tool", params={"q": tool_name})
+        response.raise_for_status()
+        result.search_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        got_result = False
+        async with http.stream("POST", f"{base}/api/check", json={"tool_name": tool_name}) as sse:
+            sse.raise_for_status()
+            async for line in sse.aiter_lines():
+                if line.startswith("event:"):
+                    if result.first_event is None:
+                        result.first_event = time.perf_counter() - started
+                    if line.strip() == "event: result":
+                        got_result = True
+                    elif line.strip() == "event: error":
+                        result.error = "error event"
+        result.check_seconds = time.perf_counter() - started
+        if not got_result:
+            result.error = result.error or "geen resultaat"
+            return result
+
+        lead = {
+            "name": "Load Test",
+            "email": "loadtest@example.com",
+            "company": "Loadtest",
+            "function": "Test",
+            "tool_name": tool_name,
+        }
+        (await http.post(f"{base}/api/lead", json=lead)).raise_for_status()
+
+        started = time.perf_counter()
+        response = await http.post(f"{base}/api/report", json={"tool_name": tool_name})
+        response.raise_for_status()
+        result.report_seconds = time.perf_counter() - started
+        result.ok = True
+    except httpx.HTTPError as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _rss_bytes(pid: int) -> int:
+    """Huidig RSS van een proces (Linux /proc; anders psutil indien aanwezig)."""
+    status = Path(f"/proc/{pid}/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    try:
+        import psutil
+    except ImportError:
+        return 0
+    return psutil.Process(pid).memory_info().rss
+
+
+async def _sample_rss(pid: int, peak: list[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        peak[0] = max(peak[0], _rss_bytes(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.2)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _wait_until_up(base: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as http:
+        while time.monotonic() < deadline:
+            try:
+                if (await http.get(f"{base}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.05)
+    raise TimeoutError(f"Server op {base} startte niet binnen {timeout} seconden")
+
+
+async def run_level(args: argparse.Namespace, concurrency: int) -> dict:
+    base = f"http://127.0.0.1:{args.port}"
+    data_dir = tempfile.mkdtemp(prefix="toolchecker-loadtest-")
+    env = {
+        **os.environ,
+        **_ENV,
+        "DATA_DIR": data_dir,
+        "MAX_CONCURRENT_CHECKS": str(args.max_concurrent or concurrency),
+        "MAX_QUEUED_CHECKS": str(max(concurrency, 100)),
+    }
+    command = [sys.executable, str(Path(__file__).resolve()), "--serve", *sys.argv[1:]]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    try:
+        await _wait_until_up(base)
+        peak_rss = [_rss_bytes(process.pid)]
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(_sample_rss(process.pid, peak_rss, stop))
+
+        limits = httpx.Limits(max_connections=concurrency * 2)
+        async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as http:
+            started = time.perf_counter()
+            # Unieke toolnamen, anders haken clients aan bij elkaars run
+            results = await asyncio.gather(
+                *(run_client(http, base, f"Tool {concurrency}-{i}") for i in range(concurrency))
+            )
+            elapsed = time.perf_counter() - started
+            metrics = (await http.get(f"{base}/metrics")).json()
+
+        stop.set()
+        await sampler
+    finally:
+        process.terminate()
+        process.wait()
+
+    ok = [r for r in results if r.ok]
+    lag = metrics.get("event_loop_lag_seconds", {}).get("values", {}).get("", {})
+    errors = sorted({r.error for r in results if r.error})
+    return {
+        "concurrency": concurrency,
+        "ok": len(ok),
+        "failed": len(results) - len(ok),
+        "checks_per_minute": len(ok) / elapsed * 60 if elapsed else 0.0,
+        "first_event_p50": _percentile([r.first_event for r in results if r.first_event], 50),
+        "first_event_p99": _percentile([r.first_event for r in results if r.first_event], 99),
+        "check_p50": _percentile([r.check_seconds for r in ok], 50),
+        "check_p99": _percentile([r.check_seconds for r in ok], 99),
+        "search_p99": _percentile([r.search_seconds for r in ok], 99),
+        "report_p99": _percentile([r.report_seconds for r in ok], 99),
+        "loop_lag_p99": lag.get("p99", 0.0),
+        "loop_lag_max": lag.get("max", 0.0),
+        "peak_rss_mb": peak_rss[0] / 1e6,
+        "errors": errors,
+    }
+
+
+def _percentile(values: list[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[min(int(p), 99) - 1]
+
+
+def print_report(rows: list[dict]) -> None:
+    header = (
+        f"{'N':>5} {'ok':>5} {'fout':>5} {'checks/min':>11} {'TTFE p50':>9} {'TTFE p99':>9} "
+        f"{'check p50':>10} {'check p99':>10} {'search p99':>11} {'rapport p99':>12} "
+        f"{'lag p99':>8} {'lag max':>8} {'RSS MB':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['concurrency']:>5} {row['ok']:>5} {row['failed']:>5} "
+            f"{row['checks_per_minute']:>11.1f} {row['first_event_p50']:>8.3f}s "
+            f"{row['first_event_p99']:>8.3f}s {row['check_p50']:>9.2f}s {row['check_p99']:>9.2f}s "
+            f"{row['search_p99']:>10.3f}s {row['report_p99']:>11.3f}s "
+            f"{row['loop_lag_p99'] * 1000:>6.1f}ms {row['loop_lag_max'] * 1000:>6.1f}ms "
+            f"{row['peak_rss_mb']:>7.0f}"
+        )
+        for error in row["errors"]:
+            print(f"      fout: {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", default="1,4,16,64", help="Komma-gescheiden aantallen clients")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=0,
+        help="MAX_CONCURRENT_CHECKS van de server (0 = gelijk aan het aantal clients)",
+    )
+    parser.add_argument("--pages-per-check", type=int, default=8)
+    parser.add_argument("--llm-median", type=float, default=0.8, help="Mediane LLM-latency (s)")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--search-median", type=float, default=0.4, help="Mediane zoeklatency (s)")
+    parser.add_argument("--fetch-median", type=float, default=0.15, help="Mediane fetch-latency (s)")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Spreiding van de lognormale latency")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Client-timeout per request (s)")
+    parser.add_argument("--json", action="store_true", help="Resultaten als JSON printen")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        sys.path.insert(0, str(BACKEND_DIR))
+        serve(args)
+        return
+
+    rows = []
+    for level in (int(value) for value in args.levels.split(",")):
+        rows.append(asyncio.run(run_level(args, level)))
+        if not args.json:
+            print(f"niveau {level} klaar", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_report(rows)
+
+
+if __name__ == "__main__":
+    main()
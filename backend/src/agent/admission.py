@@ -0,0 +1,199 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from ..config import settings
+
+
+class AdmissionRejected(Exception):
+    """De wachtrij is vol; de check wordt niet gestart."""
+
+
+@dataclass
+class QueueStatus:
+    """Positie in de wachtrij en de verwachte wachttijd."""
+
+    position: int
+    eta_seconds: float
+
+
+class Ticket:
+    """Plek in de wachtrij voor één agent run."""
+
+    def __init__(self, controller: "AdmissionController"):
+        self._controller = controller
+        self._changed = asyncio.Event()
+        self.granted = False
+        self.reserved_tokens = 0
+        self.started_at = 0.0
+        self.released = False
+
+    def _notify(self) -> None:
+        self._changed.set()
+
+    async def wait(self) -> AsyncIterator[QueueStatus]:
+        """Wacht op een slot en yield tussentijds de wachtrijstatus.
+
+        De iterator eindigt zodra het ticket een slot heeft gekregen.
+        """
+        last_position = None
+        refresh = True
+        while not self.granted:
+            status = self._controller.status(self)
+            if refresh or status.position != last_position:
+                last_position = status.position
+                yield status
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait(), timeout=settings.admission_status_interval_seconds
+                )
+                refresh = False
+            except asyncio.TimeoutError:
+                # Tokens zijn bijgevuld sinds de vorige poging; ververs ook de ETA
+                self._controller.dispatch()
+                refresh = True
+
+    def release(self, tokens_used: int | None = None) -> None:
+        """Geef het slot vrij (of verlaat de wachtrij) en verreken het tokenverbruik."""
+        if not self.released:
+            self.released = True
+            self._controller.release(self, tokens_used)
+
+
+class AdmissionController:
+    """Begrenst het aantal gelijktijdige agent runs met een eerlijke FIFO-wachtrij.
+
+    Een run krijgt pas een slot als er een vrije plek is én de token bucket
+    genoeg budget heeft voor het geschatte verbruik van een check. Zo blijft
+    de doorvoer rond de TPM-quota van Azure OpenAI in plaats van dat alle
+    runs tegelijk op 429's stuklopen. De schatting per run en de gemiddelde
+    duur worden bijgeleerd uit afgeronde runs.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queued: int,
+        tokens_per_minute: int,
+        estimated_tokens_per_run: int,
+        estimated_run_seconds: float,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.tokens_per_minute = tokens_per_minute
+        self.estimated_tokens_per_run = float(estimated_tokens_per_run)
+        self.estimated_run_seconds = estimated_run_seconds
+
+        self._queue: deque[Ticket] = deque()
+        self._running = 0
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self) -> Ticket:
+        """Plaats een nieuwe run achteraan in de wachtrij."""
+        if len(self._queue) >= self.max_queued:
+            raise AdmissionRejected(
+                "Het is momenteel erg druk. Probeer het over een paar minuten opnieuw."
+            )
+        ticket = Ticket(self)
+        self._queue.append(ticket)
+        self.dispatch()
+        return ticket
+
+    def dispatch(self) -> None:
+        """Geef slots uit aan de kop van de wachtrij zolang dat kan."""
+        self._refill()
+        while self._queue and self._running < self.max_concurrent:
+            # Een run die groter is dan de hele quota wacht op een volle bucket
+            needed = min(self.estimated_tokens_per_run, self.tokens_per_minute)
+            if self.tokens_per_minute and self._tokens < needed:
+                break
+
+            ticket = self._queue.popleft()
+            ticket.granted = True
+            ticket.started_at = time.monotonic()
+            if self.tokens_per_minute:
+                ticket.reserved_tokens = int(self.estimated_tokens_per_run)
+                self._tokens -= ticket.reserved_tokens
+            self._running += 1
+            ticket._notify()
+
+        # Iedereen die nog wacht is een plek opgeschoven
+        for ticket in self._queue:
+            ticket._notify()
+
+    def release(self, ticket: Ticket, tokens_used: int | None) -> None:
+        if not ticket.granted:
+            # Run is afgebroken terwijl hij nog in de wachtrij stond
+            try:
+                self._queue.remove(ticket)
+            except ValueError:
+                pass
+            self.dispatch()
+            return
+
+        self._running -= 1
+        duration = time.monotonic() - ticket.started_at
+        self.estimated_run_seconds = _ewma(self.estimated_run_seconds, duration)
+
+        if tokens_used:
+            self.estimated_tokens_per_run = _ewma(self.estimated_tokens_per_run, tokens_used)
+            if self.tokens_per_minute:
+                # Verreken het verschil tussen reservering en werkelijk verbruik
+                self._tokens += ticket.reserved_tokens - tokens_used
+
+        self.dispatch()
+
+    def status(self, ticket: Ticket) -> QueueStatus:
+        """Positie (1-based) en geschatte wachttijd voor een wachtend ticket."""
+        try:
+            position = self._queue.index(ticket) + 1
+        except ValueError:
+            position = 0
+
+        # Elke volle "ronde" van max_concurrent runs kost één gemiddelde runduur
+        rounds = (position - 1 + self._running) // self.max_concurrent
+        eta = rounds * self.estimated_run_seconds
+
+        if self.tokens_per_minute:
+            needed = position * self.estimated_tokens_per_run - self._tokens
+            if needed > 0:
+                eta = max(eta, needed / (self.tokens_per_minute / 60.0))
+
+        return QueueStatus(position=position, eta_seconds=round(eta, 1))
+
+    def _refill(self) -> None:
+        if not self.tokens_per_minute:
+            return
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + elapsed * self.tokens_per_minute / 60.0,
+        )
+
+
+def _ewma(previous: float, sample: float, alpha: float = 0.2) -> float:
+    return (1 - alpha) * previous + alpha * sample
+
+
+admission = AdmissionController(
+    max_concurrent=settings.max_concurrent_checks,
+    max_queued=settings.max_queued_checks,
+    # De bucket leeft per proces; samen mogen de workers niet boven de quota komen
+    tokens_per_minute=settings.azure_openai_tpm_limit // max(1, settings.web_concurrency),
+    estimated_tokens_per_run=settings.estimated_tokens_per_check,
+    estimated_run_seconds=settings.estimated_check_seconds,
+)
@@ -0,0 +1,176 @@
+import asyncio
+import socket
+
+from ..checks.evidence import match_check
+from ..config import settings
+from ..identity.catalog import looks_like_url, registrable_domain, split_url
+from ..identity.resolver import get_tool_resolver, resolve_tool
+from ..metrics import registry
+from ..models import ComplianceResult, DpfParticipation, HostingLocation, Source
+from ..storage.dpf import get_dpf_index
+from ..storage.geoip import CDN_ASNS, get_geo_database
+
+hosting_lookups = registry.counter(
+    "hosting_lookups_total", "DNS-lookups voor hostingbewijs per uitkomst"
+)
+
+# EU plus de overige EER-landen: daar geldt de AVG zonder doorgiftemechanisme
+_EEA = {
+    "AT", "BE", "BG", "CY", "CZ", "DE", "DK", "EE", "ES", "FI", "FR", "GR", "HR", "HU",
+    "IE", "IT", "LT", "LU", "LV", "MT", "NL", "PL", "PT", "RO", "SE", "SI", "SK",
+    "IS", "LI", "NO",
+}
+
+# Subdomeinen waar de applicatie en API meestal draaien; het kale domein is vaak alleen marketing
+_SUBDOMAINS = ("", "app.", "api.")
+_MAX_ADDRESSES_PER_HOST = 2
+_MAX_SOURCES_PER_CHECK = 3
+
+
+def enrich_sub_processors(result: ComplianceResult) -> None:
+    """Vul per sub-verwerker de DPF-status in uit de lokale deelnemerslijst.
+
+    Alleen bij een eenduidige match; bij twijfel blijft het veld leeg en
+    geldt wat de agent zelf vond.
+    """
+    index = get_dpf_index()
+    if index is None:
+        return
+    for sub_processor in result.sub_processors:
+        if sub_processor.dpf is not None:
+            continue
+        match = index.lookup(sub_processor.name)
+        if match is not None:
+            sub_processor.dpf = DpfParticipation(
+                organization=match.organization, active=match.active, url=match.url
+            )
+
+
+async def enrich_hosting(result: ComplianceResult) -> None:
+    """Hostingbewijs uit DNS en de lokale IP-geolocatie, zonder LLM-aanroepen.
+
+    De app- en API-domeinen van de tool en van sub-verwerkers met een exact
+    bekende host (zie ``_sub_processor_host``) worden tegelijk geresolved. Voor
+    de tool komt dat als bron bij de datalocatie-check; een sub-verwerker krijgt
+    de locaties in ``hosting`` en, alleen als de agent geen locatie invulde, het
+    land waar alle niet-CDN IP's op uitkomen. Een status verandert nooit.
+    """
+    if get_geo_database() is None:
+        return
+
+    tool_domain = _domain(result.tool_url) or resolve_tool(result.tool_name).domain
+    sub_domains = {
+        sub_processor.name: _sub_processor_host(sub_processor.name)
+        for sub_processor in result.sub_processors
+    }
+    located = await locate_domains([tool_domain, *sub_domains.values()])
+
+    if tool_domain in located:
+        _attach_to_checks(result, located[tool_domain])
+    for sub_processor in result.sub_processors:
+        locations = located.get(sub_domains[sub_processor.name])
+        if not locations:
+            continue
+        sub_processor.hosting = locations
+        countries = {location.country for location in locations if not location.cdn}
+        if _is_unknown(sub_processor.data_location) and len(countries) == 1 and None not in countries:
+            sub_processor.data_location = f"{countries.pop()} (volgens IP-geolocatie)"
+
+
+def _sub_processor_host(name: str) -> str | None:
+    """Host die zeker van de sub-verwerker is: een exacte catalogusnaam, of de naam is een domein.
+
+    Nooit de bron-URL van de agent: dat kan dataprivacyframework.gov, een
+    nieuwsartikel of de sub-verwerkerslijst van de tool zijn. En geen geleerde
+    of fuzzy alias, die "AWS" op amazon.com (de webwinkel) laat uitkomen.
+    """
+    if looks_like_url(name):
+        host, _ = split_url(name)
+        return host or None
+    return get_tool_resolver().catalog_host(name)
+
+
+async def locate_domains(domains: list[str | None]) -> dict[str, list[HostingLocation]]:
+    """Per domein de locaties van het domein zelf en zijn app- en api-subdomein."""
+    database = get_geo_database()
+    if database is None:
+        return {}
+    hosts = {domain: [f"{prefix}{domain}" for prefix in _SUBDOMAINS] for domain in domains if domain}
+    unique_hosts = sorted({host for names in hosts.values() for host in names})
+    addresses = await asyncio.gather(*(_resolve(host) for host in unique_hosts))
+
+    by_host: dict[str, list[HostingLocation]] = {}
+    for host, ips in zip(unique_hosts, addresses):
+        by_host[host] = []
+        for ip in ips[:_MAX_ADDRESSES_PER_HOST]:
+            location = database.locate(ip)
+            if location is None:
+                continue
+            by_host[host].append(
+                HostingLocation(
+                    host=host, ip=ip, country=location.country, asn=location.asn,
+                    network=location.network, cdn=location.cdn,
+                )
+            )
+    return {
+        domain: [location for host in names for location in by_host[host]]
+        for domain, names in hosts.items()
+    }
+
+
+async def _resolve(host: str) -> list[str]:
+    loop = asyncio.get_running_loop()
+    try:
+        infos = await asyncio.wait_for(
+            loop.getaddrinfo(host, 443, type=socket.SOCK_STREAM),
+            settings.hosting_dns_timeout_seconds,
+        )
+    except (OSError, asyncio.TimeoutError):
+        hosting_lookups.inc(outcome="unresolved")
+        return []
+    hosting_lookups.inc(outcome="resolved")
+    # IPv4 eerst: de geolocatie daarvan is doorgaans nauwkeuriger
+    infos.sort(key=lambda info: info[0] != socket.AF_INET)
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+
+def _attach_to_checks(result: ComplianceResult, locations: list[HostingLocation]) -> None:
+    sources = []
+    for host in dict.fromkeys(location.host for location in locations):
+        described = [describe_location(location) for location in locations if location.host == host]
+        sources.append(
+            Source(url=f"https://{host}", title="DNS en IP-geolocatie", quote="; ".join(described))
+        )
+    for category in result.categories:
+        for check in category.checks:
+            if match_check(category.name, check) != "location":
+                continue
+            known = {source.url for source in check.sources}
+            check.sources.extend(
+                source for source in sources[:_MAX_SOURCES_PER_CHECK] if source.url not in known
+            )
+
+
+def describe_location(location: HostingLocation) -> str:
+    """Bijv. "app.slack.com → 3.3.3.3: US (buiten de EER), AS16509 AMAZON-02"."""
+    parts = []
+    if location.country:
+        region = "EER" if location.country in _EEA else "buiten de EER"
+        parts.append(f"{location.country} ({region})")
+    if location.asn:
+        parts.append(f"AS{location.asn} {location.network or ''}".strip())
+    text = f"{location.host} → {location.ip}: {', '.join(parts) or 'onbekend'}"
+    if location.cdn:
+        text += f" — {CDN_ASNS[location.asn]} CDN, dit is de edge en niet de opslag"
+    return text
+
+
+def _domain(url: str | None) -> str | None:
+    if not url:
+        return None
+    host, _ = split_url(url)
+    return registrable_domain(host) if host else None
+
+
+def _is_unknown(location: str) -> bool:
+    return location.strip().lower() in ("", "onbekend", "unknown", "niet gevonden", "-")
@@ -1,27 +1,43 @@
-import json
+import threading
 from collections.abc import AsyncGenerator
 
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import AzureChatOpenAI
-from langgraph.prebuilt import create_react_agent
-
-from ..config import settings
+from ..checks.evidence import start_collecting
 from ..models import ComplianceResult, ProgressUpdate
+from ..storage.timings import get_timing_store
+from .admission import admission
+from .enrichment import enrich_hosting, enrich_sub_processors
+from .progress import ProgressTracker
 from .prompts import SYSTEM_PROMPT
-from .tools import TOOLS
+from .structured import parse_result
+
+_agent = None
+_agent_lock = threading.Lock()
+
+
+def get_agent():
+    """Bouw de ReAct agent bij eerste gebruik.
+
+    langgraph, langchain en de Azure client zijn traag om te importeren en te
+    initialiseren; door dat uit te stellen start de app (en /health) direct.
+    De warm-up bij het opstarten roept dit aan vanuit een thread, vandaar de lock.
+    """
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                from langgraph.prebuilt import create_react_agent
 
-_llm = AzureChatOpenAI(
-    azure_deployment=settings.azure_openai_deployment,
-    azure_endpoint=settings.azure_openai_endpoint,
-    api_key=settings.azure_openai_api_key,
-    api_version=settings.azure_openai_api_version,
-    temperature=0.1,
-)
+                from .llm import build_chat_model
+                from .structured import response_format
+                from .tools import TOOLS
 
-_agent = create_react_agent(
-    model=_llm,
-    tools=TOOLS,
-)
+                _agent = create_react_agent(
+                    model=build_chat_model(
+                        "agent", temperature=0.1, response_format=response_format()
+                    ),
+                    tools=TOOLS,
+                )
+    return _agent
 
 
 async def run_compliance_check(
@@ -30,69 +46,105 @@ async def run_compliance_check(
     """Voer een compliance check uit voor een tool.
 
     Yields ProgressUpdate objecten tijdens het proces en een ComplianceResult
-    als eindresultaat.
-    """
-    yield ProgressUpdate(
-        step="start",
-        message=f"Compliance check gestart voor {tool_name}...",
-        progress=0.05,
-    )
+    als eindresultaat. Zolang er geen slot vrij is, volgen "queued" updates
+    met de wachtrijpositie en verwachte wachttijd. Daarna komt de voortgang
+    uit de agent-state: gelezen pagina's, beoordeelde checks en sub-verwerkers.
 
-    user_message = (
-        f"Voer een volledige AVG/GDPR compliance check uit voor de tool: "
-        f"{tool_name}. Zoek de officiële website, lees de privacy policy, "
-        f"security pagina's, sub-verwerkerlijst, en alle relevante compliance "
-        f"documentatie. Geef een eerlijke beoordeling."
-    )
+    Raises:
+        AdmissionRejected: als de wachtrij vol is.
+    """
+    from langchain_core.messages import HumanMessage, SystemMessage
 
-    progress_messages = [
-        (0.1, "Zoeken naar officiële website..."),
-        (0.2, "Privacy policy ophalen..."),
-        (0.3, "Security documentatie analyseren..."),
-        (0.5, "Sub-verwerkers identificeren..."),
-        (0.6, "Sub-verwerkers doorzoeken..."),
-        (0.7, "Datarechten beoordelen..."),
-        (0.8, "Beveiligingscertificaten checken..."),
-        (0.9, "Eindoordeel bepalen..."),
-    ]
-    progress_idx = 0
-
-    input_messages = {
-        "messages": [
-            SystemMessage(content=SYSTEM_PROMPT),
-            HumanMessage(content=user_message),
-        ]
-    }
-
-    final_content = ""
-
-    async for event in _agent.astream_events(input_messages, version="v2"):
-        kind = event.get("event", "")
-
-        # Stuur voortgangsupdates bij tool calls
-        if kind == "on_tool_start" and progress_idx < len(progress_messages):
-            progress, message = progress_messages[progress_idx]
+    ticket = admission.enqueue()
+    tokens_used = 0
+    try:
+        async for status in ticket.wait():
             yield ProgressUpdate(
-                step=f"tool_{progress_idx}",
-                message=message,
-                progress=progress,
+                step="queued",
+                message=_queue_message(status.position, status.eta_seconds),
+                progress=0.0,
+                queue_position=status.position,
+                eta_seconds=status.eta_seconds,
             )
-            progress_idx += 1
 
-        # Vang het laatste AI bericht op
-        if kind == "on_chat_model_end":
-            output = event.get("data", {}).get("output")
-            if output and hasattr(output, "content"):
-                final_content = output.content
+        yield ProgressUpdate(
+            step="start",
+            message=f"Compliance check gestart voor {tool_name}...",
+            progress=0.05,
+        )
 
-    yield ProgressUpdate(
-        step="parsing",
-        message="Resultaten verwerken...",
-        progress=0.95,
-    )
+        user_message = (
+            f"Voer een volledige AVG/GDPR compliance check uit voor de tool: "
+            f"{tool_name}. Zoek de officiële website, lees de privacy policy, "
+            f"security pagina's, sub-verwerkerlijst, en alle relevante compliance "
+            f"documentatie. Geef een eerlijke beoordeling."
+        )
 
-    # Parse het JSON resultaat
-    result = _parse_result(final_content, tool_name)
+        input_messages = {
+            "messages": [
+                SystemMessage(content=SYSTEM_PROMPT),
+                HumanMessage(content=user_message),
+            ]
+        }
+
+        timings = get_timing_store()
+        tracker = ProgressTracker(timings.estimate())
+        evidence = start_collecting()
+        final_content = ""
+
+        async for event in get_agent().astream_events(input_messages, version="v2"):
+            kind = event.get("event", "")
+            update = None
+
+            if kind == "on_tool_start":
+                tool_input = event.get("data", {}).get("input")
+                update = tracker.tool_started(
+                    event.get("name", ""), tool_input if isinstance(tool_input, dict) else {}
+                )
+            elif kind == "on_tool_end":
+                update = tracker.tool_finished(event.get("name", ""))
+            elif kind == "on_chat_model_start":
+                tracker.model_started()
+            elif kind == "on_chat_model_stream":
+                chunk = event.get("data", {}).get("chunk")
+                content = getattr(chunk, "content", "")
+                if isinstance(content, str):
+                    update = tracker.model_token(content)
+
+            if update is not None:
+                yield update
+
+            # Vang het laatste AI bericht op
+            if kind == "on_chat_model_end":
+                output = event.get("data", {}).get("output")
+                if output and hasattr(output, "content"):
+                    final_content = output.content
+                usage = getattr(output, "usage_metadata", None)
+                if usage:
+                    tokens_used += usage.get("total_tokens", 0)
+
+        yield ProgressUpdate(
+            step="parsing",
+            message="Resultaten verwerken...",
+            progress=0.95,
+        )
+
+        # Parse het JSON resultaat; een herstelaanroep valt nog binnen het slot
+        result, repair_tokens = await parse_result(final_content, tool_name)
+        tokens_used += repair_tokens
+    finally:
+        # Ook bij een afgebroken run: slot vrijgeven en verbruik verrekenen
+        ticket.release(tokens_used)
+
+    # Quotes van de pre-classifier als bron bij checks die er geen van hadden
+    evidence.attach_to(result)
+    enrich_sub_processors(result)
+    await enrich_hosting(result)
+
+    # Alleen volledige runs leren de ETA bij; de fallback zegt niets over de duur
+    timing = tracker.timing()
+    if timing is not None and result.categories:
+        timings.record(timing)
 
     yield ProgressUpdate(
         step="done",
@@ -103,28 +155,11 @@ async def run_compliance_check(
     yield result
 
 
-def _parse_result(content: str, tool_name: str) -> ComplianceResult:
-    """Parse de agent output naar een ComplianceResult."""
-    try:
-        # Zoek JSON in de content (kan markdown code block bevatten)
-        json_str = content
-        if "```json" in content:
-            json_str = content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            json_str = content.split("```")[1].split("```")[0]
-
-        data = json.loads(json_str.strip())
-        return ComplianceResult(**data)
-    except (json.JSONDecodeError, KeyError, IndexError, ValueError):
-        # Fallback als parsing mislukt
-        return ComplianceResult(
-            tool_name=tool_name,
-            overall_status="orange",
-            summary=(
-                "De analyse kon niet volledig worden afgerond. "
-                "Raadpleeg een FG voor een handmatige beoordeling."
-            ),
-            categories=[],
-            sub_processors=[],
-            sources_consulted=[],
-        )
+def _queue_message(position: int, eta_seconds: float) -> str:
+    """Leesbare wachtrijmelding voor de frontend."""
+    if eta_seconds < 60:
+        wait = "minder dan een minuut"
+    else:
+        minutes = round(eta_seconds / 60)
+        wait = f"ongeveer {minutes} minuut" if minutes == 1 else f"ongeveer {minutes} minuten"
+    return f"In de wachtrij (positie {position}), verwachte wachttijd {wait}..."
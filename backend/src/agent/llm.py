@@ -0,0 +1,290 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+import openai
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langchain_openai import AzureChatOpenAI
+
+from ..config import LLMDeployment, settings
+from ..fetch.politeness import backoff_delay
+from ..metrics import registry
+
+llm_call_seconds = registry.histogram(
+    "llm_call_seconds", "Duur van een (geslaagde) LLM-aanroep inclusief retries"
+)
+llm_retries = registry.counter("llm_retries_total", "Herhaalde LLM-aanroepen per reden")
+llm_hedges = registry.counter("llm_hedges_total", "Gestarte hedge-aanroepen")
+llm_wins = registry.counter("llm_wins_total", "Welke deployment het antwoord leverde")
+llm_failures = registry.counter("llm_failures_total", "LLM-aanroepen die definitief faalden")
+
+# Fouten waarbij een nieuwe poging zin heeft
+_RETRYABLE = (
+    asyncio.TimeoutError,
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class ResilientChatModel(BaseChatModel):
+    """Chat model dat aanroepen verdeelt over één of meer Azure deployments.
+
+    Elke poging krijgt een harde timeout. Bij 429/5xx/timeouts volgt een
+    nieuwe poging met jittered backoff op de volgende deployment. Als hedging
+    aan staat en het antwoord langer dan ``hedge_delay`` uitblijft, wordt
+    dezelfde aanroep parallel op een tweede deployment gestart; het eerste
+    antwoord wint en de rest wordt geannuleerd.
+
+    Een sync aanroep (``invoke``) krijgt dezelfde retries en fallback naar de
+    volgende deployment, maar zonder hedging: dat vraagt parallelle aanroepen.
+
+    Streamen (voor de voortgang van een run) gebeurt zonder hedging: een
+    nieuwe poging kan alleen zolang er nog geen token is doorgegeven, en de
+    timeout geldt per chunk in plaats van voor het hele antwoord.
+    """
+
+    call_type: str
+    targets: list[BaseChatModel]
+    timeout: float
+    max_retries: int
+    hedge_delay: float = 0.0
+    # OpenAI response_format (bijv. een json_schema) voor het antwoord zonder tool calls
+    response_format: dict | None = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "resilient-azure-openai"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        formatted = [convert_to_openai_tool(tool) for tool in tools]
+        return self.bind(tools=formatted, **kwargs)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        started = time.monotonic()
+        if self.response_format is not None and "tools" not in kwargs:
+            kwargs.setdefault("response_format", self.response_format)
+        message = self._invoke_with_retries(messages, stop, **kwargs)
+        llm_call_seconds.observe(time.monotonic() - started, call_type=self.call_type)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        started = time.monotonic()
+        # Zonder streamen valideert de OpenAI client dat alle tools strict zijn,
+        # wat de agent-tools niet zijn; daar gaat het schema alleen mee bij streamen
+        if self.response_format is not None and "tools" not in kwargs:
+            kwargs.setdefault("response_format", self.response_format)
+        message = await self._call_with_retries(messages, stop, **kwargs)
+        llm_call_seconds.observe(time.monotonic() - started, call_type=self.call_type)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        started = time.monotonic()
+        if self.response_format is not None:
+            kwargs.setdefault("response_format", self.response_format)
+        for attempt in range(self.max_retries + 1):
+            target = attempt % len(self.targets)
+            stream = self.targets[target].astream(
+                messages, config={"callbacks": []}, stop=stop, **kwargs
+            ).__aiter__()
+            streamed = False
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(anext(stream), timeout=self.timeout)
+                    except StopAsyncIteration:
+                        break
+                    streamed = True
+                    yield ChatGenerationChunk(message=chunk)
+                llm_wins.inc(call_type=self.call_type, target=str(target))
+                llm_call_seconds.observe(time.monotonic() - started, call_type=self.call_type)
+                return
+            except _RETRYABLE as e:
+                # Halverwege een antwoord opnieuw beginnen zou dubbele tokens geven
+                if streamed or attempt == self.max_retries:
+                    llm_failures.inc(call_type=self.call_type, reason=type(e).__name__)
+                    raise
+                llm_retries.inc(call_type=self.call_type, reason=type(e).__name__)
+            finally:
+                await stream.aclose()
+            await asyncio.sleep(
+                backoff_delay(
+                    attempt,
+                    settings.llm_retry_base_delay_seconds,
+                    settings.llm_retry_max_delay_seconds,
+                )
+            )
+
+    async def _call_with_retries(self, messages, stop, **kwargs) -> AIMessage:
+        for attempt in range(self.max_retries + 1):
+            # Roteer de primaire deployment per poging, zodat een 429 in
+            # één regio niet direct opnieuw dezelfde regio raakt
+            offset = attempt % len(self.targets)
+            targets = self.targets[offset:] + self.targets[:offset]
+            try:
+                return await self._hedged_call(targets, messages, stop, **kwargs)
+            except _RETRYABLE as e:
+                if attempt == self.max_retries:
+                    llm_failures.inc(call_type=self.call_type, reason=type(e).__name__)
+                    raise
+                llm_retries.inc(call_type=self.call_type, reason=type(e).__name__)
+                await asyncio.sleep(
+                    backoff_delay(
+                        attempt,
+                        settings.llm_retry_base_delay_seconds,
+                        settings.llm_retry_max_delay_seconds,
+                    )
+                )
+        raise AssertionError("unreachable")
+
+    def _invoke_with_retries(self, messages, stop, **kwargs) -> AIMessage:
+        """Sync tegenhanger van ``_call_with_retries``: per poging de deployments na elkaar."""
+        for attempt in range(self.max_retries + 1):
+            offset = attempt % len(self.targets)
+            targets = self.targets[offset:] + self.targets[:offset]
+            try:
+                return self._fallback_call(targets, messages, stop, **kwargs)
+            except _RETRYABLE as e:
+                if attempt == self.max_retries:
+                    llm_failures.inc(call_type=self.call_type, reason=type(e).__name__)
+                    raise
+                llm_retries.inc(call_type=self.call_type, reason=type(e).__name__)
+                time.sleep(
+                    backoff_delay(
+                        attempt,
+                        settings.llm_retry_base_delay_seconds,
+                        settings.llm_retry_max_delay_seconds,
+                    )
+                )
+        raise AssertionError("unreachable")
+
+    def _fallback_call(self, targets: list[BaseChatModel], messages, stop, **kwargs) -> AIMessage:
+        last_error: BaseException | None = None
+        for target in targets:
+            try:
+                # Sync valt er niets te annuleren: de timeout gaat als request-optie
+                # naar de OpenAI client, die dan APITimeoutError geeft
+                message = target.invoke(
+                    messages, config={"callbacks": []}, stop=stop, timeout=self.timeout, **kwargs
+                )
+            except _RETRYABLE as e:
+                last_error = e
+                continue
+            llm_wins.inc(call_type=self.call_type, target=str(self.targets.index(target)))
+            return message
+        raise last_error
+
+    async def _hedged_call(
+        self, targets: list[BaseChatModel], messages, stop, **kwargs
+    ) -> AIMessage:
+        """Start de aanroep op de eerste deployment en hedge eventueel naar de volgende."""
+
+        async def attempt(index: int) -> tuple[int, AIMessage]:
+            # Eigen callbacks uit: de buitenste aanroep rapporteert al aan de
+            # event stream, anders telt elk antwoord (en elke token) dubbel
+            message = await asyncio.wait_for(
+                targets[index].ainvoke(messages, config={"callbacks": []}, stop=stop, **kwargs),
+                timeout=self.timeout,
+            )
+            return index, message
+
+        hedging = self.hedge_delay > 0 and len(targets) > 1
+        pending = {asyncio.ensure_future(attempt(0))}
+        next_index = 1
+        last_error: BaseException | None = None
+
+        try:
+            while pending:
+                timeout = self.hedge_delay if hedging and next_index < len(targets) else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    try:
+                        index, message = task.result()
+                    except _RETRYABLE as e:
+                        last_error = e
+                        continue
+                    target = self.targets.index(targets[index])
+                    llm_wins.inc(call_type=self.call_type, target=str(target))
+                    return message
+
+                # Geen antwoord binnen de hedge-delay, of de enige poging faalde
+                if next_index < len(targets) and (hedging or not pending):
+                    if pending:
+                        llm_hedges.inc(call_type=self.call_type)
+                    pending.add(asyncio.ensure_future(attempt(next_index)))
+                    next_index += 1
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_error
+
+
+def build_chat_model(
+    call_type: str, temperature: float, response_format: dict | None = None
+) -> ResilientChatModel:
+    """Bouw het chat model voor een soort aanroep (bijv. "agent" of "search_tool").
+
+    De primaire deployment komt uit de gewone Azure OpenAI settings; extra
+    deployments uit ``azure_openai_hedge_deployments`` dienen als fallback
+    bij retries en als hedge-doel. Met ``response_format`` volgt het
+    eindantwoord een JSON-schema (structured output).
+    """
+    primary = LLMDeployment(
+        deployment=settings.azure_openai_deployment,
+        endpoint=settings.azure_openai_endpoint,
+        api_key=settings.azure_openai_api_key,
+        api_version=settings.azure_openai_api_version,
+    )
+    deployments = [primary, *settings.azure_openai_hedge_deployments]
+
+    targets = [
+        AzureChatOpenAI(
+            azure_deployment=deployment.deployment,
+            azure_endpoint=deployment.endpoint,
+            api_key=deployment.api_key or settings.azure_openai_api_key,
+            api_version=deployment.api_version or settings.azure_openai_api_version,
+            temperature=temperature,
+            # Retries en timeouts regelt de wrapper, per deployment
+            max_retries=0,
+            # Tokenverbruik ook bij streamen, voor de admission control
+            stream_usage=True,
+        )
+        for deployment in deployments
+    ]
+
+    return ResilientChatModel(
+        call_type=call_type,
+        targets=targets,
+        timeout=settings.llm_timeout_seconds,
+        max_retries=settings.llm_max_retries,
+        hedge_delay=settings.llm_hedge_delay_seconds,
+        response_format=response_format,
+    )
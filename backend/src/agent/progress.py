@@ -0,0 +1,169 @@
+import re
+import time
+
+from ..models import ProgressUpdate
+from ..storage.timings import CheckTiming, TimingEstimate
+from .prompts import SYSTEM_PROMPT
+
+# Voortgang tussen "start" (5%) en "parsing" (95%) komt uit de agent-state
+_START = 0.05
+_END = 0.95
+
+# Stappen van de onderzoeksfase in de volgorde van de frontend
+_TOOL_STEPS = {
+    "web_search": "search",
+    "search_corpus": "search",
+    "check_dpf": "search",
+    "find_compliance_pages": "discover",
+    "fetch_webpage": "fetch",
+}
+_STEP_ORDER = ["search", "discover", "fetch", "checks", "sub_processors"]
+
+# Sleutels die per check en per sub-verwerker precies één keer in de JSON staan
+_CHECK_KEY = re.compile(r'"finding"\s*:')
+_SUB_PROCESSOR_KEY = re.compile(r'"data_location"\s*:')
+_KEY_OVERLAP = 24
+
+
+def count_checks(prompt: str) -> int:
+    """Aantal checks in de sectie "Checks die je moet uitvoeren" van de prompt."""
+    section = prompt.split("## Checks die je moet uitvoeren", 1)[1].split("\n## ", 1)[0]
+    return sum(1 for line in section.splitlines() if line.startswith("- "))
+
+
+TOTAL_CHECKS = count_checks(SYSTEM_PROMPT)
+
+
+class ProgressTracker:
+    """Leidt de voortgang van een run af uit wat de agent werkelijk doet.
+
+    De onderzoeksfase telt opgehaalde pagina's af tegen het historische
+    gemiddelde; in de schrijffase worden de checks en sub-verwerkers in de
+    gestreamde JSON geteld. Voortgang en ETA zijn gewogen met de historische
+    duur van beide fasen, zodat de balk ongeveer lineair in de tijd loopt.
+    """
+
+    def __init__(self, estimate: TimingEstimate, total_checks: int = TOTAL_CHECKS):
+        self.estimate = estimate
+        self.total_checks = total_checks
+        self.pages_fetched = 0
+        self.checks_resolved = 0
+        self.sub_processors_resolved = 0
+
+        self._started = time.monotonic()
+        self._writing_started: float | None = None
+        self._step_index = 0
+        self._progress = _START
+        self._buffer = ""
+        self._scan_from = 0
+
+    def tool_started(self, name: str, tool_input: dict) -> ProgressUpdate:
+        # Een tool call betekent dat het vorige modelantwoord geen eindantwoord was
+        self._writing_started = None
+        self.checks_resolved = 0
+        self.sub_processors_resolved = 0
+
+        step = _TOOL_STEPS.get(name, "fetch")
+        self._advance(step)
+        if name == "web_search":
+            message = f"Zoeken: {tool_input.get('query', '')}"
+        elif name == "search_corpus":
+            message = f"Eerder gelezen pagina's doorzoeken: {tool_input.get('query', '')}"
+        elif name == "check_dpf":
+            message = f"DPF-lijst raadplegen: {tool_input.get('organization', '')}"
+        elif name == "find_compliance_pages":
+            message = f"Compliance-pagina's zoeken op {tool_input.get('domain', '')}"
+        else:
+            message = f"Pagina lezen ({self.pages_fetched + 1}): {tool_input.get('url', '')}"
+        return self._update(message)
+
+    def tool_finished(self, name: str) -> ProgressUpdate | None:
+        if name != "fetch_webpage":
+            return None
+        self.pages_fetched += 1
+        return self._update(f"{self.pages_fetched} pagina's gelezen")
+
+    def model_started(self) -> None:
+        self._buffer = ""
+        self._scan_from = 0
+
+    def model_token(self, text: str) -> ProgressUpdate | None:
+        """Verwerk een gestreamd stuk modeltekst; een update als er iets is afgerond."""
+        if not text:
+            return None
+        if self._writing_started is None:
+            self._writing_started = time.monotonic()
+        self._buffer += text
+
+        checks = self.checks_resolved
+        sub_processors = self.sub_processors_resolved
+        check_ends = [m.end() for m in _CHECK_KEY.finditer(self._buffer, self._scan_from)]
+        sp_ends = [m.end() for m in _SUB_PROCESSOR_KEY.finditer(self._buffer, self._scan_from)]
+        self.checks_resolved += len(check_ends)
+        self.sub_processors_resolved += len(sp_ends)
+        # Een sleutel kan over twee chunks verdeeld zijn: scan de staart opnieuw,
+        # maar nooit opnieuw over een al getelde sleutel
+        self._scan_from = max(
+            len(self._buffer) - _KEY_OVERLAP, *check_ends, *sp_ends, self._scan_from
+        )
+
+        if self.sub_processors_resolved > sub_processors:
+            self._advance("sub_processors")
+            return self._update(f"{self.sub_processors_resolved} sub-verwerkers beoordeeld")
+        if self.checks_resolved > checks:
+            self._advance("checks")
+            return self._update(
+                f"{min(self.checks_resolved, self.total_checks)} van de "
+                f"{self.total_checks} checks beoordeeld"
+            )
+        return None
+
+    def timing(self) -> CheckTiming | None:
+        """Gemeten timing van deze run, of None als er niets bruikbaars is geschreven."""
+        if self._writing_started is None:
+            return None
+        if not self.checks_resolved + self.sub_processors_resolved:
+            return None
+        now = time.monotonic()
+        return CheckTiming(
+            research_seconds=self._writing_started - self._started,
+            pages_fetched=self.pages_fetched,
+            writing_seconds=now - self._writing_started,
+            checks=self.checks_resolved,
+            sub_processors=self.sub_processors_resolved,
+        )
+
+    def _advance(self, step: str) -> None:
+        # De stappen in de frontend lopen alleen vooruit
+        self._step_index = max(self._step_index, _STEP_ORDER.index(step))
+
+    def _update(self, message: str) -> ProgressUpdate:
+        done, remaining = self._work()
+        fraction = done / (done + remaining) if done + remaining else 0.0
+        self._progress = max(self._progress, _START + (_END - _START) * fraction)
+        return ProgressUpdate(
+            step=_STEP_ORDER[self._step_index],
+            message=message,
+            progress=round(self._progress, 3),
+            eta_seconds=round(remaining, 1),
+            pages_fetched=self.pages_fetched,
+            checks_resolved=min(self.checks_resolved, self.total_checks),
+            checks_total=self.total_checks,
+            sub_processors_resolved=self.sub_processors_resolved,
+        )
+
+    def _work(self) -> tuple[float, float]:
+        """Verwachte seconden werk gedaan en nog te gaan."""
+        est = self.estimate
+        items_total = self.total_checks + max(est.sub_processors, self.sub_processors_resolved)
+        writing_total = items_total * est.seconds_per_item
+
+        if self._writing_started is None:
+            # Nooit helemaal klaar met onderzoek zolang de agent nog tools aanroept
+            page_fraction = min(self.pages_fetched / est.pages_fetched, 0.95)
+            research_done = est.research_seconds * page_fraction
+            return research_done, est.research_seconds - research_done + writing_total
+
+        items_done = min(self.checks_resolved, self.total_checks) + self.sub_processors_resolved
+        writing_done = items_done * est.seconds_per_item
+        return est.research_seconds + writing_done, max(writing_total - writing_done, 0.0)
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+
+from ..metrics import registry
+from ..models import ComplianceResult, ProgressUpdate
+from ..profiling import profiled, should_profile
+from ..storage.results import ResultEnvelope, get_result_store
+from .graph import run_compliance_check
+
+logger = logging.getLogger(__name__)
+
+checks_cancelled = registry.counter(
+    "checks_cancelled_total", "Runs afgebroken omdat alle clients weg waren"
+)
+checks_joined = registry.counter(
+    "checks_joined_total", "Clients die aanhaakten bij een lopende run voor dezelfde tool"
+)
+
+# Markeert het einde van de stream voor een subscriber
+_END = object()
+
+
+class _Failed:
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class _Run:
+    """Eén lopende agent run en de clients die op het resultaat wachten."""
+
+    def __init__(self, tool_key: str, profile: bool = False):
+        self.tool_key = tool_key
+        self.profile = profile
+        self.subscribers: set[asyncio.Queue] = set()
+        self.last_update: ProgressUpdate | None = None
+        self.task: asyncio.Task | None = None
+
+    def publish(self, item) -> None:
+        if isinstance(item, ProgressUpdate):
+            self.last_update = item
+        for queue in self.subscribers:
+            queue.put_nowait(item)
+
+
+class RunRegistry:
+    """Deelt lopende checks tussen clients en breekt ze af als niemand meer kijkt.
+
+    Vraagt een tweede client dezelfde tool op terwijl de run nog loopt, dan
+    haakt hij aan bij die run (met de laatste voortgang als eerste update).
+    Verbreekt de laatste client de verbinding, dan wordt de task geannuleerd;
+    de annulering loopt door LangGraph heen naar de openstaande LLM-aanroepen
+    en fetches, en het admission slot komt vrij via de finally van de run.
+    """
+
+    def __init__(self):
+        self._runs: dict[str, _Run] = {}
+
+    def subscribe(self, tool_key: str, tool_name: str, profile: bool = False) -> "Subscription":
+        """Start een run of haak aan bij de lopende; ``profile`` geldt alleen voor een nieuwe run."""
+        run = self._runs.get(tool_key)
+        queue: asyncio.Queue = asyncio.Queue()
+        if run is None:
+            run = _Run(tool_key, profile)
+            self._runs[tool_key] = run
+            run.subscribers.add(queue)
+            run.task = asyncio.create_task(self._drive(run, tool_name))
+        else:
+            checks_joined.inc()
+            run.subscribers.add(queue)
+            if run.last_update is not None:
+                queue.put_nowait(run.last_update)
+        return Subscription(self, run, queue)
+
+    def active(self, tool_key: str) -> bool:
+        return tool_key in self._runs
+
+    async def _drive(self, run: _Run, tool_name: str) -> None:
+        try:
+            async with profiled(run.tool_key, "check", should_profile(run.profile)):
+                async for item in run_compliance_check(tool_name):
+                    if isinstance(item, ComplianceResult):
+                        # Eén keer opslaan en serialiseren, hoeveel clients er ook meekijken
+                        item = get_result_store().put(run.tool_key, item)
+                    run.publish(item)
+        except Exception as e:
+            run.publish(_Failed(e))
+        finally:
+            self._forget(run)
+            run.publish(_END)
+
+    def _leave(self, run: _Run, queue: asyncio.Queue) -> None:
+        run.subscribers.discard(queue)
+        if run.subscribers or run.task is None or run.task.done():
+            return
+        stage = "running" if run.last_update and run.last_update.step != "queued" else "queued"
+        checks_cancelled.inc(stage=stage)
+        logger.info("Check voor %s afgebroken: geen clients meer (%s)", run.tool_key, stage)
+        self._forget(run)
+        run.task.cancel()
+
+    def _forget(self, run: _Run) -> None:
+        if self._runs.get(run.tool_key) is run:
+            del self._runs[run.tool_key]
+
+
+class Subscription:
+    """De stream van één client; sluit altijd af met ``close()``."""
+
+    def __init__(self, registry: RunRegistry, run: _Run, queue: asyncio.Queue):
+        self._registry = registry
+        self._run = run
+        self._queue = queue
+
+    async def __aiter__(self) -> AsyncIterator[ProgressUpdate | ResultEnvelope]:
+        while True:
+            item = await self._queue.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+
+    def close(self) -> None:
+        self._registry._leave(self._run, self._queue)
+
+
+runs = RunRegistry()
@@ -0,0 +1,221 @@
+import json
+import logging
+import threading
+
+from pydantic import BaseModel, ValidationError
+
+from ..config import settings
+from ..metrics import registry
+from ..models import ComplianceResult
+
+logger = logging.getLogger(__name__)
+
+result_parses = registry.counter(
+    "agent_result_parses_total", "Eindresultaten van de agent per uitkomst (valid, repaired, fallback)"
+)
+result_parse_failures = registry.counter(
+    "agent_result_parse_failures_total", "Ongeldige eindresultaten per soort fout (empty, json, schema)"
+)
+result_repairs = registry.counter(
+    "agent_result_repairs_total", "Herstelpogingen van een ongeldig eindresultaat per uitkomst"
+)
+
+# Velden die niet van de agent komen maar na de run worden ingevuld
+_FILLED_AFTERWARDS = {"disclaimer", "dpf", "hosting"}
+
+# Sleutels die strict mode van OpenAI niet accepteert of die alleen ruis zijn
+_UNSUPPORTED_KEYS = {"title", "default"}
+
+_MAX_REPORTED_ERRORS = 20
+
+_REPAIR_PROMPT = """\
+Je krijgt het eindresultaat van een AVG/GDPR compliance check dat niet aan het \
+JSON-schema voldoet, met de gevonden fouten. Geef hetzelfde resultaat terug als \
+geldige JSON volgens het schema.
+
+- Verander geen bevindingen, statussen, bronnen of quotes; herstel alleen de structuur.
+- Ontbreekt een verplicht veld, vul dan een lege lijst, "Onbekend" of null in.
+- Is de output halverwege afgebroken, sluit hem dan netjes af zonder iets te verzinnen.
+"""
+
+
+def strict_schema(model: type[BaseModel], omit: set[str] = frozenset()) -> dict:
+    """JSON-schema van een pydantic model in de vorm die strict mode vereist.
+
+    Elk object krijgt ``additionalProperties: false`` en al zijn velden als
+    verplicht; optionele velden blijven nullable. Velden in ``omit`` vallen
+    weg, net als definities die daarna niet meer gebruikt worden.
+    """
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    def convert(node):
+        if isinstance(node, list):
+            return [convert(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+        # Alleen trefwoorden van een schema-node weglaten; in ``properties`` zijn de
+        # sleutels veldnamen, en een veld mag gewoon "title" heten (Source.title)
+        converted = {
+            key: convert(value)
+            for key, value in node.items()
+            if key not in _UNSUPPORTED_KEYS and key != "properties"
+        }
+        if "properties" in node:
+            converted["properties"] = {
+                name: convert(value)
+                for name, value in node["properties"].items()
+                if name not in omit
+            }
+            converted["required"] = list(converted["properties"])
+            converted["additionalProperties"] = False
+        return converted
+
+    converted = convert(schema)
+    definitions = {name: convert(definition) for name, definition in definitions.items()}
+    used = json.dumps(converted)
+    # Een definitie kan via een andere gebruikt worden: herhalen tot niets meer bijkomt
+    kept: dict[str, dict] = {}
+    while True:
+        added = {
+            name: definition
+            for name, definition in definitions.items()
+            if name not in kept and f'"#/$defs/{name}"' in used
+        }
+        if not added:
+            break
+        kept.update(added)
+        used += json.dumps(added)
+    if kept:
+        converted["$defs"] = kept
+    return converted
+
+
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "compliance_result",
+        "strict": True,
+        "schema": strict_schema(ComplianceResult, omit=_FILLED_AFTERWARDS),
+    },
+}
+
+
+def response_format() -> dict | None:
+    """Het response_format voor agent en herstel, of None als de deployment het niet kan."""
+    return RESPONSE_FORMAT if settings.azure_openai_structured_output else None
+
+
+def _extract_json(content: str) -> str:
+    """De JSON uit de output, ook als die (zonder structured output) in een code block staat."""
+    if "```json" in content:
+        return content.split("```json")[1].split("```")[0]
+    if "```" in content:
+        return content.split("```")[1].split("```")[0]
+    return content
+
+
+def _validate(content: str) -> ComplianceResult:
+    return ComplianceResult.model_validate_json(_extract_json(content).strip())
+
+
+def _describe_errors(error: ValueError) -> str:
+    """De fouten zo kort mogelijk, zodat de herstelaanroep goedkoop blijft."""
+    if isinstance(error, ValidationError):
+        lines = [
+            f"- {'.'.join(str(part) for part in item['loc']) or '(root)'}: {item['msg']}"
+            for item in error.errors()[:_MAX_REPORTED_ERRORS]
+        ]
+        if error.error_count() > _MAX_REPORTED_ERRORS:
+            lines.append(f"- en nog {error.error_count() - _MAX_REPORTED_ERRORS} fouten")
+        return "\n".join(lines)
+    return f"- {error}"
+
+
+def _failure_reason(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        # Pydantic meldt kapotte JSON ook als ValidationError (type json_invalid)
+        return "json" if any(item["type"] == "json_invalid" for item in error.errors()) else "schema"
+    return "json"
+
+
+_repair_model = None
+_repair_model_lock = threading.Lock()
+
+
+def _get_repair_model():
+    global _repair_model
+    if _repair_model is None:
+        with _repair_model_lock:
+            if _repair_model is None:
+                from .llm import build_chat_model
+
+                _repair_model = build_chat_model(
+                    "result_repair", temperature=0, response_format=response_format()
+                )
+    return _repair_model
+
+
+async def parse_result(content: str, tool_name: str) -> tuple[ComplianceResult, int]:
+    """Parse de agent output naar een ComplianceResult.
+
+    Voldoet de output niet aan het schema, dan volgt één herstelaanroep met
+    alleen de output en de fouten (niet de hele run) onder structured output.
+    Pas als dat ook faalt, wordt het een leeg oranje resultaat. Geeft ook de
+    tokens van de herstelaanroep terug, voor de admission control.
+    """
+    if not content.strip():
+        result_parse_failures.inc(reason="empty")
+        result_parses.inc(outcome="fallback")
+        return _fallback(tool_name), 0
+
+    try:
+        result = _validate(content)
+    except ValueError as e:
+        reason = _failure_reason(e)
+        result_parse_failures.inc(reason=reason)
+        logger.warning(f"Ongeldig resultaat voor {tool_name} ({reason}), herstelpoging")
+        result, tokens = await _repair(content, _describe_errors(e))
+        if result is None:
+            result_parses.inc(outcome="fallback")
+            return _fallback(tool_name), tokens
+        result_parses.inc(outcome="repaired")
+        return result, tokens
+
+    result_parses.inc(outcome="valid")
+    return result, 0
+
+
+async def _repair(content: str, errors: str) -> tuple[ComplianceResult | None, int]:
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    tokens = 0
+    try:
+        message = await _get_repair_model().ainvoke(
+            [
+                SystemMessage(content=_REPAIR_PROMPT),
+                HumanMessage(content=f"Fouten:\n{errors}\n\nOutput:\n{content}"),
+            ]
+        )
+        tokens = (message.usage_metadata or {}).get("total_tokens", 0)
+        result = _validate(message.content)
+    except Exception as e:
+        result_repairs.inc(outcome="failed")
+        logger.warning(f"Herstel van het resultaat mislukt: {e}")
+        return None, tokens
+    result_repairs.inc(outcome="success")
+    return result, tokens
+
+
+def _fallback(tool_name: str) -> ComplianceResult:
+    return ComplianceResult(
+        tool_name=tool_name,
+        overall_status="orange",
+        summary=(
+            "De analyse kon niet volledig worden afgerond. "
+            "Raadpleeg een FG voor een handmatige beoordeling."
+        ),
+        categories=[],
+        sub_processors=[],
+        sources_consulted=[],
+    )
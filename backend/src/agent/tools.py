@@ -1,76 +1,179 @@
+import asyncio
+import logging
+import sqlite3
+
 import httpx
-from bs4 import BeautifulSoup
-from ddgs import DDGS
 from langchain_core.tools import tool
 
+from ..checks.evidence import collect, extract_evidence, format_evidence
+from ..config import settings
+from ..fetch.client import fetch_page
+from ..fetch.discovery import discover_compliance_urls, normalize_domain
+from ..fetch.politeness import FetchRefused
+from ..search.fanout import SearchUnavailable, search
+from ..storage.corpus import get_corpus_index
+from ..storage.dpf import DPF_LIST_URL, get_dpf_index
+
+logger = logging.getLogger(__name__)
+
 
 @tool
-def web_search(query: str) -> str:
+async def web_search(query: str) -> str:
     """Zoek op het internet naar informatie over een tool, privacy beleid, of compliance documentatie.
 
     Args:
         query: De zoekopdracht, bijv. 'Notion privacy policy GDPR'
     """
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=10))
-    except Exception as e:
-        return f"Zoekfout: {e}"
+        results = await search(query, max_results=10)
+    except SearchUnavailable as e:
+        # Iets anders dan "niets gevonden": de agent kan later opnieuw zoeken
+        return f"Zoeken is op dit moment niet beschikbaar ({e}). Probeer het later opnieuw of gebruik find_compliance_pages."
 
     if not results:
         return "Geen zoekresultaten gevonden."
 
     output = []
     for r in results:
-        title = r.get("title", "Geen titel")
-        url = r.get("href", "")
-        snippet = r.get("body", "")
-        output.append(f"**{title}**\nURL: {url}\n{snippet}")
+        title = r.title or "Geen titel"
+        output.append(f"**{title}**\nURL: {r.url}\n{r.snippet}")
 
     return "\n\n---\n\n".join(output)
 
 
 @tool
 async def fetch_webpage(url: str) -> str:
-    """Haal de inhoud van een webpagina op en converteer naar leesbare tekst.
+    """Haal de inhoud van een webpagina of PDF op en converteer naar leesbare tekst.
 
     Gebruik dit om privacy policies, security pagina's, sub-verwerkerlijsten,
-    en andere compliance documentatie te lezen.
+    verwerkersovereenkomsten (DPA's) en andere compliance documentatie te lezen,
+    ook als die alleen als PDF beschikbaar zijn.
 
     Args:
         url: De volledige URL van de pagina om op te halen.
     """
     try:
-        async with httpx.AsyncClient(
-            follow_redirects=True, timeout=15.0
-        ) as client:
-            response = await client.get(
-                url,
-                headers={
-                    "User-Agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/131.0.0.0 Safari/537.36"
-                    )
-                },
-            )
-            response.raise_for_status()
-    except httpx.HTTPError as e:
+        page = await fetch_page(url)
+    except (httpx.HTTPError, FetchRefused, ValueError) as e:
         return f"Kon de pagina niet ophalen: {e}"
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    if page.text:
+        try:
+            await asyncio.to_thread(
+                get_corpus_index().add, page.url, normalize_domain(page.url), page.text
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Indexeren van {page.url} mislukt: {e}")
+
+    if page.is_pdf:
+        header = (
+            f"Inhoud van {url} (PDF, {page.pages_read} van "
+            f"{page.total_pages} pagina's gelezen)"
+        )
+    else:
+        header = f"Inhoud van {url}"
 
-    # Verwijder scripts, styles, nav, footer
-    for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
-        tag.decompose()
+    # Het corpus en de bewijsherkenning krijgen alles; het LLM een begin om context te sparen
+    text = page.text[: settings.fetch_max_chars] or "(geen leesbare tekst gevonden)"
+    if page.truncated or len(page.text) > settings.fetch_max_chars:
+        text += "\n\n[... tekst ingekort ...]"
 
-    text = soup.get_text(separator="\n", strip=True)
+    # Certificeringen, DPF/SCC, encryptie etc. vooraf herkend, met quote
+    evidence = await asyncio.to_thread(extract_evidence, page.url, page.text) if page.text else []
+    collect(evidence)
+    if evidence:
+        header = f"{format_evidence(evidence)}\n\n{header}"
 
-    # Beperk tot 12000 characters om context window te sparen
-    if len(text) > 12000:
-        text = text[:12000] + "\n\n[... tekst ingekort ...]"
+    return f"{header}:\n\n{text}"
 
-    return f"Inhoud van {url}:\n\n{text}"
 
+@tool
+async def find_compliance_pages(domain: str) -> str:
+    """Vind de compliance-pagina's van een website via robots.txt, sitemaps en trust-center hosts.
+
+    Gebruik dit direct nadat je de officiële website hebt gevonden, VOORDAT je
+    URL-paden gaat raden. Het resultaat is een gerangschikte lijst van bestaande
+    privacy-, DPA-, sub-verwerker-, security- en trust-pagina's.
 
-TOOLS = [web_search, fetch_webpage]
+    Args:
+        domain: Het domein of de homepage van de tool, bijv. 'notion.so'.
+    """
+    domain_map = await discover_compliance_urls(domain)
+
+    if not domain_map.candidates:
+        return (
+            f"Geen compliance-pagina's gevonden in de sitemaps van {domain_map.domain}. "
+            f"Probeer de standaard paden of een web search."
+        )
+
+    lines = [
+        f"- {candidate.url} (score {candidate.score})"
+        for candidate in domain_map.candidates
+    ]
+    return (
+        f"Gevonden compliance-pagina's voor {domain_map.domain} "
+        f"({domain_map.urls_scanned} URL's in {domain_map.sitemaps_read} sitemaps bekeken):\n"
+        + "\n".join(lines)
+    )
+
+
+@tool
+async def search_corpus(query: str, domain: str = "") -> str:
+    """Doorzoek alle eerder opgehaalde compliance-pagina's (privacy policies, DPA's, trust pages).
+
+    Veel sneller dan een web search plus fetch. Gebruik dit eerst voor gerichte
+    vragen over een leverancier, bijv. of die EU data residency noemt. Een
+    treffer is een fragment; haal de pagina met fetch_webpage op voor de
+    volledige, actuele tekst.
+
+    Args:
+        query: Trefwoorden, bijv. 'EU data residency Frankfurt'.
+        domain: Optioneel domein om op te filteren, bijv. 'notion.so' (inclusief subdomeinen).
+    """
+    domain = normalize_domain(domain) if domain.strip() else None
+    hits = await asyncio.to_thread(get_corpus_index().search, query, domain)
+
+    if not hits:
+        scope = f" voor {domain}" if domain else ""
+        return f"Niets gevonden in eerder opgehaalde pagina's{scope}. Gebruik web_search of fetch_webpage."
+
+    output = [
+        f"{hit.url} (opgehaald {hit.fetched_at:%Y-%m-%d})\n{hit.snippet}"
+        for hit in hits
+    ]
+    return "\n\n---\n\n".join(output)
+
+
+@tool
+def check_dpf(organization: str) -> str:
+    """Controleer of een organisatie op de EU-US Data Privacy Framework lijst staat.
+
+    Een lokale kopie van de officiële deelnemerslijst; gebruik dit voor de
+    DPF-check van de tool én van elke sub-verwerker in plaats van web_search.
+    Zoek op de bedrijfsnaam (bijv. 'Slack Technologies'), niet op een URL.
+
+    Args:
+        organization: De naam van de organisatie, bijv. 'Notion Labs'.
+    """
+    index = get_dpf_index()
+    if index is None:
+        return f"De DPF-lijst is niet lokaal beschikbaar. Zoek zelf op {DPF_LIST_URL}."
+
+    matches = index.candidates(organization)
+    snapshot = f"lijst van {index.snapshot_at:%Y-%m-%d}"
+    if not matches:
+        return (
+            f"'{organization}' staat niet op de DPF-lijst ({snapshot}, bron: {DPF_LIST_URL}). "
+            f"De lijst gebruikt de juridische naam; probeer die als die anders is."
+        )
+
+    lines = [
+        f"- {m.organization}: {'actief' if m.active else 'NIET actief'} "
+        f"— bron: {m.url}"
+        + (" (mogelijk een typo, controleer de naam)" if m.match == "fuzzy" else "")
+        for m in matches
+    ]
+    return f"DPF-deelnemers voor '{organization}' ({snapshot}):\n" + "\n".join(lines)
+
+
+TOOLS = [web_search, search_corpus, check_dpf, find_compliance_pages, fetch_webpage]
@@ -1,52 +1,71 @@
+import asyncio
+import importlib.util
 import json
 import logging
-
-from ddgs import DDGS
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import StreamingResponse
+import secrets
+import time
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import formatdate
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 
-from ..agent.graph import run_compliance_check
+from ..agent.admission import AdmissionRejected
+from ..agent.runs import runs
+from ..config import settings
 from ..email_service.service import send_lead_email
+from ..identity.resolver import get_tool_resolver, learn_redirects, resolve_tool
 from ..models import (
     CheckRequest,
     ComplianceResult,
     LeadRequest,
     ProgressUpdate,
+    ResultDiff,
+    ResultVersion,
+    TrafficLight,
 )
-from ..report.generator import generate_report
+from ..profiling import list_profiles, profile_file, profiled, should_profile
+from ..search.fanout import SearchUnavailable, search
+from ..static_files import negotiate_encoding
+from ..storage.diff import diff_results
+from ..storage.export import export_rows, iter_csv, iter_jsonl, iter_parquet
+from ..storage.results import ResultEnvelope, get_result_store
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api")
 
-# In-memory opslag van recente resultaten (simpel, geen database)
-_recent_results: dict[str, ComplianceResult] = {}
-
 
 @router.get("/search-tool")
 async def search_tool(q: str = Query(..., min_length=1, max_length=100)):
     """Zoek naar een tool en gebruik LLM om de officiële naam te extraheren."""
-    from langchain_openai import AzureChatOpenAI
-
-    from ..config import settings
+    from ..agent.llm import build_chat_model
+
+    # Een bekende tool die op de zoekterm lijkt ("salck" → Slack) staat bovenaan;
+    # als identiteit van een check geldt hij pas als de gebruiker hem kiest
+    suggestion = get_tool_resolver().suggest(q)
+    suggested = (
+        [{"name": suggestion.name, "url": f"https://{suggestion.domain}" if suggestion.domain else ""}]
+        if suggestion is not None
+        else []
+    )
 
-    # Stap 1: DuckDuckGo zoekresultaten ophalen
+    # Stap 1: zoekresultaten ophalen (parallel over de geconfigureerde backends)
     try:
-        with DDGS() as ddgs:
-            raw_results = list(ddgs.text(f"{q} software official website", max_results=8))
-    except Exception as e:
-        logger.error(f"Tool search failed: {e}")
-        return [{"name": q.strip(), "url": ""}]
+        raw_results = await search(f"{q} software official website", max_results=8)
+    except SearchUnavailable as e:
+        logger.warning(f"Zoeken naar tool '{q}' mislukt: {e}")
+        raw_results = []
 
     if not raw_results:
-        return [{"name": q.strip(), "url": ""}]
+        return suggested or [{"name": q.strip(), "url": ""}]
 
     # Stap 2: Stuur resultaten naar LLM voor naam-extractie
     search_summary = "\n".join(
-        f"- Title: {r.get('title', '')} | URL: {r.get('href', '')}"
-        for r in raw_results
-        if r.get("title") and r.get("href")
+        f"- Title: {r.title} | URL: {r.url}" for r in raw_results if r.title and r.url
     )
 
     prompt = f"""De gebruiker heeft gezocht op: "{q}"
@@ -67,13 +86,7 @@ BELANGRIJK:
 - 1 tot 3 resultaten"""
 
     try:
-        llm = AzureChatOpenAI(
-            azure_deployment=settings.azure_openai_deployment,
-            azure_endpoint=settings.azure_openai_endpoint,
-            api_key=settings.azure_openai_api_key,
-            api_version=settings.azure_openai_api_version,
-            temperature=0,
-        )
+        llm = build_chat_model("search_tool", temperature=0)
         response = await llm.ainvoke(prompt)
         content = response.content.strip()
 
@@ -85,36 +98,99 @@ BELANGRIJK:
 
         tools = json.loads(content.strip())
         if isinstance(tools, list) and tools:
-            return tools[:3]
+            tools = tools[:3]
+            _learn_identities(tools)
+            names = {str(tool.get("name") or "").strip().lower() for tool in tools}
+            extra = [tool for tool in suggested if tool["name"].lower() not in names]
+            return (extra + tools)[:3]
     except Exception as e:
         logger.error(f"LLM name extraction failed for '{q}': {e}")
 
     # Fallback: geef de query zelf terug
-    return [{"name": q.strip(), "url": ""}]
+    return suggested + [{"name": q.strip(), "url": ""}]
+
+
+def _learn_identities(tools: list[dict]) -> None:
+    """Onthoud welke tools de zoekfunctie vond, zodat latere checks dezelfde sleutel krijgen.
+
+    Alleen naam en URL van de gevonden tool; de zoekterm zelf niet, die kan
+    een tikfout zijn die de LLM naar een andere tool heeft verbeterd.
+    """
+    resolver = get_tool_resolver()
+    for tool in tools:
+        name = str(tool.get("name") or "").strip()
+        url = str(tool.get("url") or "").strip()
+        if not name:
+            continue
+        resolver.learn(name, url, "search_tool")
+        if url:
+            task = asyncio.create_task(learn_redirects(url))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+
+
+# Referenties naar achtergrondtaken, anders kan de GC ze halverwege opruimen
+_background_tasks: set[asyncio.Task] = set()
+
+# ETag van het resultaat → (bestandsnaam, docx bytes), minst recent gebruikt eerst
+_report_cache: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
 
 
 @router.post("/check")
-async def check_tool(request: CheckRequest):
-    """Start een compliance check met SSE streaming voor voortgang."""
+async def check_tool(request: CheckRequest, http_request: Request):
+    """Start een compliance check met SSE streaming voor voortgang.
+
+    De toolnaam wordt eerst herleid tot een canonieke identiteit, zodat
+    "Slack", "slack.com" en "https://slack.com/intl/nl-nl" dezelfde run en hetzelfde resultaat delen.
+    Loopt er al een check voor deze tool, dan kijkt de client mee met die run.
+    Verbreekt de client de verbinding, dan annuleert EventSourceResponse deze
+    generator; is dat de laatste client, dan wordt de run zelf afgebroken.
+    Is er een resultaat jonger dan ``result_replay_ttl_seconds``, dan wordt
+    dat direct teruggestuurd zonder nieuwe run, tenzij de client ``refresh``
+    meestuurt. Met ``X-Profile: 1`` laat een
+    beheerder een nieuwe run profileren (zie /api/admin/profiles).
+    """
+    profile = _profile_requested(http_request)
 
     async def event_generator():
-        result = None
-        async for update in run_compliance_check(request.tool_name):
-            if isinstance(update, ProgressUpdate):
-                yield {
-                    "event": "progress",
-                    "data": update.model_dump_json(),
-                }
-            elif isinstance(update, ComplianceResult):
-                result = update
-                # Sla resultaat op voor rapport generatie
-                _recent_results[request.tool_name.lower()] = result
-                yield {
-                    "event": "result",
-                    "data": result.model_dump_json(),
-                }
-
-        if result is None:
+        identity = resolve_tool(request.tool_name)
+        replay = not (profile or request.refresh)
+        envelope = _replayable_result(identity.key) if replay else None
+        if envelope is not None:
+            yield {
+                "event": "progress",
+                "data": ProgressUpdate(
+                    step="done", message="Recent resultaat gevonden", progress=1.0
+                ).model_dump_json(),
+            }
+            yield {"event": "result", "data": envelope.text}
+            return
+
+        subscription = runs.subscribe(identity.key, identity.name, profile=profile)
+        try:
+            async for update in subscription:
+                if isinstance(update, ProgressUpdate):
+                    yield {
+                        "event": "progress",
+                        "data": update.model_dump_json(),
+                    }
+                elif isinstance(update, ResultEnvelope):
+                    # Door de run opgeslagen en één keer geserialiseerd
+                    envelope = update
+                    yield {
+                        "event": "result",
+                        "data": envelope.text,
+                    }
+        except AdmissionRejected as e:
+            yield {
+                "event": "error",
+                "data": json.dumps({"error": str(e)}),
+            }
+            return
+        finally:
+            subscription.close()
+
+        if envelope is None:
             yield {
                 "event": "error",
                 "data": json.dumps({"error": "Geen resultaat ontvangen"}),
@@ -123,26 +199,268 @@ async def check_tool(request: CheckRequest):
     return EventSourceResponse(event_generator())
 
 
+def _replayable_result(tool_key: str) -> ResultEnvelope | None:
+    ttl = settings.result_replay_ttl_seconds
+    if not ttl or runs.active(tool_key):
+        return None
+    envelope = get_result_store().get_envelope(tool_key)
+    if envelope is None or time.time() - envelope.created_at > ttl:
+        return None
+    return envelope
+
+
+def _stored_envelope(tool_name: str) -> ResultEnvelope | None:
+    store = get_result_store()
+    # Resultaten van vóór de canonieke sleutels staan onder de kleine-letter naam
+    return store.get_envelope(resolve_tool(tool_name).key) or store.get_envelope(
+        tool_name.lower()
+    )
+
+
+def _history_key(tool_name: str) -> str:
+    key = resolve_tool(tool_name).key
+    store = get_result_store()
+    if not store.history(key, limit=1) and store.history(tool_name.lower(), limit=1):
+        return tool_name.lower()
+    return key
+
+
+@router.get("/result/{tool_name}")
+async def get_result(tool_name: str, request: Request):
+    """Het laatste resultaat van een tool, conditioneel op te vragen via ETag.
+
+    De opgeslagen bytes gaan ongewijzigd over de lijn: als de client deflate
+    accepteert zelfs zonder te decomprimeren.
+    """
+    envelope = _stored_envelope(tool_name)
+    if envelope is None:
+        raise HTTPException(status_code=404, detail="Geen check resultaat gevonden voor deze tool.")
+
+    headers = {
+        "ETag": envelope.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "Last-Modified": formatdate(envelope.created_at, usegmt=True),
+    }
+    if _not_modified(request, envelope.etag):
+        return Response(status_code=304, headers=headers)
+
+    accept_encoding = request.headers.get("accept-encoding", "")
+    if negotiate_encoding(accept_encoding, {"deflate"}, preference=("deflate",)) == "deflate":
+        return Response(
+            content=envelope.payload,
+            media_type="application/json",
+            headers={**headers, "Content-Encoding": "deflate"},
+        )
+    return Response(content=envelope.json, media_type="application/json", headers=headers)
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match", "")
+    return if_none_match == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+@router.get("/report/{tool_name}/html")
+async def get_report_html(tool_name: str, request: Request):
+    """Het rapport als HTML om in de browser te lezen.
+
+    Zelfde inhoud als het Word rapport, maar gestreamd per sectie uit
+    voorgecompileerde templates; de .docx wordt alleen nog gemaakt voor
+    een download via POST /api/report.
+    """
+    envelope = _stored_envelope(tool_name)
+    if envelope is None:
+        raise HTTPException(status_code=404, detail="Geen check resultaat gevonden voor deze tool.")
+
+    headers = {
+        "ETag": envelope.etag,
+        "Cache-Control": "no-cache",
+        "Last-Modified": formatdate(envelope.created_at, usegmt=True),
+    }
+    if _not_modified(request, envelope.etag):
+        return Response(status_code=304, headers=headers)
+
+    from ..report.html import render_html
+
+    return StreamingResponse(
+        render_html(envelope.result(), datetime.fromtimestamp(envelope.created_at)),
+        media_type="text/html; charset=utf-8",
+        headers=headers,
+    )
+
+
 @router.post("/report")
-async def generate_report_endpoint(request: CheckRequest):
-    """Genereer een Word rapport voor een eerder uitgevoerde check."""
-    result = _recent_results.get(request.tool_name.lower())
-    if not result:
+async def generate_report_endpoint(request: CheckRequest, http_request: Request):
+    """Genereer een Word rapport voor een eerder uitgevoerde check.
+
+    Rapporten worden gecachet op de ETag van het resultaat: hetzelfde
+    resultaat geeft hetzelfde document zonder opnieuw te genereren. Met
+    ``X-Profile: 1`` wordt het rapport (buiten de cache om) geprofileerd.
+    """
+    profile = _profile_requested(http_request)
+    envelope = _stored_envelope(request.tool_name)
+    if envelope is None:
         raise HTTPException(
             status_code=404,
             detail="Geen check resultaat gevonden voor deze tool. Voer eerst een check uit.",
         )
 
-    buffer = generate_report(result)
+    cached = None if profile else _report_cache.get(envelope.etag)
+    if cached is None:
+        from ..report.generator import generate_report
+
+        result = envelope.result()
+        async with profiled(resolve_tool(result.tool_name).key, "report", should_profile(profile)):
+            # python-docx is CPU-werk; niet op de event loop
+            buffer = await asyncio.to_thread(generate_report, result)
+        filename = f"compliance-rapport-{result.tool_name.lower().replace(' ', '-')}.docx"
+        cached = _report_cache[envelope.etag] = (filename, buffer.getvalue())
+        while len(_report_cache) > settings.report_cache_entries:
+            _report_cache.popitem(last=False)
+    else:
+        _report_cache.move_to_end(envelope.etag)
+
+    filename, content = cached
+    return Response(
+        content=content,
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "ETag": envelope.etag,
+        },
+    )
+
+
+@router.get("/history/{tool_name}", response_model=list[ResultVersion])
+async def get_history(tool_name: str, limit: int = Query(50, ge=1, le=500)):
+    """Alle opgeslagen versies van een tool, nieuwste eerst."""
+    return get_result_store().history(_history_key(tool_name), limit)
+
+
+@router.get("/history/{tool_name}/diff", response_model=ResultDiff)
+async def get_history_diff(
+    tool_name: str,
+    from_version: int | None = None,
+    to_version: int | None = None,
+):
+    """Verschil tussen twee versies; standaard de voorlaatste en de laatste."""
+    store = get_result_store()
+    key = _history_key(tool_name)
+
+    if from_version is None or to_version is None:
+        versions = store.history(key, limit=2)
+        if len(versions) < 2:
+            raise HTTPException(
+                status_code=404,
+                detail="Er zijn minder dan twee versies van deze tool opgeslagen.",
+            )
+        to_version = to_version if to_version is not None else versions[0].version
+        from_version = from_version if from_version is not None else versions[1].version
+
+    old = store.get_version(key, from_version)
+    new = store.get_version(key, to_version)
+    if old is None or new is None:
+        raise HTTPException(status_code=404, detail="Versie niet gevonden voor deze tool.")
+
+    return diff_results(old, new, from_version, to_version)
+
+
+@router.get("/history/{tool_name}/{version}", response_model=ComplianceResult)
+async def get_history_version(tool_name: str, version: int):
+    """Een specifieke opgeslagen versie van een check resultaat."""
+    result = get_result_store().get_version(_history_key(tool_name), version)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Versie niet gevonden voor deze tool.")
+    return result
+
+
+_EXPORT_FORMATS = {
+    "jsonl": (iter_jsonl, "application/x-ndjson", "jsonl"),
+    "csv": (iter_csv, "text/csv; charset=utf-8", "csv"),
+    "parquet": (iter_parquet, "application/vnd.apache.parquet", "parquet"),
+}
+
+
+@router.get("/export")
+async def export_results(
+    format: Literal["jsonl", "csv", "parquet"] = "jsonl",
+    status: list[TrafficLight] = Query(default=[]),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    sub_processor: str | None = Query(None, max_length=100),
+    all_versions: bool = False,
+):
+    """Exporteer opgeslagen resultaten als platte rijen (tool, checks, sub-verwerkers).
+
+    De export wordt gestreamd in batches, dus het geheugengebruik is constant
+    ongeacht het aantal rijen. Standaard alleen de laatste versie per tool.
+    """
+    if format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise HTTPException(
+            status_code=501,
+            detail="Parquet export vereist pyarrow; gebruik format=jsonl of format=csv.",
+        )
+
+    serializer, media_type, extension = _EXPORT_FORMATS[format]
+    results = get_result_store().iter_history(
+        statuses=[s.value for s in status],
+        since=since,
+        until=until,
+        latest_only=not all_versions,
+    )
+    rows = export_rows(results, sub_processor=sub_processor)
 
-    filename = f"compliance-rapport-{result.tool_name.lower().replace(' ', '-')}.docx"
     return StreamingResponse(
-        buffer,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        serializer(rows),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="toolchecker-export.{extension}"'
+        },
+    )
+
+
+def _require_admin(request: Request) -> None:
+    """Alleen met het juiste X-Admin-Token; zonder ingesteld token bestaan de endpoints niet."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("x-admin-token", "")
+    if not secrets.compare_digest(token.encode(), settings.admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Geen toegang")
+
+
+def _profile_requested(request: Request) -> bool:
+    if request.headers.get("x-profile", "").lower() not in ("1", "true"):
+        return False
+    _require_admin(request)
+    return True
+
+
+@router.get("/admin/profiles", dependencies=[Depends(_require_admin)])
+async def get_profiles(tool_name: str | None = Query(None, max_length=100)):
+    """Opgeslagen profielen van checks en rapporten, nieuwste eerst."""
+    return await asyncio.to_thread(
+        list_profiles, resolve_tool(tool_name).key if tool_name else None
     )
 
 
+@router.get("/admin/profiles/{check_id}/cpu", dependencies=[Depends(_require_admin)])
+async def get_profile_cpu(check_id: str):
+    """CPU-samples in collapsed-stack formaat, voor flamegraph.pl, speedscope of inferno."""
+    path = profile_file(check_id, "cpu.folded")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profiel niet gevonden.")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=f"{check_id}.folded")
+
+
+@router.get("/admin/profiles/{check_id}/memory", dependencies=[Depends(_require_admin)])
+async def get_profile_memory(check_id: str):
+    """De grootste netto allocaties (tracemalloc) tijdens de check."""
+    path = profile_file(check_id, "memory.json")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Geen geheugenprofiel gevonden.")
+    return FileResponse(path, media_type="application/json")
+
+
 @router.post("/lead")
 async def submit_lead(request: LeadRequest):
     """Verwerk een lead en verstuur email notificatie."""
@@ -1,13 +1,20 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from .api.routes import router
 from .config import settings
+from .loop_monitor import LoopMonitor
+from .metrics import registry
+from .profiling import install as install_profiling
+from .static_files import PrecompressedStaticFiles
+from .storage.dpf import run_refresh_loop
 
 load_dotenv()
 
@@ -16,10 +23,77 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+logger = logging.getLogger(__name__)
+
+# Status van de warm-up: "starting", "ready" of "failed"
+_warm_up_state = {"status": "starting"}
+
+
+def _warm_up() -> None:
+    """Importeer de zware dependencies en bouw de agent vooraf.
+
+    Draait in een thread na het opstarten, zodat /health meteen antwoordt en
+    de eerste check niet op de imports hoeft te wachten.
+    """
+    import azure.communication.email  # noqa: F401
+    import ddgs  # noqa: F401
+
+    from .agent.graph import get_agent
+    from .identity.resolver import get_tool_resolver
+    from .report import generator  # noqa: F401
+    from .storage.dpf import get_dpf_index, rebuild_index
+    from .storage.geoip import get_geo_database
+
+    get_agent()
+    get_tool_resolver()
+    rebuild_index()
+    get_dpf_index()
+    get_geo_database()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    monitor = None
+    if settings.loop_monitor_enabled:
+        monitor = LoopMonitor(
+            interval=settings.loop_monitor_interval_seconds,
+            threshold=settings.loop_monitor_block_threshold_seconds,
+        )
+        monitor.start()
+    if settings.admin_token or settings.profiling_sample_rate > 0:
+        install_profiling(asyncio.get_running_loop())
+    if settings.warm_up_on_startup:
+        task = asyncio.create_task(_run_warm_up())
+    else:
+        _warm_up_state["status"] = "ready"
+        task = None
+    dpf_refresh = (
+        asyncio.create_task(run_refresh_loop()) if settings.dpf_refresh_hours > 0 else None
+    )
+    yield
+    if task is not None and not task.done():
+        task.cancel()
+    if dpf_refresh is not None:
+        dpf_refresh.cancel()
+    if monitor is not None:
+        monitor.stop()
+
+
+async def _run_warm_up() -> None:
+    try:
+        await asyncio.to_thread(_warm_up)
+        _warm_up_state["status"] = "ready"
+        logger.info("Warm-up voltooid, app is ready")
+    except Exception:
+        _warm_up_state["status"] = "failed"
+        logger.exception("Warm-up mislukt")
+
+
 app = FastAPI(
     title="ToolChecker by &samhoud",
     description="AVG/GDPR Compliance Checker voor tools en software",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -35,14 +109,38 @@ app.include_router(router)
 
 @app.get("/health")
 async def health_check():
+    """Liveness: het proces draait en serveert requests."""
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: dependencies zijn geladen en de agent is gebouwd."""
+    status = _warm_up_state["status"]
+    return JSONResponse(
+        {"status": status},
+        status_code=200 if status == "ready" else 503,
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """Counters en latency-histogrammen van dit worker-proces, incl. event-loop lag."""
+    return registry.snapshot()
+
+
 # Serveer de gebouwde frontend (alleen in productie, niet wanneer dev-server draait)
-# De StaticFiles mount op "/" moet ONDER alle API routes staan.
+# Assets worden bij het opstarten ingelezen en vooraf gecomprimeerd.
+# De static mount op "/" moet ONDER alle API routes staan.
 # Starlette verwerkt routes in volgorde — de router routes worden eerst gecheckt.
 import os
 
 _frontend_dist = Path(__file__).resolve().parent.parent.parent / "frontend" / "dist"
 if _frontend_dist.is_dir() and os.environ.get("SERVE_FRONTEND", "").lower() == "true":
-    app.mount("/", StaticFiles(directory=str(_frontend_dist), html=True), name="frontend")
+    app.mount(
+        "/",
+        PrecompressedStaticFiles(
+            directory=_frontend_dist, max_memory_bytes=settings.static_max_memory_bytes
+        ),
+        name="frontend",
+    )
@@ -0,0 +1,285 @@
+import re
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from ..metrics import registry
+from ..models import CheckResult, ComplianceResult, Source
+
+evidence_found = registry.counter(
+    "evidence_facts_total", "Feiten die de pre-classifier op opgehaalde pagina's vond"
+)
+
+
+@dataclass(frozen=True)
+class EvidenceCheck:
+    """Een check uit SYSTEM_PROMPT waar patroonbewijs voor bestaat."""
+
+    category: str
+    name: str
+    # Woorden waaraan een check in het agent-resultaat te herkennen is
+    terms: tuple[str, ...]
+
+
+_STORAGE = "Dataopslag & Verwerking"
+_RIGHTS = "Datarechten (AVG)"
+_SECURITY = "Beveiliging"
+
+CHECKS = {
+    "location": EvidenceCheck(_STORAGE, "Datalocatie", ("opgeslagen", "locatie", "residency")),
+    "transfers": EvidenceCheck(_STORAGE, "Doorgifte buiten de EU", ("verwerkt", "doorgifte", "scc")),
+    "dpa": EvidenceCheck(_STORAGE, "Verwerkersovereenkomst (DPA)", ("dpa", "verwerkersovereenkomst")),
+    "dpf": EvidenceCheck(_STORAGE, "EU-US Data Privacy Framework", ("privacy framework", "dpf")),
+    "retention": EvidenceCheck(_RIGHTS, "Retentietijd", ("retentie", "bewaar")),
+    "erasure": EvidenceCheck(_RIGHTS, "Verwijdering op verzoek", ("verwijder", "vergetelheid")),
+    "portability": EvidenceCheck(_RIGHTS, "Data-export", ("export", "portabiliteit")),
+    "ai_training": EvidenceCheck(_RIGHTS, "Gebruik voor AI-training", ("train",)),
+    "certifications": EvidenceCheck(_SECURITY, "Certificeringen", ("certific", "soc 2", "iso")),
+    "encryption": EvidenceCheck(_SECURITY, "Encryptie", ("encrypt",)),
+    "breach": EvidenceCheck(_SECURITY, "Incident response", ("incident", "breach", "datalek")),
+}
+
+# (feit, check, frasen); frasen in kleine letters met enkele spaties. Alleen frasen
+# die precies genoeg zijn om als bron te dienen: eigennamen van certificaten en
+# documenten, of zinnen waarin de leverancier over zichzelf spreekt ("we retain").
+# Losse woorden als "at rest", "72 hours" of "frankfurt" staan op elke AVG-uitlegpagina.
+_FACTS: list[tuple[str, str, tuple[str, ...]]] = [
+    ("SOC 2", "certifications", ("soc 2", "soc2", "soc-2", "soc ii")),
+    ("ISO 27001", "certifications", ("iso 27001", "iso27001", "iso/iec 27001", "iso-27001", "iso iec 27001")),
+    ("ISO 27701", "certifications", ("iso 27701", "iso27701", "iso/iec 27701")),
+    ("ISO 27018", "certifications", ("iso 27018", "iso27018", "iso/iec 27018")),
+    ("Data Privacy Framework", "dpf", (
+        "dpf principles", "certified under the eu-u.s. data privacy framework",
+        "certified to the eu-u.s. data privacy framework",
+        "participates in the eu-u.s. data privacy framework",
+        "complies with the eu-u.s. data privacy framework",
+    )),
+    ("Privacy Shield (vervallen)", "dpf", ("privacy shield",)),
+    ("Standard Contractual Clauses", "transfers", (
+        "standard contractual clauses", "standard contractual clause", "sccs",
+        "standaardcontractbepalingen",
+    )),
+    ("Encryptie at rest", "encryption", (
+        "encrypted at rest", "encryption at rest", "aes-256", "aes 256", "aes256",
+    )),
+    ("Encryptie in transit", "encryption", (
+        "encrypted in transit", "encryption in transit", "tls 1.2", "tls 1.3", "tls1.2", "tls v1.2",
+    )),
+    ("Verwerkersovereenkomst (DPA)", "dpa", (
+        "data processing agreement", "data processing addendum", "data protection addendum",
+        "data processing terms", "verwerkersovereenkomst",
+    )),
+    ("Bewaartermijn", "retention", (
+        "we retain", "we will retain", "we keep your", "wij bewaren", "bewaren wij",
+    )),
+    ("Recht op verwijdering", "erasure", (
+        "delete your data", "delete your personal", "request deletion of your",
+        "request that we delete",
+    )),
+    ("Dataportabiliteit", "portability", (
+        "export your data", "download a copy of your data",
+    )),
+    ("Gebruik voor AI-training", "ai_training", (
+        "train our models", "training our models", "train our ai", "use your data to train",
+        "used to train our",
+    )),
+    ("EU data residency", "location", (
+        "stored in the eu", "hosted in the eu", "stored in the european union",
+        "hosted in the european union", "eu data center", "eu data centre",
+    )),
+    ("Meldplicht datalekken", "breach", (
+        "notify you without undue delay", "notify customer without undue delay",
+        "notify customers without undue delay", "notify you within 72 hours",
+        "notify customer within 72 hours",
+    )),
+]
+
+
+class _Automaton:
+    """Aho-Corasick automaat: alle frasen in één doorloop over de tekst."""
+
+    def __init__(self, phrases: dict[str, int]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[tuple[int, int], ...]] = [()]
+
+        for phrase, value in phrases.items():
+            state = 0
+            for char in phrase:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += ((len(phrase), value),)
+
+        # Breadth-first de fail-links leggen en de uitvoer van suffixen overnemen
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def scan(self, text: str) -> Iterator[tuple[int, int, int]]:
+        """Geeft (start, eind, waarde) voor elke treffer."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                for length, value in out[state]:
+                    yield index - length + 1, index + 1, value
+
+
+_AUTOMATON = _Automaton(
+    {phrase: index for index, (_, _, phrases) in enumerate(_FACTS) for phrase in phrases}
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_QUOTE_RADIUS = 160
+# Zinseinde: niet na een hoofdletter, anders breekt "EU-U.S. Data Privacy Framework"
+_SENTENCE_END = re.compile(r"(?<=[a-z0-9)\"'”])[.!?](?= )")
+
+
+@dataclass(frozen=True)
+class Evidence:
+    fact: str
+    check: str
+    url: str
+    quote: str
+
+
+def extract_evidence(url: str, text: str) -> list[Evidence]:
+    """Alle herkende feiten op een pagina, met de zin eromheen als quote.
+
+    Per feit één quote (de eerste vermelding); de agent ziet zo in een paar
+    regels wat anders ergens in 12.000 tekens tekst staat.
+    """
+    normalized = _WHITESPACE.sub(" ", text)
+    lowered = normalized.lower()
+    # Een enkel teken kan in kleine letters langer worden; dan quoten uit de lowercase tekst
+    original = normalized if len(lowered) == len(normalized) else lowered
+    seen: set[int] = set()
+    found = []
+    for start, end, index in _AUTOMATON.scan(lowered):
+        if index in seen or not _on_word_boundary(lowered, start, end):
+            continue
+        seen.add(index)
+        fact, check, _ = _FACTS[index]
+        found.append(
+            Evidence(fact=fact, check=check, url=url, quote=_sentence(original, start, end))
+        )
+        evidence_found.inc(check=check)
+    return found
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not text[start - 1].isalnum()) and (
+        end == len(text) or not text[end].isalnum()
+    )
+
+
+def _sentence(text: str, start: int, end: int) -> str:
+    """De zin rond een treffer, ingekort tot een paar honderd tekens."""
+    left = max(0, start - _QUOTE_RADIUS)
+    right = min(len(text), end + _QUOTE_RADIUS)
+    ends = [match.end() for match in _SENTENCE_END.finditer(text, left, right)]
+    before = [e for e in ends if e <= start]
+    after = [e for e in ends if e >= end]
+
+    quote = text[before[-1] if before else left : after[0] if after else right].strip()
+    if not before and left > 0:
+        quote = "…" + quote
+    if not after and right < len(text):
+        quote += "…"
+    return quote
+
+
+def format_evidence(items: list[Evidence]) -> str:
+    """Regels voor boven de paginatekst in de output van fetch_webpage."""
+    if not items:
+        return ""
+    lines = [
+        f'- {CHECKS[item.check].name}: {item.fact} — "{item.quote}"'
+        for item in sorted(items, key=lambda e: list(CHECKS).index(e.check))
+    ]
+    return (
+        "Gevonden bewijs (automatisch herkend; controleer de context, "
+        "bijv. een ontkenning):\n" + "\n".join(lines)
+    )
+
+
+class EvidenceCollector:
+    """Verzamelt het bewijs van alle pagina's die de agent in één run ophaalt."""
+
+    def __init__(self):
+        self._items: dict[tuple[str, str], Evidence] = {}
+
+    def add(self, items: list[Evidence]) -> None:
+        for item in items:
+            self._items.setdefault((item.fact, item.url), item)
+
+    def items(self) -> list[Evidence]:
+        return list(self._items.values())
+
+    def attach_to(self, result: ComplianceResult, per_check: int = 2) -> None:
+        """Geef checks van de agent zonder bronnen de pagina's met bewijs als bron.
+
+        Alleen bronnen, nooit een status: of een vermelding positief of
+        negatief is, blijft het oordeel van de agent. Heeft de agent zelf al
+        bronnen genoemd, dan blijven die de enige.
+        """
+        by_check: dict[str, list[Evidence]] = {}
+        for item in self._items.values():
+            by_check.setdefault(item.check, []).append(item)
+
+        for category in result.categories:
+            for check in category.checks:
+                if check.sources:
+                    continue
+                key = match_check(category.name, check)
+                if key is None or key not in by_check:
+                    continue
+                known: set[str] = set()
+                for item in by_check[key]:
+                    if len(known) >= per_check:
+                        break
+                    if item.url in known:
+                        continue
+                    check.sources.append(Source(url=item.url, title=item.fact, quote=item.quote))
+                    known.add(item.url)
+
+
+def match_check(category: str, check: CheckResult) -> str | None:
+    """De sleutel in CHECKS van een check uit het agent-resultaat, als die er is."""
+    text = f"{check.name} {check.description}".lower()
+    for key, spec in CHECKS.items():
+        if spec.category == category and any(term in text for term in spec.terms):
+            return key
+    return None
+
+
+_collector: ContextVar[EvidenceCollector | None] = ContextVar("evidence_collector", default=None)
+
+
+def start_collecting() -> EvidenceCollector:
+    """Nieuwe collector voor de huidige run; tools in de run erven hem via de context."""
+    collector = EvidenceCollector()
+    _collector.set(collector)
+    return collector
+
+
+def collect(items: list[Evidence]) -> None:
+    collector = _collector.get()
+    if collector is not None:
+        collector.add(items)
@@ -1,6 +1,18 @@
+from pathlib import Path
+
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
 
+class LLMDeployment(BaseModel):
+    """Een extra Azure OpenAI deployment (bijv. in een andere regio)."""
+
+    deployment: str
+    endpoint: str
+    api_key: str = ""
+    api_version: str = ""
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -9,17 +21,123 @@ class Settings(BaseSettings):
     azure_openai_endpoint: str = ""
     azure_openai_deployment: str = "gpt-4o"
     azure_openai_api_version: str = "2024-12-01-preview"
+    # JSON-lijst van LLMDeployment objecten voor fallback en hedging
+    azure_openai_hedge_deployments: list[LLMDeployment] = []
 
-    # Bing Search
-    bing_subscription_key: str = ""
+    # LLM-aanroepen (0 seconden hedge delay = geen hedging)
+    llm_timeout_seconds: float = 90.0
+    llm_max_retries: int = 3
+    llm_retry_base_delay_seconds: float = 1.0
+    llm_retry_max_delay_seconds: float = 20.0
+    llm_hedge_delay_seconds: float = 0.0
+    # Eindresultaat van de agent afdwingen met een JSON-schema (structured output);
+    # vereist een deployment die dat ondersteunt, zoals gpt-4o 2024-08-06 of nieuwer
+    azure_openai_structured_output: bool = True
+
+    # Zoek-API's naast DuckDuckGo (de Bing Search API is in augustus 2025 uitgezet)
+    brave_search_api_key: str = ""
+    # Basis-URL van een eigen SearXNG-instantie met het json-formaat aan
+    searxng_url: str = ""
+
+    # Zoeken: backends in volgorde van voorkeur (brave en searxng alleen als ze zijn ingesteld);
+    # de beste ``search_fanout`` lopen parallel, het eerste antwoord met genoeg resultaten wint
+    search_backends: list[str] = ["ddgs", "brave", "searxng"]
+    search_fanout: int = 2
+    search_sufficient_results: int = 5
+    search_timeout_seconds: float = 10.0
+    search_cooldown_seconds: float = 60.0
 
     # Azure Communication Services
     azure_communication_connection_string: str = ""
     azure_communication_sender: str = ""
     lead_email_recipient: str = "data.team@samhoud.com"
 
+    # Admission control voor agent runs (0 TPM = geen token pacing). Slots en wachtrij
+    # gelden per worker; de TPM-quota van de deployment wordt over de workers verdeeld
+    max_concurrent_checks: int = 4
+    max_queued_checks: int = 100
+    azure_openai_tpm_limit: int = 0
+    # Aantal uvicorn workers; dezelfde variabele (WEB_CONCURRENCY) als uvicorn --workers leest
+    web_concurrency: int = 1
+    estimated_tokens_per_check: int = 60_000
+    estimated_check_seconds: float = 60.0
+    admission_status_interval_seconds: float = 5.0
+
+    # Gedeelde opslag voor alle workers op de host
+    data_dir: str = str(Path(__file__).resolve().parent.parent / "data")
+    result_store_mmap_bytes: int = 64_000_000
+    # Een check binnen deze tijd na de vorige krijgt het opgeslagen resultaat (0 = altijd opnieuw).
+    # Standaard uit: een nieuwe check moet ook echt opnieuw kijken, tenzij de beheerder dit aanzet
+    result_replay_ttl_seconds: int = 0
+    # Gegenereerde Word-rapporten in het geheugen, per resultaat-ETag
+    report_cache_entries: int = 32
+
+    # Opstarten: zware imports en de agent in de achtergrond voorbereiden
+    warm_up_on_startup: bool = True
+
+    # Event-loop monitor: lag-probe en stack samples van blokkerende code
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_seconds: float = 0.1
+    loop_monitor_block_threshold_seconds: float = 0.25
+
+    # Beheer: zonder token staan de admin-endpoints uit (header X-Admin-Token)
+    admin_token: str = ""
+    # Profileren van losse checks: CPU-samples en tracemalloc. Een beheerder kan een
+    # check laten profileren (header X-Profile: 1); daarnaast een fractie van alle checks
+    profiling_sample_rate: float = 0.0
+    profiling_interval_seconds: float = 0.01
+    # tracemalloc vertraagt het hele proces; alleen bij profielen die een beheerder vroeg
+    profiling_memory: bool = True
+    profiling_keep: int = 200
+
+    # EU-US Data Privacy Framework deelnemerslijst (JSON of CSV export); zonder URL
+    # wordt alleen een lokaal neergezette snapshot geïndexeerd (0 uur = niet verversen)
+    dpf_snapshot_url: str = ""
+    dpf_snapshot_path: str = ""
+    dpf_refresh_hours: float = 24.0
+
+    # Lokale IP-geolocatie (MaxMind .mmdb) als eerste bewijs voor de hostinglocatie;
+    # vereist de optionele dependency maxminddb. Leeg pad = GeoLite2-Country.mmdb en
+    # GeoLite2-ASN.mmdb in data_dir
+    geoip_country_db_path: str = ""
+    geoip_asn_db_path: str = ""
+    hosting_dns_timeout_seconds: float = 3.0
+
     # Frontend
     frontend_url: str = "http://localhost:5173"
+    # Toolcatalogus van de frontend, basis voor het herkennen van toolnamen
+    tool_catalog_path: str = str(
+        Path(__file__).resolve().parent.parent.parent / "frontend" / "src" / "data" / "tool-catalog.ts"
+    )
+    # Bestanden tot deze grootte worden gecomprimeerd in het geheugen gehouden
+    static_max_memory_bytes: int = 2_000_000
+
+    # Ophalen van webpagina's en PDF's
+    fetch_timeout_seconds: float = 15.0
+    # Tekens die de agent per pagina te zien krijgt
+    fetch_max_chars: int = 12000
+    # Wat er maximaal uit een pagina of PDF wordt geëxtraheerd; alles daarvan gaat het corpus in
+    fetch_extract_max_chars: int = 200_000
+    fetch_max_html_bytes: int = 5_000_000
+    fetch_pdf_max_pages: int = 200
+    fetch_pdf_max_bytes: int = 30_000_000
+    fetch_spool_max_bytes: int = 2_000_000
+    fetch_cache_entries: int = 256
+    fetch_host_rate_per_second: float = 2.0
+    fetch_host_burst: int = 4
+    fetch_max_retries: int = 2
+    fetch_retry_base_delay_seconds: float = 0.5
+    fetch_retry_max_delay_seconds: float = 8.0
+    fetch_circuit_failure_threshold: int = 4
+    fetch_circuit_cooldown_seconds: float = 120.0
+    fetch_negative_cache_ttl_seconds: float = 3600.0
+
+    # Discovery van compliance-pagina's (robots.txt, sitemaps, trust hosts)
+    discovery_timeout_seconds: float = 8.0
+    discovery_max_sitemaps: int = 6
+    discovery_max_urls_per_sitemap: int = 50_000
+    discovery_max_candidates: int = 15
+    discovery_cache_ttl_seconds: int = 24 * 3600
 
     model_config = {"env_file": ".env", "extra": "ignore"}
 
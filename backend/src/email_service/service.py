@@ -1,7 +1,5 @@
 import logging
 
-from azure.communication.email import EmailClient
-
 from ..config import settings
 from ..models import LeadRequest
 
@@ -14,6 +12,8 @@ async def send_lead_email(lead: LeadRequest) -> bool:
         logger.warning("Azure Communication Services niet geconfigureerd, email wordt overgeslagen.")
         return False
 
+    from azure.communication.email import EmailClient
+
     try:
         client = EmailClient.from_connection_string(
             settings.azure_communication_connection_string
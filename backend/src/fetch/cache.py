@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class CachedPage:
+    """Geëxtraheerde tekst van een pagina met de validators van de server."""
+
+    url: str
+    content_type: str
+    text: str
+    truncated: bool
+    etag: str | None = None
+    last_modified: str | None = None
+    pages_read: int = 0
+    total_pages: int = 0
+
+
+class PageCache:
+    """LRU cache van geëxtraheerde paginatekst, gevalideerd via ETag.
+
+    Alleen de tekst wordt bewaard, nooit de ruwe bytes. Bij een volgende fetch
+    stuurt de client ``If-None-Match`` mee; een 304 levert dan direct de
+    gecachte tekst op zonder opnieuw te downloaden of te parsen.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, CachedPage] = OrderedDict()
+
+    def get(self, url: str) -> CachedPage | None:
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def put(self, page: CachedPage) -> None:
+        if not page.etag and not page.last_modified:
+            # Zonder validator kunnen we de inhoud later niet revalideren
+            return
+        self._entries[page.url] = page
+        self._entries.move_to_end(page.url)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def validation_headers(self, url: str) -> dict[str, str]:
+        """Conditional request headers voor een eerder gecachte URL."""
+        entry = self._entries.get(url)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
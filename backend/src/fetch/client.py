@@ -0,0 +1,322 @@
+import asyncio
+import email.utils
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+import httpx
+from bs4 import BeautifulSoup
+
+from ..config import settings
+from ..metrics import registry
+from .cache import CachedPage, PageCache
+from .pdf import extract_pdf_text
+from .politeness import (
+    CircuitBreaker,
+    HostRateLimiter,
+    NegativeCache,
+    backoff_delay,
+)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/131.0.0.0 Safari/537.36"
+)
+
+# Tags die geen inhoudelijke tekst bevatten
+_STRIP_TAGS = ["script", "style", "nav", "footer", "header", "aside"]
+
+# Transiënte statuscodes waarop een GET opnieuw geprobeerd wordt
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_page_cache = PageCache(max_entries=settings.fetch_cache_entries)
+_rate_limiter = HostRateLimiter(
+    rate_per_second=settings.fetch_host_rate_per_second,
+    burst=settings.fetch_host_burst,
+)
+_circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.fetch_circuit_failure_threshold,
+    cooldown_seconds=settings.fetch_circuit_cooldown_seconds,
+)
+_negative_cache = NegativeCache(
+    ttl_seconds=settings.fetch_negative_cache_ttl_seconds,
+    max_entries=settings.fetch_cache_entries * 4,
+)
+_client: httpx.AsyncClient | None = None
+
+fetch_requests = registry.counter(
+    "fetch_requests_total", "Uitgevoerde HTTP GET's per uitkomst"
+)
+fetch_retries = registry.counter(
+    "fetch_retries_total", "Herhaalde GET's na een transiënte fout"
+)
+fetch_duration = registry.histogram(
+    "fetch_duration_seconds", "Duur van een GET tot de response headers binnen zijn"
+)
+
+
+@dataclass
+class FetchedPage:
+    """Leesbare tekst van een opgehaalde pagina of PDF.
+
+    ``text`` is de volledige extractie (tot ``fetch_extract_max_chars``);
+    ``truncated`` betekent dat de extractie daar of bij het paginabudget stopte.
+    Inkorten voor het LLM gebeurt pas bij de aanroeper.
+    """
+
+    url: str
+    content_type: str
+    text: str
+    truncated: bool
+    pages_read: int = 0
+    total_pages: int = 0
+    from_cache: bool = False
+
+    @property
+    def is_pdf(self) -> bool:
+        return self.content_type == "application/pdf"
+
+
+async def fetch_page(url: str) -> FetchedPage:
+    """Haal een URL op en extraheer de tekst op basis van het content-type.
+
+    HTML gaat door BeautifulSoup, PDF's worden naar een tijdelijk bestand
+    gestreamd en pagina voor pagina uitgelezen. Resultaten met een ETag of
+    Last-Modified worden gecachet en bij een volgende fetch gerevalideerd.
+
+    Raises:
+        httpx.HTTPError: als de pagina niet opgehaald kan worden.
+        FetchRefused: als de host of URL recent al faalde.
+        ValueError: als de inhoud niet leesbaar is (bijv. een kapotte PDF).
+    """
+    headers = _page_cache.validation_headers(url)
+
+    async with polite_stream(url, headers=headers) as response:
+        if response.status_code == 304:
+            cached = _page_cache.get(url)
+            if cached is not None:
+                return _from_cache(cached)
+        response.raise_for_status()
+
+        content_type = _content_type(response)
+        first_chunk = b""
+        chunks = response.aiter_bytes()
+        async for chunk in chunks:
+            if chunk:
+                first_chunk = chunk
+                break
+
+        if content_type == "application/pdf" or first_chunk.startswith(b"%PDF-"):
+            page = await _read_pdf(url, first_chunk, chunks)
+        else:
+            page = await _read_html(url, response, first_chunk, chunks)
+
+        _page_cache.put(
+            CachedPage(
+                url=url,
+                content_type=page.content_type,
+                text=page.text,
+                truncated=page.truncated,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+                pages_read=page.pages_read,
+                total_pages=page.total_pages,
+            )
+        )
+        return page
+
+
+@asynccontextmanager
+async def polite_stream(
+    url: str,
+    headers: dict[str, str] | None = None,
+    timeout: float | None = None,
+    max_retries: int | None = None,
+) -> AsyncIterator[httpx.Response]:
+    """Open een streaming GET met per-host rate limiting, retries en circuit breaking.
+
+    Transiënte fouten (timeouts, verbindingsfouten, 429 en 5xx) worden met
+    jittered exponentiële backoff opnieuw geprobeerd. Hosts die herhaaldelijk
+    falen worden tijdelijk overgeslagen, en 404/410's worden onthouden.
+
+    Raises:
+        FetchRefused: als de host of URL recent al faalde.
+        httpx.HTTPError: als ook de laatste poging mislukt.
+    """
+    host = urlparse(url).hostname or ""
+    _negative_cache.check(url)
+    _circuit_breaker.check(host)
+
+    client = _get_client()
+    if max_retries is None:
+        max_retries = settings.fetch_max_retries
+    response = None
+
+    for attempt in range(max_retries + 1):
+        await _rate_limiter.acquire(host)
+        request = client.build_request(
+            "GET",
+            url,
+            headers={"User-Agent": USER_AGENT, **(headers or {})},
+            timeout=timeout or settings.fetch_timeout_seconds,
+        )
+        started = time.monotonic()
+        try:
+            response = await client.send(request, stream=True)
+        except httpx.TransportError as e:
+            fetch_duration.observe(time.monotonic() - started)
+            fetch_requests.inc(outcome=type(e).__name__)
+            _circuit_breaker.record_failure(host)
+            if attempt == max_retries or _circuit_breaker.is_open(host):
+                raise
+            fetch_retries.inc()
+            await asyncio.sleep(_retry_delay(attempt, None))
+            continue
+
+        fetch_duration.observe(time.monotonic() - started)
+        fetch_requests.inc(outcome=str(response.status_code))
+
+        if response.status_code not in _RETRY_STATUSES:
+            break
+
+        _circuit_breaker.record_failure(host)
+        if attempt == max_retries or _circuit_breaker.is_open(host):
+            break
+        retry_after = response.headers.get("retry-after")
+        await response.aclose()
+        fetch_retries.inc()
+        await asyncio.sleep(_retry_delay(attempt, retry_after))
+
+    if response.status_code < 500 and response.status_code != 429:
+        _circuit_breaker.record_success(host)
+    if response.status_code in (404, 410):
+        _negative_cache.add(url)
+
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Gedeelde client zodat verbindingen per host hergebruikt worden."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=settings.fetch_timeout_seconds,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _client
+
+
+def _retry_delay(attempt: int, retry_after: str | None) -> float:
+    """Backoff-duur, met voorrang voor een (begrensde) Retry-After header."""
+    cap = settings.fetch_retry_max_delay_seconds
+    if retry_after:
+        try:
+            return min(cap, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+        try:
+            parsed = email.utils.parsedate_to_datetime(retry_after)
+            return min(cap, max(0.0, parsed.timestamp() - time.time()))
+        except (TypeError, ValueError):
+            pass
+    return backoff_delay(attempt, settings.fetch_retry_base_delay_seconds, cap)
+
+
+def _content_type(response: httpx.Response) -> str:
+    """Bepaal het media type, met de URL-extensie als fallback."""
+    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in ("", "application/octet-stream", "binary/octet-stream"):
+        if urlparse(str(response.url)).path.lower().endswith(".pdf"):
+            return "application/pdf"
+    return content_type or "text/html"
+
+
+async def _read_pdf(url: str, first_chunk: bytes, chunks) -> FetchedPage:
+    """Stream een PDF naar een (gespoold) tijdelijk bestand en lees de tekst uit."""
+    max_bytes = settings.fetch_pdf_max_bytes
+    # Kleine PDF's blijven in het geheugen, grote gaan naar schijf
+    with tempfile.SpooledTemporaryFile(max_size=settings.fetch_spool_max_bytes) as spool:
+        size = len(first_chunk)
+        spool.write(first_chunk)
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValueError(
+                    f"PDF is groter dan {max_bytes // 1_000_000} MB en wordt niet verwerkt"
+                )
+            spool.write(chunk)
+        spool.seek(0)
+
+        # pypdf is CPU-gebonden; houd de event loop vrij
+        pdf = await asyncio.to_thread(
+            extract_pdf_text,
+            spool,
+            settings.fetch_pdf_max_pages,
+            settings.fetch_extract_max_chars,
+        )
+
+    return FetchedPage(
+        url=url,
+        content_type="application/pdf",
+        text=pdf.text,
+        truncated=pdf.truncated,
+        pages_read=pdf.pages_read,
+        total_pages=pdf.total_pages,
+    )
+
+
+async def _read_html(
+    url: str, response: httpx.Response, first_chunk: bytes, chunks
+) -> FetchedPage:
+    """Lees HTML tot de bytelimiet en converteer naar leesbare tekst."""
+    max_bytes = settings.fetch_max_html_bytes
+    body = bytearray(first_chunk)
+    async for chunk in chunks:
+        body.extend(chunk)
+        if len(body) >= max_bytes:
+            del body[max_bytes:]
+            break
+
+    # Parsen van enkele MB's HTML is CPU-werk; niet op de event loop
+    text = await asyncio.to_thread(_html_text, bytes(body), response.encoding or "utf-8")
+
+    truncated = len(text) > settings.fetch_extract_max_chars
+    if truncated:
+        text = text[: settings.fetch_extract_max_chars]
+
+    return FetchedPage(
+        url=url,
+        content_type=_content_type(response),
+        text=text,
+        truncated=truncated,
+    )
+
+
+def _html_text(body: bytes, encoding: str) -> str:
+    soup = BeautifulSoup(body.decode(encoding, errors="replace"), "html.parser")
+
+    # Verwijder scripts, styles, nav, footer
+    for tag in soup(_STRIP_TAGS):
+        tag.decompose()
+
+    return soup.get_text(separator="\n", strip=True)
+
+
+def _from_cache(cached: CachedPage) -> FetchedPage:
+    return FetchedPage(
+        url=cached.url,
+        content_type=cached.content_type,
+        text=cached.text,
+        truncated=cached.truncated,
+        pages_read=cached.pages_read,
+        total_pages=cached.total_pages,
+        from_cache=True,
+    )
@@ -0,0 +1,250 @@
+import asyncio
+import re
+import time
+import zlib
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlparse
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+import httpx
+
+from ..config import settings
+from .client import polite_stream
+from .politeness import FetchRefused
+
+# Sitemaps die we standaard proberen naast wat robots.txt aanwijst
+_SITEMAP_PATHS = ["/sitemap.xml", "/sitemap_index.xml"]
+
+# Subdomeinen waarop trust centers en security portals vaak draaien
+_TRUST_HOSTS = ["trust", "security", "privacy", "legal"]
+
+# Gewicht per trefwoord in het URL-pad, hoe hoger hoe relevanter
+_KEYWORD_WEIGHTS: list[tuple[re.Pattern, int]] = [
+    (re.compile(r"sub-?processors?|subprocessors?"), 10),
+    (re.compile(r"\bdpa\b|data-processing|verwerkersovereenkomst"), 9),
+    (re.compile(r"privacy"), 7),
+    (re.compile(r"gdpr|avg"), 7),
+    (re.compile(r"trust"), 6),
+    (re.compile(r"security|beveiliging"), 5),
+    (re.compile(r"compliance|soc-?2|iso-?27001"), 5),
+    (re.compile(r"legal"), 2),
+    (re.compile(r"terms"), 1),
+]
+
+# Pagina's die wel een trefwoord bevatten maar zelden de echte policy zijn
+_PENALTIES: list[tuple[re.Pattern, int]] = [
+    (re.compile(r"/(blog|news|press|careers|jobs|events|webinars?)/"), -8),
+    (re.compile(r"cookie"), -3),
+    (re.compile(r"/(de|fr|es|it|pt|ja|ko|zh|ru|pl|sv|tr)(-[a-z]{2})?/"), -4),
+]
+
+_candidate_cache: dict[str, tuple[float, "DomainMap"]] = {}
+
+
+@dataclass
+class CandidateUrl:
+    """Een mogelijke compliance-pagina met de reden voor de score."""
+
+    url: str
+    score: int
+    source: str
+
+
+@dataclass
+class DomainMap:
+    """Gerangschikte compliance-URL's voor één domein."""
+
+    domain: str
+    candidates: list[CandidateUrl] = field(default_factory=list)
+    sitemaps_read: int = 0
+    urls_scanned: int = 0
+
+
+def normalize_domain(value: str) -> str:
+    """Geef het kale hostname terug voor een URL of domeinnaam."""
+    value = value.strip()
+    if "://" not in value:
+        value = f"https://{value}"
+    host = (urlparse(value).hostname or "").lower()
+    return host.removeprefix("www.")
+
+
+def score_url(url: str) -> int:
+    """Scoor een URL op basis van compliance-trefwoorden in host en pad."""
+    parsed = urlparse(url.lower())
+    haystack = f"{parsed.hostname or ''}{parsed.path}/"
+    score = sum(weight for pattern, weight in _KEYWORD_WEIGHTS if pattern.search(haystack))
+    if score <= 0:
+        return 0
+    score += sum(penalty for pattern, penalty in _PENALTIES if pattern.search(haystack))
+    # Kortere paden zijn vaker de hoofdpagina dan een subartikel
+    score -= parsed.path.count("/") // 3
+    return score
+
+
+async def discover_compliance_urls(domain: str) -> DomainMap:
+    """Vind en rangschik compliance-pagina's voor een domein.
+
+    Leest robots.txt, sitemaps (inclusief sitemap indexes) en bekende
+    trust-center hosts gelijktijdig. Het resultaat wordt per domein gecachet.
+    """
+    domain = normalize_domain(domain)
+    cached = _candidate_cache.get(domain)
+    if cached and time.monotonic() - cached[0] < settings.discovery_cache_ttl_seconds:
+        return cached[1]
+
+    domain_map = DomainMap(domain=domain)
+    found: dict[str, CandidateUrl] = {}
+
+    def add(url: str, source: str) -> None:
+        domain_map.urls_scanned += 1
+        score = score_url(url)
+        if score <= 0:
+            return
+        existing = found.get(url)
+        if existing is None or existing.score < score:
+            found[url] = CandidateUrl(url=url, score=score, source=source)
+
+    base = f"https://{domain}"
+    robots_sitemaps, trust_hosts = await asyncio.gather(
+        _read_robots(base),
+        _probe_trust_hosts(domain),
+    )
+
+    for url in trust_hosts:
+        # Een bereikbare trust-host is op zichzelf al een sterke kandidaat
+        found[url] = CandidateUrl(url=url, score=score_url(url) + 3, source="trust-host")
+
+    sitemap_urls = list(dict.fromkeys(
+        robots_sitemaps + [urljoin(base, path) for path in _SITEMAP_PATHS]
+    ))
+    await _read_sitemaps(sitemap_urls, domain_map, add)
+
+    domain_map.candidates = sorted(found.values(), key=lambda c: (-c.score, len(c.url)))[
+        : settings.discovery_max_candidates
+    ]
+    _candidate_cache[domain] = (time.monotonic(), domain_map)
+    return domain_map
+
+
+async def _read_robots(base: str) -> list[str]:
+    """Haal de Sitemap-regels uit robots.txt."""
+    try:
+        async with polite_stream(
+            urljoin(base, "/robots.txt"), timeout=settings.discovery_timeout_seconds
+        ) as response:
+            if response.status_code != 200:
+                return []
+            await response.aread()
+    except (httpx.HTTPError, FetchRefused):
+        return []
+
+    return [
+        line.split(":", 1)[1].strip()
+        for line in response.text.splitlines()
+        if line.lower().startswith("sitemap:")
+    ]
+
+
+async def _probe_trust_hosts(domain: str) -> list[str]:
+    """Controleer welke bekende trust-center subdomeinen bestaan."""
+
+    async def probe(host: str) -> str | None:
+        url = f"https://{host}.{domain}/"
+        try:
+            # Niet-bestaande subdomeinen zijn normaal; niet opnieuw proberen
+            async with polite_stream(
+                url, timeout=settings.discovery_timeout_seconds, max_retries=0
+            ) as response:
+                return str(response.url) if response.status_code == 200 else None
+        except (httpx.HTTPError, FetchRefused):
+            return None
+
+    results = await asyncio.gather(*(probe(host) for host in _TRUST_HOSTS))
+    return [url for url in results if url]
+
+
+async def _read_sitemaps(sitemap_urls: list[str], domain_map: DomainMap, add) -> None:
+    """Lees sitemaps gelijktijdig en volg sitemap indexes tot het budget op is."""
+    seen: set[str] = set()
+    queue = list(sitemap_urls)
+
+    while queue and domain_map.sitemaps_read < settings.discovery_max_sitemaps:
+        budget = settings.discovery_max_sitemaps - domain_map.sitemaps_read
+        batch = [url for url in queue[:budget] if url not in seen]
+        queue = queue[budget:]
+        seen.update(batch)
+        if not batch:
+            continue
+
+        results = await asyncio.gather(
+            *(_stream_sitemap(url) for url in batch), return_exceptions=True
+        )
+        children: list[str] = []
+        for sitemap_url, result in zip(batch, results):
+            if isinstance(result, BaseException):
+                continue
+            domain_map.sitemaps_read += 1
+            page_urls, child_sitemaps = result
+            for url in page_urls:
+                add(url, sitemap_url)
+            children.extend(child_sitemaps)
+
+        # Kind-sitemaps met een relevante naam eerst (bijv. sitemap-legal.xml)
+        children.sort(key=lambda url: -score_url(url))
+        queue = children + queue
+
+
+async def _stream_sitemap(url: str) -> tuple[list[str], list[str]]:
+    """Parse een (eventueel gzipped) sitemap incrementeel tijdens het downloaden.
+
+    Returns:
+        Een tuple van pagina-URL's en URL's van onderliggende sitemaps.
+    """
+    parser = XMLPullParser(events=("start", "end"))
+    page_urls: list[str] = []
+    child_sitemaps: list[str] = []
+    max_urls = settings.discovery_max_urls_per_sitemap
+    inflater = None
+    root = None
+    in_index = False
+
+    async with polite_stream(url, timeout=settings.discovery_timeout_seconds) as response:
+        if response.status_code != 200:
+            return [], []
+
+        async for chunk in response.aiter_bytes():
+            if inflater is None:
+                # Gzip sitemaps worden niet altijd met Content-Encoding geserveerd
+                inflater = zlib.decompressobj(31) if chunk[:2] == b"\x1f\x8b" else False
+            if inflater:
+                chunk = inflater.decompress(chunk)
+
+            try:
+                parser.feed(chunk)
+            except ParseError:
+                break
+
+            for event, element in parser.read_events():
+                tag = element.tag.rsplit("}", 1)[-1]
+                if event == "start":
+                    if root is None:
+                        root = element
+                        in_index = tag == "sitemapindex"
+                    continue
+
+                if tag == "loc" and element.text:
+                    loc = element.text.strip()
+                    # Een <loc> in een index verwijst naar een kind-sitemap
+                    if in_index:
+                        child_sitemaps.append(loc)
+                    else:
+                        page_urls.append(loc)
+                elif tag in ("url", "sitemap") and root is not None:
+                    # Houd het geheugen constant: gooi verwerkte elementen weg
+                    root.clear()
+
+            if len(page_urls) >= max_urls:
+                break
+
+    return page_urls, child_sitemaps
@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+
+
+@dataclass
+class PdfText:
+    """Uit een PDF geëxtraheerde tekst, binnen het pagina- en tekenbudget."""
+
+    text: str
+    pages_read: int
+    total_pages: int
+    truncated: bool
+
+
+def extract_pdf_text(stream: BinaryIO, max_pages: int, max_chars: int) -> PdfText:
+    """Extraheer tekst pagina voor pagina uit een PDF.
+
+    pypdf leest de xref-tabel en parseert pagina's pas bij toegang, dus zolang
+    ``stream`` een bestand op schijf is staat nooit het hele document in het
+    geheugen. De extractie stopt zodra het pagina- of tekenbudget op is.
+    """
+    try:
+        reader = PdfReader(stream)
+        if reader.is_encrypted:
+            # Veel leveranciers beveiligen PDF's met een leeg wachtwoord
+            reader.decrypt("")
+        total_pages = len(reader.pages)
+    except (PdfReadError, ValueError, OSError) as e:
+        raise ValueError(f"Ongeldige PDF: {e}") from e
+
+    parts: list[str] = []
+    chars = 0
+    pages_read = 0
+    truncated = False
+
+    for index in range(total_pages):
+        if index >= max_pages or chars >= max_chars:
+            truncated = True
+            break
+
+        try:
+            page_text = reader.pages[index].extract_text() or ""
+        except Exception:
+            # Een kapotte pagina mag de rest van het document niet blokkeren
+            page_text = ""
+        pages_read += 1
+
+        page_text = page_text.strip()
+        if not page_text:
+            continue
+
+        remaining = max_chars - chars
+        if len(page_text) > remaining:
+            page_text = page_text[:remaining]
+            truncated = True
+
+        parts.append(f"[Pagina {index + 1}]\n{page_text}")
+        chars += len(page_text)
+
+    return PdfText(
+        text="\n\n".join(parts),
+        pages_read=pages_read,
+        total_pages=total_pages,
+        truncated=truncated,
+    )
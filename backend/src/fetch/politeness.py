@@ -0,0 +1,139 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from ..metrics import registry
+
+circuit_rejections = registry.counter(
+    "fetch_circuit_rejections_total", "Fetches geweigerd door een open circuit breaker"
+)
+circuit_opened = registry.counter(
+    "fetch_circuit_opened_total", "Aantal keer dat een host-circuit is geopend"
+)
+negative_cache_hits = registry.counter(
+    "fetch_negative_cache_hits_total", "Fetches beantwoord uit de 404-cache"
+)
+host_wait_seconds = registry.histogram(
+    "fetch_host_wait_seconds", "Wachttijd op de per-host rate limiter"
+)
+
+
+class FetchRefused(Exception):
+    """De fetch is niet uitgevoerd omdat de uitkomst al bekend is."""
+
+
+class HostUnavailable(FetchRefused):
+    """De host heeft recent herhaaldelijk gefaald; het circuit is open."""
+
+
+class KnownNotFound(FetchRefused):
+    """De URL gaf recent een 404/410."""
+
+
+class HostRateLimiter:
+    """Token bucket per host zodat één check een site niet overspoelt."""
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self._rate = rate_per_second
+        self._burst = burst
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def acquire(self, host: str) -> None:
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        started = time.monotonic()
+        # De lock maakt de wachtrij per host FIFO
+        async with lock:
+            tokens, updated = self._buckets.get(host, (float(self._burst), started))
+            now = time.monotonic()
+            tokens = min(float(self._burst), tokens + (now - updated) * self._rate)
+            if tokens < 1:
+                await asyncio.sleep((1 - tokens) / self._rate)
+                now = time.monotonic()
+                tokens = 1.0
+            self._buckets[host] = (tokens - 1, now)
+        host_wait_seconds.observe(time.monotonic() - started)
+
+
+@dataclass
+class _CircuitState:
+    failures: int = 0
+    opened_at: float | None = None
+    probe_started: float | None = None
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker: closed → open na N fouten → half-open na cooldown.
+
+    In de half-open toestand mag precies één verzoek de host testen; slaagt
+    dat, dan sluit het circuit weer.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self._threshold = failure_threshold
+        self._cooldown = cooldown_seconds
+        self._states: dict[str, _CircuitState] = {}
+
+    def check(self, host: str) -> None:
+        """Raise HostUnavailable als de host nu niet benaderd mag worden."""
+        state = self._states.get(host)
+        if state is None or state.opened_at is None:
+            return
+        now = time.monotonic()
+        # Een afgebroken probe mag het circuit niet permanent blokkeren
+        probing = state.probe_started is not None and now - state.probe_started < self._cooldown
+        if now - state.opened_at < self._cooldown or probing:
+            circuit_rejections.inc()
+            raise HostUnavailable(
+                f"{host} reageert al een tijd niet; de pagina wordt voorlopig overgeslagen"
+            )
+        state.probe_started = now
+
+    def record_success(self, host: str) -> None:
+        self._states.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        state = self._states.setdefault(host, _CircuitState())
+        state.failures += 1
+        state.probe_started = None
+        if state.opened_at is not None or state.failures >= self._threshold:
+            if state.opened_at is None:
+                circuit_opened.inc()
+            state.opened_at = time.monotonic()
+
+    def is_open(self, host: str) -> bool:
+        state = self._states.get(host)
+        return state is not None and state.opened_at is not None
+
+
+class NegativeCache:
+    """Onthoud recent ontbrekende URL's zodat herhaalde gokken direct falen."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, float] = OrderedDict()
+
+    def add(self, url: str) -> None:
+        self._entries[url] = time.monotonic() + self._ttl
+        self._entries.move_to_end(url)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def check(self, url: str) -> None:
+        """Raise KnownNotFound als de URL recent niet bestond."""
+        expires = self._entries.get(url)
+        if expires is None:
+            return
+        if time.monotonic() > expires:
+            del self._entries[url]
+            return
+        negative_cache_hits.inc()
+        raise KnownNotFound(f"{url} bestaat niet (404)")
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponentiële backoff met full jitter."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
@@ -0,0 +1,95 @@
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Eén regel per tool: { name: "Slack", url: "https://slack.com", category: "..." },
+_ENTRY = re.compile(r'\{\s*name:\s*"([^"]+)",\s*url:\s*"([^"]+)"')
+
+# Tweede-niveau suffixen waaronder bedrijven zelf registreren (geen volledige
+# Public Suffix List, maar dekt de domeinen die we in de praktijk tegenkomen)
+_SECOND_LEVEL = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "com.au", "net.au", "org.au", "co.nz",
+    "co.jp", "ne.jp", "co.kr", "com.br", "com.cn", "com.sg", "com.tr", "com.mx",
+    "co.in", "co.za", "com.ar", "com.hk", "com.tw", "co.il", "com.pl",
+}
+
+# Woorden die niets zeggen over welk product bedoeld wordt
+_NOISE_WORDS = {
+    "the", "inc", "ltd", "llc", "bv", "b.v", "nv", "gmbh", "ag", "sa", "corp",
+    "corporation", "company", "co", "technologies", "technology", "software",
+    "app", "apps", "official", "website", "platform", "hq",
+}
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    name: str
+    url: str
+
+
+def load_catalog(path: Path) -> list[CatalogEntry]:
+    """Lees de toolcatalogus van de frontend (tool-catalog.ts)."""
+    try:
+        source = path.read_text(encoding="utf-8")
+    except OSError:
+        logger.warning(f"Toolcatalogus niet gevonden op {path}")
+        return []
+    return [CatalogEntry(name=name, url=url) for name, url in _ENTRY.findall(source)]
+
+
+def normalize_name(value: str) -> str:
+    """Vergelijkbare vorm van een toolnaam: kleine letters, zonder accenten en ruis."""
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(char for char in value if not unicodedata.combining(char)).lower()
+    words = re.findall(r"[a-z0-9]+(?:\.[a-z0-9]+)*", value)
+    meaningful = [word for word in words if word not in _NOISE_WORDS]
+    return " ".join(meaningful or words)
+
+
+def slugify(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", normalize_name(value)).strip("-")
+
+
+def looks_like_url(value: str) -> bool:
+    value = value.strip()
+    return "://" in value or (" " not in value and re.search(r"\.[a-z]{2,}(/|$)", value.lower()) is not None)
+
+
+def split_url(value: str) -> tuple[str, str]:
+    """(host zonder www., pad zonder slash aan het eind) van een URL of domein."""
+    value = value.strip()
+    if "://" not in value:
+        value = f"https://{value}"
+    parsed = urlparse(value)
+    host = (parsed.hostname or "").lower().removeprefix("www.")
+    return host, parsed.path.rstrip("/").lower()
+
+
+def registrable_domain(host: str) -> str:
+    """Het domein dat een organisatie registreert: notion.so, bbc.co.uk."""
+    labels = host.lower().strip(".").split(".")
+    if len(labels) >= 3 and ".".join(labels[-2:]) in _SECOND_LEVEL:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def osa_distance(a: str, b: str, limit: int) -> int:
+    """Damerau-Levenshtein (optimal string alignment); stopt zodra ``limit`` bereikt is."""
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) >= limit:
+            return limit
+        previous2, previous = previous, current
+    return previous[-1]
@@ -0,0 +1,306 @@
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..config import settings
+from ..metrics import registry
+from .catalog import (
+    CatalogEntry,
+    load_catalog,
+    looks_like_url,
+    normalize_name,
+    osa_distance,
+    registrable_domain,
+    slugify,
+    split_url,
+)
+
+logger = logging.getLogger(__name__)
+
+identity_resolutions = registry.counter(
+    "tool_identity_resolutions_total", "Opgeloste toolnamen per manier van matchen"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tool_aliases (
+    alias      TEXT PRIMARY KEY,
+    name       TEXT NOT NULL,
+    domain     TEXT,
+    source     TEXT NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+-- Oudere versies koppelden bij een URL met pad ook de kale host
+DELETE FROM tool_aliases
+WHERE source = 'search_tool' AND alias LIKE 'site:%' AND instr(alias, '/') = 0
+  AND EXISTS (
+    SELECT 1 FROM tool_aliases deeper
+    WHERE deeper.name = tool_aliases.name AND deeper.alias LIKE tool_aliases.alias || '/%'
+  );
+"""
+
+# Prefix voor aliassen die een host (of host + pad) zijn in plaats van een naam
+_SITE = "site:"
+
+_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class ToolIdentity:
+    """Canonieke identiteit van een tool: productnaam plus registreerbaar domein."""
+
+    name: str
+    domain: str | None = None
+
+    @property
+    def key(self) -> str:
+        """Sleutel voor resultaten, historie en lopende runs."""
+        slug = slugify(self.name) or self.name.strip().lower()
+        return f"{slug}@{self.domain}" if self.domain else slug
+
+
+class ToolResolver:
+    """Zet vrije tekst (naam, typo, URL) om naar één ``ToolIdentity``.
+
+    Bronnen, in volgorde van vertrouwen: de toolcatalogus van de frontend en
+    eerder geleerde aliassen (uit /api/search-tool en gevolgde redirects,
+    gedeeld via SQLite). Alleen een exacte alias, URL of domein levert een
+    bekende identiteit op; fuzzy matches zijn suggesties (``suggest``), want
+    "Motion" ligt op één letter van "Notion" en is toch een ander product.
+    Resultaten worden per invoer gecachet, zodat een lookup op het hot path
+    van /api/check en /api/report een dict-lookup is.
+    """
+
+    def __init__(self, catalog: list[CatalogEntry], db_path: Path, reload_seconds: float = 60.0):
+        self.db_path = db_path
+        self.reload_seconds = reload_seconds
+        self._catalog_aliases: dict[str, ToolIdentity] = {}
+        self._catalog_hosts: dict[str, str | None] = {}
+        self._learned_aliases: dict[str, ToolIdentity] = {}
+        self._by_domain: dict[str, set[ToolIdentity]] = {}
+        self._cache: dict[str, ToolIdentity] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+        for entry in catalog:
+            host, path = split_url(entry.url)
+            identity = ToolIdentity(name=entry.name, domain=registrable_domain(host))
+            for alias in _name_aliases(entry.name):
+                self._catalog_aliases.setdefault(alias, identity)
+                self._catalog_hosts.setdefault(alias, None if path else host)
+            self._catalog_aliases.setdefault(_SITE + host + path, identity)
+            self._by_domain.setdefault(identity.domain, set()).add(identity)
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            db_path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self._reload()
+
+    def resolve(self, text: str) -> ToolIdentity:
+        if time.monotonic() - self._loaded_at > self.reload_seconds:
+            self._reload()
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached
+
+        identity, how = self._resolve(text)
+        identity_resolutions.inc(match=how)
+        if len(self._cache) >= _CACHE_SIZE:
+            self._cache.clear()
+        self._cache[text] = identity
+        return identity
+
+    def _resolve(self, text: str) -> tuple[ToolIdentity, str]:
+        text = text.strip()
+        if looks_like_url(text):
+            return self._resolve_url(text)
+
+        for alias in _name_aliases(text):
+            identity = self._lookup(alias)
+            if identity is not None:
+                return identity, "alias"
+
+        return ToolIdentity(name=text), "unknown"
+
+    def _resolve_url(self, text: str) -> tuple[ToolIdentity, str]:
+        host, path = split_url(text)
+        # Langste bekende prefix van host + pad: figma.com/figjam vóór figma.com
+        segments = path.split("/")
+        for end in range(len(segments), 0, -1):
+            identity = self._lookup(_SITE + host + "/".join(segments[:end]))
+            if identity is not None:
+                return identity, "site"
+
+        domain = registrable_domain(host)
+        identity = self._lookup(_SITE + domain)
+        if identity is not None:
+            return identity, "site"
+        candidates = self._by_domain.get(domain, set())
+        if len(candidates) == 1:
+            return next(iter(candidates)), "domain"
+
+        # Onbekend domein: de naam is het domeinlabel, bijv. "Acme" voor acme.io
+        label = domain.split(".")[0]
+        return ToolIdentity(name=label.capitalize(), domain=domain), "unknown_domain"
+
+    def _lookup(self, alias: str) -> ToolIdentity | None:
+        return self._catalog_aliases.get(alias) or self._learned_aliases.get(alias)
+
+    def catalog_host(self, name: str) -> str | None:
+        """Host van de catalogustool met precies deze naam, bijv. aws.amazon.com voor "AWS".
+
+        Geen geleerde of fuzzy aliassen, en geen tool die alleen een pad op
+        een gedeelde host is (docs.google.com/forms).
+        """
+        for alias in _name_aliases(name):
+            if alias in self._catalog_hosts:
+                return self._catalog_hosts[alias]
+        return None
+
+    def suggest(self, text: str) -> ToolIdentity | None:
+        """Een bekende tool die op ``text`` lijkt, als suggestie voor de gebruiker.
+
+        Nooit gebruiken als identiteit van een run: een naam binnen een kleine
+        edit-afstand kan net zo goed een ander product zijn.
+        """
+        text = text.strip()
+        if looks_like_url(text) or any(self._lookup(alias) for alias in _name_aliases(text)):
+            return None
+        identity = self._fuzzy(normalize_name(text))
+        identity_resolutions.inc(match="fuzzy_suggestion" if identity else "no_suggestion")
+        return identity
+
+    def _fuzzy(self, name: str) -> ToolIdentity | None:
+        """Beste naam binnen een kleine edit-afstand; bij een gelijkspel geen match."""
+        if len(name) < 4:
+            return None
+        max_distance = 1 if len(name) < 8 else 2
+        best: ToolIdentity | None = None
+        best_distance = max_distance
+        tied = False
+        for aliases in (self._catalog_aliases, self._learned_aliases):
+            for alias, identity in aliases.items():
+                if alias.startswith(_SITE) or abs(len(alias) - len(name)) > max_distance:
+                    continue
+                # Eén boven de beste afstand zoeken, anders zie je een gelijkspel niet
+                distance = osa_distance(name, alias, best_distance + 1)
+                if distance < best_distance or (best is None and distance == best_distance):
+                    best, best_distance, tied = identity, distance, False
+                elif distance == best_distance and identity != best:
+                    tied = True
+        return None if tied else best
+
+    def learn(self, name: str, url: str, source: str) -> ToolIdentity:
+        """Leg vast dat ``name`` en ``url`` naar dezelfde tool wijzen.
+
+        De zoekterm van de gebruiker hoort hier niet bij: die kan een tikfout
+        zijn die de LLM stilzwijgend verbeterde. Een URL met pad wordt alleen
+        op dat pad gekoppeld, zoals in de catalogus; anders zou één app in
+        apps.apple.com of github.com de hele host claimen.
+        """
+        identity = self._identity_for(name, url)
+        aliases = set(_name_aliases(name))
+        if url:
+            host, path = split_url(url)
+            aliases.add(_SITE + host + path)
+        # Catalogusnamen liggen vast; die worden niet overschreven
+        self._store({a for a in aliases if a not in self._catalog_aliases}, identity, source)
+        return identity
+
+    def learn_redirect(self, url: str, final_url: str) -> None:
+        """Een domein dat doorverwijst hoort bij de tool van het doel-domein."""
+        host, path = split_url(url)
+        final_host, _ = split_url(final_url)
+        if registrable_domain(host) == registrable_domain(final_host):
+            return
+        identity, how = self._resolve_url(final_url)
+        if how == "unknown_domain":
+            return
+        alias = _SITE + host + path
+        if alias not in self._catalog_aliases:
+            self._store({alias}, identity, "redirect")
+
+    def _identity_for(self, name: str, url: str) -> ToolIdentity:
+        for alias in _name_aliases(name):
+            identity = self._catalog_aliases.get(alias)
+            if identity is not None:
+                return identity
+        if url:
+            identity, how = self._resolve_url(url)
+            if how in ("site", "domain"):
+                return identity
+            return ToolIdentity(name=name.strip(), domain=identity.domain)
+        return ToolIdentity(name=name.strip())
+
+    def _store(self, aliases: set[str], identity: ToolIdentity, source: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tool_aliases VALUES (?, ?, ?, ?, ?)",
+                [(alias, identity.name, identity.domain, source, now) for alias in aliases],
+            )
+            for alias in aliases:
+                self._learned_aliases[alias] = identity
+            self._cache.clear()
+
+    def _reload(self) -> None:
+        """Haal aliassen op die andere workers hebben geleerd."""
+        with self._lock:
+            rows = self._conn.execute("SELECT alias, name, domain FROM tool_aliases").fetchall()
+            self._learned_aliases = {
+                alias: ToolIdentity(name=name, domain=domain) for alias, name, domain in rows
+            }
+            self._cache.clear()
+            self._loaded_at = time.monotonic()
+
+
+def _name_aliases(name: str) -> list[str]:
+    """Genormaliseerde naam, en dezelfde naam aaneengeschreven ("copy ai" → "copyai")."""
+    normalized = normalize_name(name)
+    if not normalized:
+        return []
+    compact = normalized.replace(" ", "").replace(".", "")
+    return [normalized] if compact == normalized else [normalized, compact]
+
+
+_resolver: ToolResolver | None = None
+_resolver_lock = threading.Lock()
+
+
+def get_tool_resolver() -> ToolResolver:
+    """De resolver van dit proces, opgebouwd bij eerste gebruik."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = ToolResolver(
+                    load_catalog(Path(settings.tool_catalog_path)),
+                    Path(settings.data_dir) / "results.sqlite3",
+                )
+    return _resolver
+
+
+def resolve_tool(text: str) -> ToolIdentity:
+    return get_tool_resolver().resolve(text)
+
+
+async def learn_redirects(url: str) -> None:
+    """Volg de redirects van een tool-URL en leer het doel-domein als alias."""
+    import httpx
+
+    from ..fetch.client import polite_stream
+    from ..fetch.politeness import FetchRefused
+
+    try:
+        async with polite_stream(url, timeout=5.0, max_retries=0) as response:
+            final_url = str(response.url)
+    except (httpx.HTTPError, FetchRefused) as e:
+        logger.debug(f"Redirects van {url} niet gevolgd: {e}")
+        return
+    get_tool_resolver().learn_redirect(url, final_url)
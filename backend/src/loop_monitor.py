@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter as FrameCounter
+from pathlib import Path
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+loop_lag = registry.histogram(
+    "event_loop_lag_seconds", "Vertraging van een periodieke probe op de event loop"
+)
+loop_block_seconds = registry.histogram(
+    "event_loop_block_seconds", "Duur van periodes waarin de event loop geblokkeerd was"
+)
+loop_blocks = registry.counter(
+    "event_loop_blocks_total", "Blokkades van de event loop per blokkerende code-locatie"
+)
+
+# Frames uit onze eigen code zijn de interessantste "schuldige"
+_APP_DIR = str(Path(__file__).resolve().parent)
+
+
+class LoopMonitor:
+    """Meet continu de event-loop lag en vangt stacks van blokkerende code.
+
+    Een probe-task op de loop slaapt ``interval`` seconden en meet hoeveel
+    later hij wakker wordt (de lag). Een watchdog-thread houdt de laatste
+    hartslag van de probe in de gaten; blijft die langer dan ``threshold``
+    uit, dan neemt de thread stack samples van de loop-thread totdat de loop
+    weer vrij is. Per blokkade wordt de meest voorkomende code-locatie gelogd
+    en geteld in ``event_loop_blocks_total``.
+    """
+
+    def __init__(self, interval: float, threshold: float, stack_depth: int = 12):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_depth = stack_depth
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._probe_task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start de probe op de huidige loop en de watchdog-thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._probe_task = asyncio.get_running_loop().create_task(self._probe())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+
+    async def _probe(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            loop_lag.observe(max(0.0, now - started - self.interval))
+            self._heartbeat = now
+
+    def _watch(self) -> None:
+        samples: FrameCounter[str] = FrameCounter()
+        first_stack: list[str] = []
+        blocked_since: float | None = None
+
+        while not self._stopped.wait(self.interval / 2):
+            silent_for = time.monotonic() - self._heartbeat
+            # Een gezonde probe meldt zich elke ``interval`` seconden
+            if silent_for > self.interval + self.threshold:
+                if blocked_since is None:
+                    blocked_since = self._heartbeat
+                stack = self._sample_stack()
+                if stack:
+                    samples[_culprit(stack)] += 1
+                    if not first_stack:
+                        first_stack = stack
+                continue
+
+            if blocked_since is not None:
+                duration = self._heartbeat - blocked_since - self.interval
+                self._report(duration, samples, first_stack)
+                samples = FrameCounter()
+                first_stack = []
+                blocked_since = None
+
+    def _sample_stack(self) -> list[str]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return []
+        return [
+            f"{entry.filename}:{entry.lineno} in {entry.name}"
+            for entry in traceback.extract_stack(frame, limit=self.stack_depth)
+        ]
+
+    def _report(self, duration: float, samples: FrameCounter, stack: list[str]) -> None:
+        loop_block_seconds.observe(duration)
+        culprit = samples.most_common(1)[0][0] if samples else "onbekend"
+        loop_blocks.inc(site=culprit)
+        logger.warning(
+            "Event loop %.2fs geblokkeerd, vooral in %s", duration, culprit
+        )
+        if stack:
+            logger.debug("Stack bij begin van de blokkade:\n  %s", "\n  ".join(stack))
+
+
+def _culprit(stack: list[str]) -> str:
+    """Binnenste frame uit onze eigen code, anders het binnenste frame."""
+    for entry in reversed(stack):
+        if entry.startswith(_APP_DIR) and not entry.startswith(__file__):
+            return entry.removeprefix(_APP_DIR + "/")
+    return stack[-1]
@@ -0,0 +1,126 @@
+import threading
+from collections import deque
+
+
+def _label_key(labels: dict[str, str]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_str(key: tuple[tuple[str, str], ...]) -> str:
+    return ",".join(f"{k}={v}" for k, v in key)
+
+
+class Counter:
+    """Monotoon oplopende teller, optioneel per label-combinatie."""
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {_label_str(key): value for key, value in self._values.items()}
+
+
+class Histogram:
+    """Verdeling van waarnemingen met p50/p95/p99 over recente samples.
+
+    Percentielen worden berekend over een begrensd venster van de laatste
+    ``window`` waarnemingen per label, zodat het geheugen constant blijft.
+    """
+
+    def __init__(self, name: str, description: str, window: int = 2048):
+        self.name = name
+        self.description = description
+        self._window = window
+        self._samples: dict[tuple, deque[float]] = {}
+        self._counts: dict[tuple, int] = {}
+        self._sums: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self._window)
+            samples.append(value)
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def percentile(self, q: float, **labels: str) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(_label_key(labels), ()))
+        return _percentile(samples, q)
+
+    def snapshot(self) -> dict[str, dict[str, float | None]]:
+        with self._lock:
+            items = [
+                (key, sorted(samples), self._counts[key], self._sums[key])
+                for key, samples in self._samples.items()
+            ]
+        return {
+            _label_str(key): {
+                "count": count,
+                "sum": round(total, 6),
+                "p50": _percentile(samples, 0.50),
+                "p95": _percentile(samples, 0.95),
+                "p99": _percentile(samples, 0.99),
+                "max": round(samples[-1], 6) if samples else None,
+            }
+            for key, samples, count, total in items
+        }
+
+
+def _percentile(sorted_samples: list[float], q: float) -> float | None:
+    if not sorted_samples:
+        return None
+    index = min(len(sorted_samples) - 1, max(0, round(q * (len(sorted_samples) - 1))))
+    return round(sorted_samples[index], 6)
+
+
+class MetricsRegistry:
+    """Centrale registratie van alle counters en histogrammen in het proces."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, description))
+
+    def histogram(self, name: str, description: str, window: int = 2048) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, description, window))
+
+    def _get_or_create(self, name: str, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def snapshot(self) -> dict[str, dict]:
+        """Alle metrics als JSON-serialiseerbare dict voor het /metrics endpoint."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {
+                "type": "counter" if isinstance(metric, Counter) else "histogram",
+                "description": metric.description,
+                "values": metric.snapshot(),
+            }
+            for metric in metrics
+        }
+
+
+registry = MetricsRegistry()
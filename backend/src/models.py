@@ -1,3 +1,4 @@
+from datetime import datetime
 from enum import Enum
 
 from pydantic import BaseModel, EmailStr
@@ -29,6 +30,26 @@ class CheckResult(BaseModel):
     sources: list[Source] = []
 
 
+class DpfParticipation(BaseModel):
+    """Vermelding op de EU-US Data Privacy Framework deelnemerslijst."""
+
+    organization: str
+    active: bool
+    url: str
+
+
+class HostingLocation(BaseModel):
+    """Waar een domein volgens DNS en lokale IP-geolocatie draait."""
+
+    host: str
+    ip: str
+    country: str | None = None  # ISO 3166-1 alpha-2
+    asn: int | None = None
+    network: str | None = None
+    # Bij een CDN is het land dat van de edge, niet van de opslag
+    cdn: bool = False
+
+
 class SubProcessor(BaseModel):
     """Een sub-verwerker van de tool."""
 
@@ -37,6 +58,8 @@ class SubProcessor(BaseModel):
     data_location: str
     status: TrafficLight
     source: Source | None = None
+    dpf: DpfParticipation | None = None
+    hosting: list[HostingLocation] = []
 
 
 class CategoryResult(BaseModel):
@@ -69,6 +92,8 @@ class CheckRequest(BaseModel):
     """Verzoek om een tool te checken."""
 
     tool_name: str
+    # Altijd een nieuwe run, ook als er een recent opgeslagen resultaat is
+    refresh: bool = False
 
 
 class LeadRequest(BaseModel):
@@ -87,3 +112,59 @@ class ProgressUpdate(BaseModel):
     step: str
     message: str
     progress: float  # 0.0 - 1.0
+    queue_position: int | None = None
+    eta_seconds: float | None = None
+    pages_fetched: int | None = None
+    checks_resolved: int | None = None
+    checks_total: int | None = None
+    sub_processors_resolved: int | None = None
+
+
+class ResultVersion(BaseModel):
+    """Een opgeslagen versie van een check resultaat."""
+
+    version: int
+    tool_name: str
+    overall_status: TrafficLight
+    created_at: datetime
+
+
+class StatusChange(BaseModel):
+    """Wijziging van een stoplicht tussen twee versies."""
+
+    old: TrafficLight | None
+    new: TrafficLight | None
+
+
+class CheckChange(BaseModel):
+    """Een check die is toegevoegd, verwijderd of van status veranderd.
+
+    Bij de datalocatie-check telt ook een andere bevinding (land of regio)
+    met dezelfde status als wijziging; ``status`` is dan leeg.
+    """
+
+    category: str
+    check: str
+    status: StatusChange | None = None
+    finding: tuple[str, str] | None = None
+
+
+class SubProcessorChange(BaseModel):
+    """Gewijzigde datalocatie of status van een bestaande sub-verwerker."""
+
+    name: str
+    data_location: tuple[str, str] | None = None
+    status: StatusChange | None = None
+
+
+class ResultDiff(BaseModel):
+    """Gestructureerd verschil tussen twee versies van een check resultaat."""
+
+    tool_name: str
+    from_version: int
+    to_version: int
+    overall_status: StatusChange | None = None
+    check_changes: list[CheckChange] = []
+    added_sub_processors: list[SubProcessor] = []
+    removed_sub_processors: list[SubProcessor] = []
+    sub_processor_changes: list[SubProcessorChange] = []
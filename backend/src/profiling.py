@@ -0,0 +1,320 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import shutil
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import Counter
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from .config import settings
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+profiles_recorded = registry.counter(
+    "profiles_recorded_total", "Geprofileerde checks en rapporten per aanleiding"
+)
+
+_STACK_DEPTH = 64
+_TOP_ALLOCATIONS = 30
+_CHECK_ID = re.compile(r"^[0-9a-z-]{1,64}$")
+
+# Korte paden in de profielen: src/..., site-packages/... en stdlib/...
+_PATH_PREFIXES = [
+    (str(Path(__file__).resolve().parent.parent) + os.sep, ""),
+    (sysconfig.get_paths()["purelib"] + os.sep, ""),
+    (sysconfig.get_paths()["stdlib"] + os.sep, "stdlib/"),
+]
+
+
+class CheckProfile:
+    """CPU-samples en geheugenverbruik van één check (of één rapport)."""
+
+    def __init__(self, check_id: str, tool: str, stage: str, reason: str):
+        self.check_id = check_id
+        self.tool = tool
+        self.stage = stage
+        self.reason = reason
+        self.stacks: Counter[str] = Counter()
+        self.started_at = time.time()
+        self.started = time.monotonic()
+        self.concurrent = 0
+        self._memory_before: tracemalloc.Snapshot | None = None
+
+    def add(self, stack: str) -> None:
+        self.stacks[stack] += 1
+
+
+class _Profiler:
+    """Eén sampling-thread voor alle lopende profielen van dit proces.
+
+    Elke ``interval`` seconden neemt de thread de stacks van alle threads.
+    De stack van de event-loop-thread telt mee voor het profiel van de task
+    die op dat moment draait; een worker-thread voor het profiel van de
+    task die het werk via de default executor (``asyncio.to_thread``,
+    ``getaddrinfo``) heeft ingediend. Zo krijgt elke check alleen zijn eigen
+    samples, ook als er meerdere tegelijk lopen. Zonder actieve profielen
+    draait er geen thread en kost het niets.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, interval: float):
+        self.loop = loop
+        self.interval = interval
+        self.loop_thread_id = threading.get_ident()
+        self.tasks: weakref.WeakKeyDictionary[asyncio.Task, CheckProfile] = weakref.WeakKeyDictionary()
+        self.threads: dict[int, CheckProfile] = {}
+        self.active: set[CheckProfile] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._memory_users = 0
+
+    async def begin(self, profile: CheckProfile, memory: bool) -> None:
+        with self._lock:
+            self.active.add(profile)
+            profile.concurrent = max(profile.concurrent, len(self.active))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._sample, name="profiler", daemon=True)
+                self._thread.start()
+        if memory:
+            if self._memory_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._memory_users += 1
+            # Een snapshot kost tijd naar rato van de heap; niet op de event loop
+            profile._memory_before = await asyncio.to_thread(tracemalloc.take_snapshot)
+
+    async def end(self, profile: CheckProfile) -> dict | None:
+        with self._lock:
+            self.active.discard(profile)
+        before = profile._memory_before
+        if before is None:
+            return None
+        profile._memory_before = None
+        try:
+            after = await asyncio.to_thread(tracemalloc.take_snapshot)
+            _, peak = tracemalloc.get_traced_memory()
+            return await asyncio.to_thread(_memory_report, before, after, peak)
+        finally:
+            self._memory_users -= 1
+            if self._memory_users == 0:
+                tracemalloc.stop()
+
+    def _sample(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self.active:
+                    self._thread = None
+                    return
+            frames = sys._current_frames()
+            for thread_id, frame in frames.items():
+                if thread_id == self.loop_thread_id:
+                    task = asyncio.current_task(self.loop)
+                    profile = self.tasks.get(task) if task is not None else None
+                else:
+                    profile = self.threads.get(thread_id)
+                if profile is not None and profile in self.active:
+                    profile.add(_fold(frame))
+            del frames
+
+
+def _fold(frame) -> str:
+    """Stack in het "collapsed" formaat van flamegraph.pl: wortel eerst, gescheiden door ;."""
+    names = []
+    while frame is not None and len(names) < _STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _short_path(path: str) -> str:
+    for prefix, replacement in _PATH_PREFIXES:
+        if path.startswith(prefix):
+            return replacement + path[len(prefix) :]
+    return path
+
+
+def _memory_report(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, peak: int) -> dict:
+    """Grootste netto allocaties tussen begin en eind, per regel code."""
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    differences = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    top = sorted(differences, key=lambda stat: stat.size_diff, reverse=True)[:_TOP_ALLOCATIONS]
+    return {
+        # Voor het hele proces: liepen er checks tegelijk, dan tellen die mee
+        "peak_traced_bytes": peak,
+        "top_allocations": [
+            {
+                "site": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size_bytes": stat.size,
+            }
+            for stat in top
+            if stat.size_diff > 0
+        ],
+    }
+
+
+class _AttributingExecutor(ThreadPoolExecutor):
+    """Default executor die onthoudt voor welk profiel een worker-thread werkt."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        profile = _active_profile.get()
+        if profile is None:
+            return super().submit(fn, *args, **kwargs)
+        return super().submit(_run_attributed, profile, fn, *args, **kwargs)
+
+
+def _run_attributed(profile: CheckProfile, fn, *args, **kwargs):
+    thread_id = threading.get_ident()
+    _profiler.threads[thread_id] = profile
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _profiler.threads.pop(thread_id, None)
+
+
+_active_profile: ContextVar[CheckProfile | None] = ContextVar("active_profile", default=None)
+_profiler: _Profiler | None = None
+
+
+def install(loop: asyncio.AbstractEventLoop) -> None:
+    """Maak profileren mogelijk op deze loop: task factory en default executor.
+
+    Tasks die vanuit een geprofileerde check ontstaan (LangGraph tools,
+    fetches) erven zo het profiel van die check.
+    """
+    global _profiler
+    _profiler = _Profiler(loop, settings.profiling_interval_seconds)
+    previous = loop.get_task_factory()
+
+    def task_factory(loop, coro, context=None):
+        if previous is not None:
+            task = previous(loop, coro) if context is None else previous(loop, coro, context=context)
+        else:
+            task = asyncio.Task(coro, loop=loop, context=context)
+        # Het profiel van de context waarin de task gaat draaien
+        profile = context.get(_active_profile) if context is not None else _active_profile.get()
+        if profile is not None:
+            _profiler.tasks[task] = profile
+        return task
+
+    loop.set_task_factory(task_factory)
+    loop.set_default_executor(
+        _AttributingExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4), thread_name_prefix="asyncio")
+    )
+
+
+def should_profile(force: bool) -> str | None:
+    """Waarom deze check geprofileerd wordt ("admin" of "sampled"), of None."""
+    if _profiler is None:
+        return None
+    if force:
+        return "admin"
+    if settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate:
+        return "sampled"
+    return None
+
+
+@asynccontextmanager
+async def profiled(tool: str, stage: str, reason: str | None) -> AsyncIterator[CheckProfile | None]:
+    """Profileer de huidige task en alles wat hij start; schrijft het profiel weg bij afloop.
+
+    Geheugen (tracemalloc) alleen als een beheerder erom vroeg: tracemalloc
+    vertraagt zolang het aanstaat elke allocatie in het hele proces, ook die
+    van andere checks. Steekproeven krijgen dus alleen CPU-samples.
+    """
+    task = asyncio.current_task()
+    if reason is None or _profiler is None or task is None:
+        yield None
+        return
+
+    check_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+    profile = CheckProfile(check_id, tool, stage, reason)
+    token = _active_profile.set(profile)
+    _profiler.tasks[task] = profile
+    await _profiler.begin(profile, memory=reason == "admin" and settings.profiling_memory)
+    logger.info(f"Profiel {check_id} gestart voor {stage} van {tool} ({reason})")
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+        _profiler.tasks.pop(task, None)
+        memory = await _profiler.end(profile)
+        try:
+            await asyncio.to_thread(_store, profile, memory)
+        except OSError as e:
+            logger.warning(f"Profiel {check_id} niet op te slaan: {e}")
+        else:
+            profiles_recorded.inc(stage=stage, reason=reason)
+
+
+def _profiles_dir() -> Path:
+    return Path(settings.data_dir) / "profiles"
+
+
+def _store(profile: CheckProfile, memory: dict | None) -> None:
+    directory = _profiles_dir() / profile.check_id
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / "cpu.folded", "w", encoding="utf-8") as f:
+        for stack, count in profile.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    if memory is not None:
+        (directory / "memory.json").write_text(json.dumps(memory, indent=1), encoding="utf-8")
+    meta = {
+        "check_id": profile.check_id,
+        "tool": profile.tool,
+        "stage": profile.stage,
+        "reason": profile.reason,
+        "started_at": profile.started_at,
+        "duration_seconds": round(time.monotonic() - profile.started, 3),
+        "samples": sum(profile.stacks.values()),
+        "interval_seconds": settings.profiling_interval_seconds,
+        "concurrent_profiles": profile.concurrent,
+        "memory": memory is not None,
+    }
+    (directory / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    _prune()
+
+
+def _prune() -> None:
+    directories = sorted(p for p in _profiles_dir().iterdir() if p.is_dir())
+    for old in directories[: max(0, len(directories) - settings.profiling_keep)]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def list_profiles(tool: str | None = None) -> list[dict]:
+    """Metadata van de opgeslagen profielen, nieuwste eerst."""
+    directory = _profiles_dir()
+    if not directory.exists():
+        return []
+    profiles = []
+    for path in sorted(directory.iterdir(), reverse=True):
+        try:
+            meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if tool is None or meta.get("tool") == tool:
+            profiles.append(meta)
+    return profiles
+
+
+def profile_file(check_id: str, name: str) -> Path | None:
+    """Pad van cpu.folded, memory.json of meta.json van een profiel, als dat bestaat."""
+    if not _CHECK_ID.match(check_id):
+        return None
+    path = _profiles_dir() / check_id / name
+    return path if path.is_file() else None
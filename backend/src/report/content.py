@@ -0,0 +1,125 @@
+"""Teksten die het Word- en het HTML-rapport delen."""
+
+import re
+
+from ..models import ComplianceResult, TrafficLight
+
+# Control-tekens die XML (docx) niet toestaat; tab, newline en carriage return wel
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+STATUS_LABELS = {
+    TrafficLight.GREEN: "GROEN — Veilig te gebruiken",
+    TrafficLight.ORANGE: "ORANJE — Nader onderzoek nodig",
+    TrafficLight.RED: "ROOD — Niet gebruiken zonder waarborgen",
+}
+
+STATUS_EMOJI = {
+    TrafficLight.GREEN: "V",
+    TrafficLight.ORANGE: "!",
+    TrafficLight.RED: "X",
+}
+
+# Stoplicht uitleg onder de overzichtstabel
+STATUS_LEGEND = [
+    (TrafficLight.GREEN, "GROEN", "De tool voldoet op dit punt aan de AVG-vereisten."),
+    (TrafficLight.ORANGE, "ORANJE", "Er zijn aandachtspunten of er kon onvoldoende informatie gevonden worden."),
+    (TrafficLight.RED, "ROOD", "Er zijn serieuze risico's gevonden die actie vereisen."),
+]
+
+# Educatieve content per categorie
+CATEGORY_EDUCATION = {
+    "Dataopslag & Verwerking": (
+        "Waar je data staat bepaalt welke wetten van toepassing zijn. "
+        "Data buiten de EU valt niet automatisch onder de bescherming van de AVG. "
+        "Dat betekent dat persoonsgegevens mogelijk minder goed beschermd zijn. "
+        "Ook sub-verwerkers (bedrijven die namens de tool data verwerken) spelen een rol: "
+        "als een sub-verwerker data in de VS verwerkt, is dat een risicofactor."
+    ),
+    "Datarechten (AVG)": (
+        "De AVG geeft iedereen rechten over hun eigen data: het recht op inzage, "
+        "correctie, verwijdering (recht op vergetelheid), en dataportabiliteit. "
+        "Als een tool deze rechten niet ondersteunt, is het juridisch risicovol "
+        "om er persoonsgegevens in te verwerken. Let ook op of data gebruikt "
+        "wordt voor het trainen van AI-modellen — dit vereist expliciete toestemming."
+    ),
+    "Beveiliging": (
+        "Goede beveiliging is de basis van privacy. Zonder encryptie, certificeringen "
+        "en een plan voor datalekken zijn persoonsgegevens kwetsbaar. Een datalek kan "
+        "leiden tot boetes tot 4% van de jaaromzet. Zoek naar ISO 27001 en SOC 2 "
+        "certificeringen — dit zijn internationale standaarden die aantonen dat een "
+        "organisatie beveiliging serieus neemt."
+    ),
+}
+
+# Generieke aanbevelingen op basis van de eindstatus
+RECOMMENDATIONS = {
+    TrafficLight.GREEN: [
+        "Lees de verwerkersovereenkomst (DPA) door voordat je de tool inzet voor persoonsgegevens.",
+        "Documenteer in je verwerkingsregister welke persoonsgegevens je met deze tool verwerkt.",
+        "Herhaal deze check periodiek, omdat tools hun beleid kunnen wijzigen.",
+    ],
+    TrafficLight.ORANGE: [
+        "Neem contact op met de leverancier om de openstaande vragen te beantwoorden.",
+        "Schakel je Functionaris Gegevensbescherming (FG) in voor een definitieve beoordeling.",
+        "Overweeg een Data Protection Impact Assessment (DPIA) uit te voeren.",
+        "Gebruik de tool voorlopig niet voor gevoelige persoonsgegevens tot de onduidelijkheden zijn opgelost.",
+        "Documenteer de risico's en genomen maatregelen in je verwerkingsregister.",
+    ],
+    TrafficLight.RED: [
+        "Gebruik deze tool NIET voor het verwerken van persoonsgegevens zonder aanvullende maatregelen.",
+        "Schakel juridisch advies in en overleg met je Functionaris Gegevensbescherming (FG).",
+        "Voer een Data Protection Impact Assessment (DPIA) uit.",
+        "Onderzoek alternatieven die beter aan de AVG-vereisten voldoen.",
+        "Als de tool onmisbaar is, bespreek met de leverancier welke aanpassingen mogelijk zijn.",
+    ],
+}
+
+RECOMMENDATIONS_CTA = (
+    "Hulp nodig bij het implementeren van deze aanbevelingen? "
+    "Het Data & AI team van &samhoud helpt je graag. "
+    "Neem contact op via data.team@samhoud.com"
+)
+
+EXTRA_DISCLAIMER = (
+    "Deze analyse is gebaseerd op publiek beschikbare informatie op het moment van de check. "
+    "Tools kunnen hun beleid, documentatie en technische implementatie wijzigen. "
+    "Het is aan te raden om deze check periodiek te herhalen en de uitkomsten te bespreken "
+    "met een Functionaris Gegevensbescherming (FG) of juridisch adviseur."
+)
+
+
+def summary_intro(tool_name: str) -> str:
+    return (
+        f"Dit rapport bevat de resultaten van een geautomatiseerde AVG/GDPR compliance "
+        f"check van {tool_name}. De analyse is gebaseerd op publiek beschikbare "
+        f"informatie zoals de privacy policy, security documentatie en sub-verwerkerlijsten. "
+        f"Per categorie is een stoplicht-oordeel gegeven."
+    )
+
+
+def sub_processors_intro(tool_name: str) -> str:
+    return (
+        f"{tool_name} maakt gebruik van andere bedrijven (sub-verwerkers) "
+        f"om data te verwerken of op te slaan. De veiligheid van je data is zo sterk "
+        f"als de zwakste schakel in deze keten. Als een sub-verwerker data buiten de EU "
+        f"verwerkt, heeft dit gevolgen voor de AVG-compliance."
+    )
+
+
+def printable(result: ComplianceResult) -> ComplianceResult:
+    """Kopie van het resultaat zonder control-tekens in de teksten.
+
+    Bevindingen, citaten en titels komen van webpagina's en het model; een
+    verdwaald ``\\x0b`` of ``\\x01`` laat python-docx anders falen.
+    """
+    return ComplianceResult.model_validate(_strip_controls(result.model_dump()))
+
+
+def _strip_controls(value):
+    if isinstance(value, str):
+        return _CONTROL_CHARS.sub("", value)
+    if isinstance(value, dict):
+        return {key: _strip_controls(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_strip_controls(item) for item in value]
+    return value
@@ -7,6 +7,18 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.shared import Cm, Pt, RGBColor
 
 from ..models import ComplianceResult, TrafficLight
+from .content import (
+    CATEGORY_EDUCATION,
+    EXTRA_DISCLAIMER,
+    RECOMMENDATIONS,
+    RECOMMENDATIONS_CTA,
+    STATUS_EMOJI,
+    STATUS_LABELS,
+    STATUS_LEGEND,
+    printable,
+    sub_processors_intro,
+    summary_intro,
+)
 
 # &samhoud kleuren
 SAMHOUD_BLUE = RGBColor(0x0C, 0x2A, 0xAD)
@@ -26,46 +38,10 @@ STATUS_COLORS = {
     TrafficLight.RED: COLOR_RED,
 }
 
-STATUS_LABELS = {
-    TrafficLight.GREEN: "GROEN — Veilig te gebruiken",
-    TrafficLight.ORANGE: "ORANJE — Nader onderzoek nodig",
-    TrafficLight.RED: "ROOD — Niet gebruiken zonder waarborgen",
-}
-
-STATUS_EMOJI = {
-    TrafficLight.GREEN: "V",
-    TrafficLight.ORANGE: "!",
-    TrafficLight.RED: "X",
-}
-
-# Educatieve content per categorie
-CATEGORY_EDUCATION = {
-    "Dataopslag & Verwerking": (
-        "Waar je data staat bepaalt welke wetten van toepassing zijn. "
-        "Data buiten de EU valt niet automatisch onder de bescherming van de AVG. "
-        "Dat betekent dat persoonsgegevens mogelijk minder goed beschermd zijn. "
-        "Ook sub-verwerkers (bedrijven die namens de tool data verwerken) spelen een rol: "
-        "als een sub-verwerker data in de VS verwerkt, is dat een risicofactor."
-    ),
-    "Datarechten (AVG)": (
-        "De AVG geeft iedereen rechten over hun eigen data: het recht op inzage, "
-        "correctie, verwijdering (recht op vergetelheid), en dataportabiliteit. "
-        "Als een tool deze rechten niet ondersteunt, is het juridisch risicovol "
-        "om er persoonsgegevens in te verwerken. Let ook op of data gebruikt "
-        "wordt voor het trainen van AI-modellen — dit vereist expliciete toestemming."
-    ),
-    "Beveiliging": (
-        "Goede beveiliging is de basis van privacy. Zonder encryptie, certificeringen "
-        "en een plan voor datalekken zijn persoonsgegevens kwetsbaar. Een datalek kan "
-        "leiden tot boetes tot 4% van de jaaromzet. Zoek naar ISO 27001 en SOC 2 "
-        "certificeringen — dit zijn internationale standaarden die aantonen dat een "
-        "organisatie beveiliging serieus neemt."
-    ),
-}
-
 
 def generate_report(result: ComplianceResult) -> io.BytesIO:
     """Genereer een Word rapport voor een compliance check resultaat."""
+    result = printable(result)
     doc = Document()
     _set_default_font(doc)
 
@@ -190,12 +166,7 @@ def _add_summary(doc: Document, result: ComplianceResult) -> None:
 
     # Uitleg wat dit rapport is
     intro = doc.add_paragraph()
-    intro_run = intro.add_run(
-        f"Dit rapport bevat de resultaten van een geautomatiseerde AVG/GDPR compliance "
-        f"check van {result.tool_name}. De analyse is gebaseerd op publiek beschikbare "
-        f"informatie zoals de privacy policy, security documentatie en sub-verwerkerlijsten. "
-        f"Per categorie is een stoplicht-oordeel gegeven."
-    )
+    intro_run = intro.add_run(summary_intro(result.tool_name))
     intro_run.font.size = Pt(10)
 
     doc.add_paragraph()
@@ -228,11 +199,7 @@ def _add_summary(doc: Document, result: ComplianceResult) -> None:
     legend_run.font.size = Pt(9)
     legend_run.font.color.rgb = COLOR_GRAY
 
-    for status, label, desc in [
-        (TrafficLight.GREEN, "GROEN", "De tool voldoet op dit punt aan de AVG-vereisten."),
-        (TrafficLight.ORANGE, "ORANJE", "Er zijn aandachtspunten of er kon onvoldoende informatie gevonden worden."),
-        (TrafficLight.RED, "ROOD", "Er zijn serieuze risico's gevonden die actie vereisen."),
-    ]:
+    for status, label, desc in STATUS_LEGEND:
         p = doc.add_paragraph()
         p.paragraph_format.left_indent = Cm(0.5)
         color = STATUS_COLORS[status]
@@ -330,12 +297,7 @@ def _add_sub_processors(doc: Document, result: ComplianceResult) -> None:
 
     # Uitleg
     intro = doc.add_paragraph()
-    intro_run = intro.add_run(
-        f"{result.tool_name} maakt gebruik van andere bedrijven (sub-verwerkers) "
-        f"om data te verwerken of op te slaan. De veiligheid van je data is zo sterk "
-        f"als de zwakste schakel in deze keten. Als een sub-verwerker data buiten de EU "
-        f"verwerkt, heeft dit gevolgen voor de AVG-compliance."
-    )
+    intro_run = intro.add_run(sub_processors_intro(result.tool_name))
     intro_run.font.size = Pt(10)
 
     doc.add_paragraph()
@@ -366,30 +328,7 @@ def _add_recommendations(doc: Document, result: ComplianceResult) -> None:
         run.font.color.rgb = SAMHOUD_LIGHT_BLUE
 
     # Generieke aanbevelingen op basis van status
-    if result.overall_status == TrafficLight.GREEN:
-        recs = [
-            "Lees de verwerkersovereenkomst (DPA) door voordat je de tool inzet voor persoonsgegevens.",
-            "Documenteer in je verwerkingsregister welke persoonsgegevens je met deze tool verwerkt.",
-            "Herhaal deze check periodiek, omdat tools hun beleid kunnen wijzigen.",
-        ]
-    elif result.overall_status == TrafficLight.ORANGE:
-        recs = [
-            "Neem contact op met de leverancier om de openstaande vragen te beantwoorden.",
-            "Schakel je Functionaris Gegevensbescherming (FG) in voor een definitieve beoordeling.",
-            "Overweeg een Data Protection Impact Assessment (DPIA) uit te voeren.",
-            "Gebruik de tool voorlopig niet voor gevoelige persoonsgegevens tot de onduidelijkheden zijn opgelost.",
-            "Documenteer de risico's en genomen maatregelen in je verwerkingsregister.",
-        ]
-    else:
-        recs = [
-            "Gebruik deze tool NIET voor het verwerken van persoonsgegevens zonder aanvullende maatregelen.",
-            "Schakel juridisch advies in en overleg met je Functionaris Gegevensbescherming (FG).",
-            "Voer een Data Protection Impact Assessment (DPIA) uit.",
-            "Onderzoek alternatieven die beter aan de AVG-vereisten voldoen.",
-            "Als de tool onmisbaar is, bespreek met de leverancier welke aanpassingen mogelijk zijn.",
-        ]
-
-    for rec in recs:
+    for rec in RECOMMENDATIONS[result.overall_status]:
         para = doc.add_paragraph(style="List Bullet")
         run = para.add_run(rec)
         run.font.size = Pt(10)
@@ -398,11 +337,7 @@ def _add_recommendations(doc: Document, result: ComplianceResult) -> None:
 
     # CTA
     cta = doc.add_paragraph()
-    cta_run = cta.add_run(
-        "Hulp nodig bij het implementeren van deze aanbevelingen? "
-        "Het Data & AI team van &samhoud helpt je graag. "
-        "Neem contact op via data.team@samhoud.com"
-    )
+    cta_run = cta.add_run(RECOMMENDATIONS_CTA)
     cta_run.font.color.rgb = SAMHOUD_BLUE
     cta_run.bold = True
     cta_run.font.size = Pt(10)
@@ -449,12 +384,7 @@ def _add_disclaimer(doc: Document, result: ComplianceResult) -> None:
 
     # Extra disclaimer
     extra = doc.add_paragraph()
-    extra_run = extra.add_run(
-        "Deze analyse is gebaseerd op publiek beschikbare informatie op het moment van de check. "
-        "Tools kunnen hun beleid, documentatie en technische implementatie wijzigen. "
-        "Het is aan te raden om deze check periodiek te herhalen en de uitkomsten te bespreken "
-        "met een Functionaris Gegevensbescherming (FG) of juridisch adviseur."
-    )
+    extra_run = extra.add_run(EXTRA_DISCLAIMER)
     extra_run.font.color.rgb = COLOR_GRAY
     extra_run.font.size = Pt(9)
     extra_run.italic = True
@@ -0,0 +1,252 @@
+from collections.abc import Iterator
+from datetime import datetime
+from html import escape
+from string import Template
+
+from ..models import CategoryResult, CheckResult, ComplianceResult
+from .content import (
+    CATEGORY_EDUCATION,
+    EXTRA_DISCLAIMER,
+    RECOMMENDATIONS,
+    RECOMMENDATIONS_CTA,
+    STATUS_EMOJI,
+    STATUS_LABELS,
+    STATUS_LEGEND,
+    printable,
+    sub_processors_intro,
+    summary_intro,
+)
+
+# Templates worden één keer bij het laden van de module gecompileerd; alle
+# waarden die erin gaan zijn al ge-escaped door de render-functies hieronder.
+
+_HEAD = Template("""<!DOCTYPE html>
+<html lang="nl">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>AVG/GDPR Compliance Rapport — $tool_name</title>
+<style>
+body{font-family:Calibri,Arial,sans-serif;font-size:15px;color:#1a1a2e;max-width:860px;margin:0 auto;padding:32px 24px;line-height:1.5}
+h1,h2{color:#0c2aad}h3{color:#4272ab;margin-top:32px}
+a{color:#4272ab;word-break:break-all}
+table{border-collapse:collapse;width:100%;margin:16px 0}
+th{color:#0c2aad;text-align:left}th,td{padding:6px 10px;border-bottom:1px solid #cbd6e5;font-size:13px}
+.cover{text-align:center;padding:48px 0 32px;border-bottom:1px solid #cbd6e5}
+.brand{color:#0c2aad}.meta{color:#64748b;font-size:12px}
+.status{font-weight:bold}.green{color:#16a34a}.orange{color:#ea580c}.red{color:#dc2626}
+.muted{color:#64748b;font-size:13px}.edu{color:#64748b;font-size:13px;font-style:italic}
+.edu strong{color:#0c2aad;font-style:normal}
+.check{margin:16px 0 8px}.finding{margin-left:16px}
+.source{margin-left:32px;font-size:12px}.source q{color:#708db8;font-style:italic;display:block}
+.cta{color:#0c2aad;font-weight:bold}
+footer{margin-top:48px;padding-top:16px;border-top:1px solid #cbd6e5;text-align:center;font-size:12px;color:#64748b}
+</style>
+</head>
+<body>
+""")
+
+_COVER = Template("""<header class="cover">
+<p class="brand">&amp;samhoud &nbsp;|&nbsp; ToolChecker</p>
+<h1>AVG/GDPR Compliance Rapport</h1>
+<h2>$tool_name</h2>
+<p class="status $status">$status_label</p>
+<p class="meta">Resultaat van $generated_at<br>Door ToolChecker by &amp;samhoud</p>
+$tool_url
+</header>
+""")
+
+_SUMMARY = Template("""<section>
+<h2>Managementsamenvatting</h2>
+<p>$intro</p>
+<p>$summary</p>
+<table>
+<thead><tr><th>Categorie</th><th>Beoordeling</th></tr></thead>
+<tbody>
+$rows</tbody>
+</table>
+<p class="muted"><strong>Stoplicht betekenis:</strong></p>
+$legend</section>
+""")
+
+_SUMMARY_ROW = Template(
+    '<tr><td>$name</td><td class="status $status">$status_label</td></tr>\n'
+)
+
+_LEGEND_ITEM = Template('<p class="muted"><strong class="$status">$label:</strong> $description</p>\n')
+
+_CATEGORY = Template("""<section>
+<h3>$name</h3>
+<p><strong>Beoordeling:</strong> <span class="status $status">$status_label</span></p>
+<p>$summary</p>
+$education$checks</section>
+""")
+
+_EDUCATION = Template('<p class="edu"><strong>Waarom is dit belangrijk?</strong> $text</p>\n')
+
+_CHECK = Template("""<div class="check"><strong class="$status">[$indicator]</strong> <strong>$name</strong></div>
+<p class="finding">$finding</p>
+$sources""")
+
+_CHECK_SOURCE = Template('<p class="source">$quote Bron: $link</p>\n')
+
+_SUB_PROCESSORS = Template("""<section>
+<h3>Sub-verwerkers</h3>
+<p>$intro</p>
+<table>
+<thead><tr><th>Sub-verwerker</th><th>Doel</th><th>Datalocatie</th><th>Status</th></tr></thead>
+<tbody>
+$rows</tbody>
+</table>
+</section>
+""")
+
+_SUB_PROCESSOR_ROW = Template(
+    '<tr><td>$name</td><td>$purpose</td><td>$location</td>'
+    '<td class="status $status">$status_short</td></tr>\n'
+)
+
+_RECOMMENDATIONS = Template("""<section>
+<h3>Aanbevelingen</h3>
+<ul>
+$items</ul>
+<p class="cta">$cta</p>
+</section>
+""")
+
+_SOURCES = Template("""<section>
+<h3>Geraadpleegde bronnen</h3>
+<p class="muted">De volgende bronnen zijn geraadpleegd tijdens deze analyse:</p>
+<ul>
+$items</ul>
+</section>
+""")
+
+_SOURCE_ITEM = Template('<li><strong>$title</strong><br>$link</li>\n')
+
+_DISCLAIMER = Template("""<section>
+<h3 class="muted">Disclaimer</h3>
+<p class="edu">$disclaimer</p>
+<p class="edu">$extra</p>
+</section>
+<footer>
+<strong class="brand">&amp;samhoud</strong><br>
+<em>Together we build a brighter future</em><br><br>
+data.team@samhoud.com &nbsp;|&nbsp; samhoud.com
+</footer>
+</body>
+</html>
+""")
+
+
+def render_html(result: ComplianceResult, generated_at: datetime) -> Iterator[str]:
+    """Render het rapport als HTML, sectie voor sectie.
+
+    Zelfde secties en teksten als het Word rapport, maar zonder python-docx:
+    elke sectie is een ingevuld template en wordt direct doorgegeven, zodat
+    de browser kan beginnen met tonen terwijl de rest nog rendert.
+    """
+    result = printable(result)
+    yield _HEAD.substitute(tool_name=escape(result.tool_name))
+    yield _render_cover(result, generated_at)
+    yield _render_summary(result)
+    for category in result.categories:
+        yield _render_category(category)
+    if result.sub_processors:
+        yield _render_sub_processors(result)
+    yield _RECOMMENDATIONS.substitute(
+        items="".join(f"<li>{escape(rec)}</li>\n" for rec in RECOMMENDATIONS[result.overall_status]),
+        cta=escape(RECOMMENDATIONS_CTA),
+    )
+    yield _SOURCES.substitute(
+        items="".join(
+            _SOURCE_ITEM.substitute(title=escape(source.title), link=_link(source.url))
+            for source in result.sources_consulted
+        )
+    )
+    yield _DISCLAIMER.substitute(
+        disclaimer=escape(result.disclaimer), extra=escape(EXTRA_DISCLAIMER)
+    )
+
+
+def _render_cover(result: ComplianceResult, generated_at: datetime) -> str:
+    tool_url = f'<p class="meta">{_link(result.tool_url)}</p>' if result.tool_url else ""
+    return _COVER.substitute(
+        tool_name=escape(result.tool_name),
+        status=result.overall_status.value,
+        status_label=escape(STATUS_LABELS.get(result.overall_status, "Onbekend")),
+        generated_at=generated_at.strftime("%d-%m-%Y %H:%M"),
+        tool_url=tool_url,
+    )
+
+
+def _render_summary(result: ComplianceResult) -> str:
+    rows = "".join(
+        _SUMMARY_ROW.substitute(
+            name=escape(category.name),
+            status=category.status.value,
+            status_label=escape(STATUS_LABELS.get(category.status, "Onbekend")),
+        )
+        for category in result.categories
+    )
+    legend = "".join(
+        _LEGEND_ITEM.substitute(status=status.value, label=label, description=escape(description))
+        for status, label, description in STATUS_LEGEND
+    )
+    return _SUMMARY.substitute(
+        intro=escape(summary_intro(result.tool_name)),
+        summary=escape(result.summary),
+        rows=rows,
+        legend=legend,
+    )
+
+
+def _render_category(category: CategoryResult) -> str:
+    education = CATEGORY_EDUCATION.get(category.name)
+    return _CATEGORY.substitute(
+        name=escape(category.name),
+        status=category.status.value,
+        status_label=escape(STATUS_LABELS.get(category.status, "Onbekend")),
+        summary=escape(category.summary),
+        education=_EDUCATION.substitute(text=escape(education)) if education else "",
+        checks="".join(_render_check(check) for check in category.checks),
+    )
+
+
+def _render_check(check: CheckResult) -> str:
+    sources = "".join(
+        _CHECK_SOURCE.substitute(
+            quote=f"<q>{escape(source.quote)}</q>" if source.quote else "",
+            link=_link(source.url),
+        )
+        for source in check.sources
+    )
+    return _CHECK.substitute(
+        status=check.status.value,
+        indicator=STATUS_EMOJI[check.status],
+        name=escape(check.name),
+        finding=escape(check.finding),
+        sources=sources,
+    )
+
+
+def _render_sub_processors(result: ComplianceResult) -> str:
+    rows = "".join(
+        _SUB_PROCESSOR_ROW.substitute(
+            name=escape(sp.name),
+            purpose=escape(sp.purpose),
+            location=escape(sp.data_location),
+            status=sp.status.value,
+            status_short=sp.status.value.upper(),
+        )
+        for sp in result.sub_processors
+    )
+    return _SUB_PROCESSORS.substitute(intro=escape(sub_processors_intro(result.tool_name)), rows=rows)
+
+
+def _link(url: str) -> str:
+    """Klikbare link, alleen voor http(s); bronnen komen van het web en van het model."""
+    text = escape(url)
+    if not url.lower().startswith(("http://", "https://")):
+        return text
+    return f'<a href="{text}" rel="noopener noreferrer">{text}</a>'
@@ -0,0 +1,147 @@
+import asyncio
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import httpx
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    title: str
+    url: str
+    snippet: str
+    backend: str
+
+
+class SearchBackend:
+    """Eén zoekmachine; ``search`` geeft resultaten of raist bij een fout."""
+
+    name: str
+
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        raise NotImplementedError
+
+
+class DdgsBackend(SearchBackend):
+    """DuckDuckGo via ddgs. De client is synchroon en draait daarom in een thread."""
+
+    name = "ddgs"
+
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        return await asyncio.to_thread(self._search, query, max_results)
+
+    def _search(self, query: str, max_results: int) -> list[SearchResult]:
+        from ddgs import DDGS
+
+        with DDGS() as ddgs:
+            raw = ddgs.text(query, max_results=max_results) or []
+        return [
+            SearchResult(
+                title=r.get("title", ""), url=r.get("href", ""), snippet=r.get("body", ""),
+                backend=self.name,
+            )
+            for r in raw
+            if r.get("href")
+        ]
+
+
+class _HttpBackend(SearchBackend):
+    """Zoek-API over HTTP met één gedeelde client per backend."""
+
+    def __init__(self, timeout: float, transport: httpx.AsyncBaseTransport | None = None):
+        self._timeout = timeout
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    async def _get_json(self, url: str, params: dict, headers: dict | None = None) -> dict:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self._timeout, transport=self._transport)
+        response = await self._client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+
+class BraveBackend(_HttpBackend):
+    """Brave Search API (web search); vereist een API-key."""
+
+    name = "brave"
+    endpoint = "https://api.search.brave.com/res/v1/web/search"
+
+    def __init__(
+        self, api_key: str, timeout: float, transport: httpx.AsyncBaseTransport | None = None
+    ):
+        super().__init__(timeout, transport)
+        self._key = api_key
+
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        data = await self._get_json(
+            self.endpoint,
+            # Brave geeft hooguit 20 resultaten per pagina
+            params={"q": query, "count": min(max_results, 20), "text_decorations": "false"},
+            headers={"Accept": "application/json", "X-Subscription-Token": self._key},
+        )
+        return [
+            SearchResult(
+                title=r.get("title", ""), url=r.get("url", ""),
+                snippet=r.get("description", ""), backend=self.name,
+            )
+            for r in (data.get("web") or {}).get("results", [])
+            if r.get("url")
+        ][:max_results]
+
+
+class SearxngBackend(_HttpBackend):
+    """Eigen SearXNG-instantie; ``json`` moet aanstaan in ``search.formats``."""
+
+    name = "searxng"
+
+    def __init__(
+        self, base_url: str, timeout: float, transport: httpx.AsyncBaseTransport | None = None
+    ):
+        super().__init__(timeout, transport)
+        self._url = base_url.rstrip("/") + "/search"
+
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        data = await self._get_json(self._url, params={"q": query, "format": "json"})
+        return [
+            SearchResult(
+                title=r.get("title", ""), url=r.get("url", ""),
+                snippet=r.get("content", ""), backend=self.name,
+            )
+            for r in data.get("results", [])
+            if r.get("url")
+        ][:max_results]
+
+
+class StandInBackend(SearchBackend):
+    """Lokale backend voor tests en de loadtest: vaste resultaten, instelbare latency en fouten.
+
+    ``results`` is een functie van (query, max_results) naar (titel, url,
+    snippet)-tuples; ``latency`` een functie die de wachttijd per aanroep geeft.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        results: Callable[[str, int], list[tuple[str, str, str]]],
+        latency: Callable[[], float] = lambda: 0.0,
+        error_rate: float = 0.0,
+    ):
+        self.name = name
+        self._results = results
+        self._latency = latency
+        self._error_rate = error_rate
+
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        await asyncio.sleep(self._latency())
+        if self._error_rate and random.random() < self._error_rate:
+            raise httpx.HTTPStatusError(
+                "stand-in fout",
+                request=httpx.Request("GET", f"https://{self.name}.invalid"),
+                response=httpx.Response(429),
+            )
+        return [
+            SearchResult(title=title, url=url, snippet=snippet, backend=self.name)
+            for title, url, snippet in self._results(query, max_results)[:max_results]
+        ]
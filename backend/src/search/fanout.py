@@ -0,0 +1,294 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..config import settings
+from ..metrics import registry
+from .backends import BraveBackend, DdgsBackend, SearchBackend, SearchResult, SearxngBackend
+
+logger = logging.getLogger(__name__)
+
+search_backend_seconds = registry.histogram(
+    "search_backend_seconds", "Duur van een geslaagde zoekopdracht per backend"
+)
+search_backend_errors = registry.counter(
+    "search_backend_errors_total", "Mislukte zoekopdrachten per backend en reden"
+)
+search_backend_benched = registry.counter(
+    "search_backend_benched_total", "Keren dat een backend tijdelijk is overgeslagen"
+)
+search_outcomes = registry.counter(
+    "search_outcomes_total", "Zoekopdrachten per uitkomst (sufficient, merged, empty, unavailable)"
+)
+
+# Gewicht van een nieuwe waarneming in de lopende gemiddelden
+_ALPHA = 0.2
+# Boven dit foutpercentage (na genoeg waarnemingen) wordt een backend overgeslagen
+_BENCH_ERROR_RATE = 0.5
+_BENCH_MIN_SAMPLES = 4
+
+_TRACKING_PARAMS = ("utm_", "ref", "fbclid", "gclid")
+
+
+class SearchUnavailable(Exception):
+    """Geen enkele zoekbackend gaf antwoord (fouten of timeouts)."""
+
+
+@dataclass
+class BackendStats:
+    """Lopend gemiddelde van latency en foutkans van één backend."""
+
+    latency: float = 0.0
+    error_rate: float = 0.0
+    samples: int = 0
+    benched_until: float = 0.0
+    last_error: str = ""
+
+    def record(self, seconds: float, error: str | None) -> None:
+        failed = 1.0 if error else 0.0
+        if self.samples == 0:
+            self.error_rate = failed
+        else:
+            self.error_rate += _ALPHA * (failed - self.error_rate)
+        # Een snelle 429 zegt niets over hoe lang een antwoord duurt
+        if not error or error == "timeout":
+            if self.latency == 0.0:
+                self.latency = seconds
+            else:
+                self.latency += _ALPHA * (seconds - self.latency)
+        self.samples += 1
+        if error:
+            self.last_error = error
+
+    def record_cancelled(self, seconds: float) -> None:
+        """Afgebroken omdat een andere backend al won: minstens zo traag als ``seconds``.
+
+        Zonder deze ondergrens houdt een backend die nooit wint zijn optimistische
+        latency (0.0 als hij nooit klaar was) en staat hij altijd bovenaan.
+        """
+        if seconds <= self.latency:
+            return
+        if self.latency == 0.0:
+            self.latency = seconds
+        else:
+            self.latency += _ALPHA * (seconds - self.latency)
+
+    def score(self, failure_penalty: float) -> float:
+        """Lager is beter: verwachte wachttijd, plus de kans op een fout maal wat die kost."""
+        return self.latency + self.error_rate * failure_penalty
+
+
+@dataclass
+class _Outcome:
+    backend: str
+    results: list[SearchResult] = field(default_factory=list)
+
+
+class SearchService:
+    """Zoekt parallel over meerdere backends en kiest adaptief welke.
+
+    De backends worden gerangschikt op gemeten latency en foutkans; de beste
+    ``fanout`` starten tegelijk. Het eerste antwoord met genoeg resultaten
+    wint en de rest wordt afgebroken. Geeft niemand genoeg, dan start de
+    volgende backend en worden alle antwoorden samengevoegd, ontdubbeld op URL.
+    Een backend die vooral faalt wordt een cooldown lang overgeslagen.
+    """
+
+    def __init__(
+        self,
+        backends: list[SearchBackend],
+        fanout: int = 2,
+        sufficient: int = 5,
+        timeout: float = 10.0,
+        cooldown: float = 60.0,
+    ):
+        self.backends = backends
+        self.fanout = max(1, fanout)
+        self.sufficient = sufficient
+        self.timeout = timeout
+        self.cooldown = cooldown
+        self.stats = {backend.name: BackendStats() for backend in backends}
+
+    def ranked(self) -> list[SearchBackend]:
+        """Backends in volgorde van voorkeur; overgeslagen backends alleen als niets anders kan."""
+        now = time.monotonic()
+        available = [b for b in self.backends if self.stats[b.name].benched_until <= now]
+        candidates = available or self.backends
+        # Stabiel sorteren: bij gelijke score blijft de geconfigureerde volgorde
+        return sorted(candidates, key=lambda b: self.stats[b.name].score(self.timeout))
+
+    async def search(self, query: str, max_results: int = 10) -> list[SearchResult]:
+        """Resultaten van de snelste backend met genoeg, of de samengevoegde rest.
+
+        Raises:
+            SearchUnavailable: als geen enkele backend antwoordde.
+        """
+        waiting = self.ranked()
+        running: dict[asyncio.Task, tuple[SearchBackend, float]] = {}
+        outcomes: list[_Outcome] = []
+        deadline = time.monotonic() + self.timeout
+
+        def start_next() -> None:
+            backend = waiting.pop(0)
+            task = asyncio.ensure_future(backend.search(query, max_results))
+            running[task] = (backend, time.monotonic())
+
+        for _ in range(min(self.fanout, len(waiting))):
+            start_next()
+
+        try:
+            while running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(
+                    running, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    backend, started = running.pop(task)
+                    outcome = self._finish(backend, started, task)
+                    if outcome is None:
+                        continue
+                    outcomes.append(outcome)
+                    if len(outcome.results) >= min(self.sufficient, max_results):
+                        search_outcomes.inc(outcome="sufficient")
+                        return _dedupe(outcome.results)[:max_results]
+                # Niemand had genoeg: de volgende backend mag het ook proberen
+                while waiting and len(running) < self.fanout:
+                    start_next()
+        finally:
+            now = time.monotonic()
+            for task, (backend, started) in running.items():
+                task.cancel()
+                if now >= deadline:
+                    self._record(backend, now - started, "timeout")
+                else:
+                    self.stats[backend.name].record_cancelled(now - started)
+
+        if not outcomes:
+            search_outcomes.inc(outcome="unavailable")
+            raise SearchUnavailable(
+                "geen zoekbackend beschikbaar" if not self.backends else "alle zoekbackends faalden"
+            )
+        merged = _merge(outcomes)[:max_results]
+        search_outcomes.inc(outcome="merged" if merged else "empty")
+        return merged
+
+    def _finish(self, backend: SearchBackend, started: float, task: asyncio.Task) -> _Outcome | None:
+        elapsed = time.monotonic() - started
+        try:
+            results = task.result()
+        except Exception as e:
+            self._record(backend, elapsed, type(e).__name__)
+            logger.warning(f"Zoeken via {backend.name} mislukt: {e}")
+            return None
+        self._record(backend, elapsed, None)
+        search_backend_seconds.observe(elapsed, backend=backend.name)
+        return _Outcome(backend=backend.name, results=results)
+
+    def _record(self, backend: SearchBackend, seconds: float, error: str | None) -> None:
+        stats = self.stats[backend.name]
+        stats.record(seconds, error)
+        if error:
+            search_backend_errors.inc(backend=backend.name, reason=error)
+        if (
+            stats.samples >= _BENCH_MIN_SAMPLES
+            and stats.error_rate > _BENCH_ERROR_RATE
+            and stats.benched_until <= time.monotonic()
+        ):
+            stats.benched_until = time.monotonic() + self.cooldown
+            search_backend_benched.inc(backend=backend.name)
+            logger.warning(
+                f"Zoekbackend {backend.name} wordt {self.cooldown:.0f}s overgeslagen "
+                f"(foutkans {stats.error_rate:.0%}, laatste fout {stats.last_error})"
+            )
+
+
+def normalize_url(url: str) -> str:
+    """Sleutel om dezelfde pagina uit verschillende backends te herkennen."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    query = urlencode(
+        [(k, v) for k, v in parse_qsl(parts.query) if not k.lower().startswith(_TRACKING_PARAMS)]
+    )
+    return urlunsplit(("", host, parts.path.rstrip("/"), query, ""))
+
+
+def _dedupe(results: list[SearchResult]) -> list[SearchResult]:
+    seen: set[str] = set()
+    unique = []
+    for result in results:
+        key = normalize_url(result.url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(result)
+    return unique
+
+
+def _merge(outcomes: list[_Outcome]) -> list[SearchResult]:
+    """Om en om uit elke backend (in volgorde van binnenkomst), zodat elke top-hit vroeg staat."""
+    interleaved = []
+    for position in range(max((len(o.results) for o in outcomes), default=0)):
+        for outcome in outcomes:
+            if position < len(outcome.results):
+                interleaved.append(outcome.results[position])
+    return _dedupe(interleaved)
+
+
+def build_backends() -> list[SearchBackend]:
+    """De geconfigureerde backends; een backend zonder key of URL wordt overgeslagen."""
+    backends: list[SearchBackend] = []
+    for name in settings.search_backends:
+        if name == "ddgs":
+            backends.append(DdgsBackend())
+        elif name == "brave":
+            if settings.brave_search_api_key:
+                backends.append(
+                    BraveBackend(settings.brave_search_api_key, settings.search_timeout_seconds)
+                )
+        elif name == "searxng":
+            if settings.searxng_url:
+                backends.append(
+                    SearxngBackend(settings.searxng_url, settings.search_timeout_seconds)
+                )
+        elif name == "bing":
+            logger.warning(
+                "Zoekbackend bing genegeerd: de Bing Search API is in augustus 2025 uitgezet; "
+                "gebruik brave of searxng"
+            )
+        else:
+            logger.warning(f"Onbekende zoekbackend in search_backends: {name}")
+    if len(backends) < 2:
+        active = ", ".join(backend.name for backend in backends) or "geen"
+        logger.warning(
+            f"Slechts één zoekbackend actief ({active}): geen fan-out of uitwijkmogelijkheid. "
+            "Stel BRAVE_SEARCH_API_KEY of SEARXNG_URL in."
+        )
+    return backends
+
+
+_service: SearchService | None = None
+_service_lock = threading.Lock()
+
+
+def get_search_service() -> SearchService:
+    """De zoekservice van dit proces, opgebouwd bij eerste gebruik."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = SearchService(
+                    build_backends(),
+                    fanout=settings.search_fanout,
+                    sufficient=settings.search_sufficient_results,
+                    timeout=settings.search_timeout_seconds,
+                    cooldown=settings.search_cooldown_seconds,
+                )
+    return _service
+
+
+async def search(query: str, max_results: int = 10) -> list[SearchResult]:
+    return await get_search_service().search(query, max_results)
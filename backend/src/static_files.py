@@ -0,0 +1,205 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
+from collections.abc import Collection
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optioneel; gzip is altijd beschikbaar
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Types die goed comprimeren; afbeeldingen en fonts zijn al gecomprimeerd
+_COMPRESSIBLE = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/wasm",
+    "image/svg+xml",
+)
+
+# Vite zet een content hash in de bestandsnamen onder /assets/
+_IMMUTABLE_PREFIX = "assets/"
+_IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+_REVALIDATE_CACHE = "no-cache"
+
+
+@dataclass
+class _Asset:
+    path: Path
+    media_type: str
+    etag: str
+    size: int
+    # Encoding → inhoud; alleen gevuld voor bestanden die in het geheugen passen
+    bodies: dict[str, bytes] = field(default_factory=dict)
+
+
+class PrecompressedStaticFiles:
+    """Serveer de gebouwde frontend vanuit het geheugen, vooraf gecomprimeerd.
+
+    Bij het opstarten worden alle bestanden onder ``directory`` ingelezen,
+    gehasht (ETag) en met gzip en, indien geïnstalleerd, brotli gecomprimeerd.
+    Bestaande ``.gz``/``.br`` bestanden uit de build worden hergebruikt.
+    Gehashte assets krijgen een immutable Cache-Control; index.html wordt
+    altijd gerevalideerd via If-None-Match. Grote bestanden gaan van schijf.
+    """
+
+    def __init__(self, directory: str | Path, max_memory_bytes: int = 2_000_000):
+        self.directory = Path(directory).resolve()
+        self.max_memory_bytes = max_memory_bytes
+        self._assets: dict[str, _Asset] = {}
+        self._load()
+
+    def _load(self) -> None:
+        total = 0
+        for path in sorted(self.directory.rglob("*")):
+            if not path.is_file() or path.suffix in (".gz", ".br"):
+                continue
+            relative = path.relative_to(self.directory).as_posix()
+            asset = self._load_asset(path)
+            self._assets[relative] = asset
+            total += sum(len(body) for body in asset.bodies.values())
+        logger.info(
+            "Frontend geladen: %d bestanden, %.1f kB in geheugen",
+            len(self._assets),
+            total / 1000,
+        )
+
+    def _load_asset(self, path: Path) -> _Asset:
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        size = path.stat().st_size
+
+        if size > self.max_memory_bytes:
+            stat = path.stat()
+            etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+            return _Asset(path=path, media_type=media_type, etag=etag, size=size)
+
+        content = path.read_bytes()
+        asset = _Asset(
+            path=path,
+            media_type=media_type,
+            etag=f'"{hashlib.blake2b(content, digest_size=12).hexdigest()}"',
+            size=size,
+            bodies={"identity": content},
+        )
+
+        if media_type.startswith(_COMPRESSIBLE) and size > 256:
+            gz = path.with_name(path.name + ".gz")
+            br = path.with_name(path.name + ".br")
+            variants = {
+                "gzip": gz.read_bytes() if gz.is_file() else gzip.compress(content, 9, mtime=0),
+            }
+            if br.is_file():
+                variants["br"] = br.read_bytes()
+            elif brotli is not None:
+                variants["br"] = brotli.compress(content, quality=11)
+            for encoding, body in variants.items():
+                # Alleen bewaren als het de moeite waard is
+                if len(body) < size * 0.9:
+                    asset.bodies[encoding] = body
+
+        return asset
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await PlainTextResponse("Method Not Allowed", status_code=405)(scope, receive, send)
+            return
+
+        asset = self._lookup(scope)
+        if asset is None:
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+
+        response = self._respond(asset, _headers(scope), head=method == "HEAD")
+        await response(scope, receive, send)
+
+    def _lookup(self, scope: Scope) -> _Asset | None:
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        relative = path.lstrip("/")
+
+        if not relative or relative.endswith("/"):
+            relative += "index.html"
+        asset = self._assets.get(relative)
+        if asset is None:
+            # Net als StaticFiles(html=True): directory → index.html
+            asset = self._assets.get(f"{relative}/index.html")
+        return asset
+
+    def _respond(self, asset: _Asset, headers: dict[str, str], head: bool) -> Response:
+        relative = asset.path.relative_to(self.directory).as_posix()
+        cache_control = (
+            _IMMUTABLE_CACHE if relative.startswith(_IMMUTABLE_PREFIX) else _REVALIDATE_CACHE
+        )
+        common = {
+            "ETag": asset.etag,
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = headers.get("if-none-match", "")
+        if asset.etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match == "*":
+            return Response(status_code=304, headers=common)
+
+        if not asset.bodies:
+            # Te groot voor het geheugen: stream van schijf
+            return FileResponse(asset.path, media_type=asset.media_type, headers=common)
+
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""), asset.bodies)
+        body = asset.bodies[encoding]
+        response_headers = {**common, "Content-Length": str(len(body))}
+        if encoding != "identity":
+            response_headers["Content-Encoding"] = encoding
+
+        return Response(
+            content=b"" if head else body,
+            media_type=asset.media_type,
+            headers=response_headers,
+        )
+
+
+def _headers(scope: Scope) -> dict[str, str]:
+    return {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+
+
+def negotiate_encoding(
+    accept_encoding: str, available: Collection[str], preference: tuple[str, ...] = ("br", "gzip")
+) -> str:
+    """Kies op basis van Accept-Encoding, standaard br > gzip > identity.
+
+    De eerste encoding uit ``preference`` die beschikbaar is en die de client
+    accepteert wint; q=0 (ook q=0.000) telt als weigering.
+    """
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if _quality(params) > 0:
+            accepted.add(name.strip())
+    for encoding in preference:
+        if encoding in available and encoding in accepted:
+            return encoding
+    return "identity"
+
+
+def _quality(params: str) -> float:
+    for param in params.split(";"):
+        key, _, value = param.strip().partition("=")
+        if key.strip() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
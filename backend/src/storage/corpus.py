@@ -0,0 +1,173 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ..config import settings
+from ..identity.catalog import registrable_domain
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS corpus_pages (
+    url          TEXT PRIMARY KEY,
+    domain       TEXT NOT NULL,
+    fts_rowid    INTEGER NOT NULL,
+    content_hash BLOB NOT NULL,
+    fetched_at   REAL NOT NULL,
+    site         TEXT
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS corpus_pages_domain ON corpus_pages (domain);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS corpus_fts USING fts5 (
+    url UNINDEXED,
+    domain UNINDEXED,
+    body,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Na de migratie: de join van FTS-treffers naar pagina's en het domeinfilter
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS corpus_pages_fts_rowid ON corpus_pages (fts_rowid);
+CREATE INDEX IF NOT EXISTS corpus_pages_site ON corpus_pages (site);
+"""
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class CorpusHit:
+    url: str
+    snippet: str
+    fetched_at: datetime
+    score: float
+
+
+class CorpusIndex:
+    """Full-text index (SQLite FTS5, BM25-ranking) over alle opgehaalde pagina's.
+
+    Elke pagina die de agent leest wordt hier bijgewerkt, per URL; een
+    ongewijzigde pagina wordt niet opnieuw geïndexeerd. Zoeken kan beperkt
+    worden tot een domein, inclusief subdomeinen (trust.x.com valt onder x.com).
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        self._migrate(conn)
+        conn.executescript(_INDEXES)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Oudere databases missen de kolom ``site`` (het registreerbare domein)."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(corpus_pages)")}
+        if "site" in columns:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("ALTER TABLE corpus_pages ADD COLUMN site TEXT")
+            domains = [row[0] for row in conn.execute("SELECT DISTINCT domain FROM corpus_pages")]
+            conn.executemany(
+                "UPDATE corpus_pages SET site = ? WHERE domain = ?",
+                [(registrable_domain(domain), domain) for domain in domains],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def add(self, url: str, domain: str, text: str) -> bool:
+        """Indexeer een pagina; geeft False als de inhoud ongewijzigd was."""
+        content_hash = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        now = time.time()
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT fts_rowid, content_hash FROM corpus_pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is not None and row[1] == content_hash:
+                conn.execute("UPDATE corpus_pages SET fetched_at = ? WHERE url = ?", (now, url))
+                conn.execute("COMMIT")
+                return False
+            if row is not None:
+                conn.execute("DELETE FROM corpus_fts WHERE rowid = ?", (row[0],))
+            cursor = conn.execute(
+                "INSERT INTO corpus_fts (url, domain, body) VALUES (?, ?, ?)",
+                (url, domain, text),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO corpus_pages "
+                "(url, domain, fts_rowid, content_hash, fetched_at, site) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, domain, cursor.lastrowid, content_hash, now, registrable_domain(domain)),
+            )
+            conn.execute("COMMIT")
+            return True
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def search(self, query: str, domain: str | None = None, limit: int = 5) -> list[CorpusHit]:
+        """Zoek op losse termen (OR), gerangschikt op BM25."""
+        terms = _TERM.findall(query.lower())
+        if not terms:
+            return []
+        # Elke term als quoted string, zodat FTS5-syntax in de query geen fouten geeft
+        match = " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+
+        sql = (
+            "SELECT corpus_fts.url, snippet(corpus_fts, 2, '»', '«', ' … ', 32), "
+            "p.fetched_at, bm25(corpus_fts) AS score "
+            "FROM corpus_fts JOIN corpus_pages p ON p.fts_rowid = corpus_fts.rowid "
+            "WHERE corpus_fts MATCH ?"
+        )
+        params: list = [match]
+        if domain:
+            domain = domain.lower().strip(".")
+            # Eerst op registreerbaar domein (geïndexeerd), dan exact of als subdomein
+            sql += " AND p.site = ? AND (p.domain = ? OR substr(p.domain, -?) = ?)"
+            params.extend([registrable_domain(domain), domain, len(domain) + 1, f".{domain}"])
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        return [
+            CorpusHit(
+                url=url,
+                snippet=snippet,
+                fetched_at=datetime.fromtimestamp(fetched_at, tz=timezone.utc),
+                score=-score,
+            )
+            for url, snippet, fetched_at, score in self._connection().execute(sql, params)
+        ]
+
+
+_index: CorpusIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_corpus_index() -> CorpusIndex:
+    """De corpus index van dit proces, geopend bij eerste gebruik."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CorpusIndex(Path(settings.data_dir) / "corpus.sqlite3")
+    return _index
@@ -0,0 +1,104 @@
+from ..checks.evidence import match_check
+from ..models import (
+    CheckChange,
+    CheckResult,
+    ComplianceResult,
+    ResultDiff,
+    StatusChange,
+    SubProcessor,
+    SubProcessorChange,
+)
+
+
+def _norm(value: str) -> str:
+    return " ".join(value.lower().split())
+
+
+def diff_results(
+    old: ComplianceResult, new: ComplianceResult, from_version: int, to_version: int
+) -> ResultDiff:
+    """Vergelijk twee versies per check en per sub-verwerker.
+
+    Checks worden gematcht op (categorie, checknaam) en sub-verwerkers op
+    naam, beide hoofdletter- en witruimte-ongevoelig.
+    """
+    diff = ResultDiff(tool_name=new.tool_name, from_version=from_version, to_version=to_version)
+
+    if old.overall_status != new.overall_status:
+        diff.overall_status = StatusChange(old=old.overall_status, new=new.overall_status)
+
+    diff.check_changes = _diff_checks(old, new)
+
+    old_sps = {_norm(sp.name): sp for sp in old.sub_processors}
+    new_sps = {_norm(sp.name): sp for sp in new.sub_processors}
+
+    diff.added_sub_processors = [sp for key, sp in new_sps.items() if key not in old_sps]
+    diff.removed_sub_processors = [sp for key, sp in old_sps.items() if key not in new_sps]
+
+    for key, new_sp in new_sps.items():
+        old_sp = old_sps.get(key)
+        if old_sp is not None:
+            change = _diff_sub_processor(old_sp, new_sp)
+            if change is not None:
+                diff.sub_processor_changes.append(change)
+
+    return diff
+
+
+def _diff_checks(old: ComplianceResult, new: ComplianceResult) -> list[CheckChange]:
+    def index(result: ComplianceResult) -> dict[tuple[str, str], tuple[str, CheckResult]]:
+        return {
+            (_norm(category.name), _norm(check.name)): (category.name, check)
+            for category in result.categories
+            for check in category.checks
+        }
+
+    old_checks = index(old)
+    new_checks = index(new)
+    changes = []
+
+    # Volgorde van de nieuwe versie aanhouden, verwijderde checks achteraan
+    for key, (category, check) in new_checks.items():
+        previous = old_checks.get(key)
+        if previous is None:
+            changes.append(
+                CheckChange(
+                    category=category, check=check.name, status=StatusChange(old=None, new=check.status)
+                )
+            )
+            continue
+        change = CheckChange(category=category, check=check.name)
+        old_check = previous[1]
+        if old_check.status != check.status:
+            change.status = StatusChange(old=old_check.status, new=check.status)
+        # Een ander land of andere regio bij dezelfde status is ook een wijziging;
+        # andere bevindingen worden per run anders verwoord en tellen niet mee
+        if match_check(category, check) == "location" and _squash(old_check.finding) != _squash(check.finding):
+            change.finding = (old_check.finding, check.finding)
+        if change.status is not None or change.finding is not None:
+            changes.append(change)
+
+    for key, (category, check) in old_checks.items():
+        if key not in new_checks:
+            changes.append(
+                CheckChange(
+                    category=category, check=check.name, status=StatusChange(old=check.status, new=None)
+                )
+            )
+
+    return changes
+
+
+def _squash(value: str) -> str:
+    return " ".join(value.split())
+
+
+def _diff_sub_processor(old: SubProcessor, new: SubProcessor) -> SubProcessorChange | None:
+    change = SubProcessorChange(name=new.name)
+    if _norm(old.data_location) != _norm(new.data_location):
+        change.data_location = (old.data_location, new.data_location)
+    if old.status != new.status:
+        change.status = StatusChange(old=old.status, new=new.status)
+    if change.data_location is None and change.status is None:
+        return None
+    return change
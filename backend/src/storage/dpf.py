@@ -0,0 +1,379 @@
+import asyncio
+import csv
+import fcntl
+import io
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ..config import settings
+from ..identity.catalog import normalize_name, osa_distance
+from ..metrics import registry
+
+logger = logging.getLogger(__name__)
+
+dpf_lookups = registry.counter("dpf_lookups_total", "Opzoekingen in de DPF-lijst per uitkomst")
+
+DPF_LIST_URL = "https://www.dataprivacyframework.gov/list"
+_PARTICIPANT_URL = "https://www.dataprivacyframework.gov/participant/{id}"
+
+# Rechtsvormen die normalize_name nog laat staan
+_LEGAL_WORDS = {
+    "limited", "plc", "holdings", "holding", "group", "pty", "sarl", "sas", "srl",
+    "ab", "as", "oy", "aps", "kk", "pte", "lp", "llp", "incorporated", "dba",
+}
+# Woorden die een prefix-match niet tot een ander bedrijf maken: "Slack" → "Slack
+# Technologies" wel, "Box" → "Box Hill Institute" niet
+_DESCRIPTOR_WORDS = {
+    "technologies", "technology", "software", "systems", "labs", "solutions", "services",
+    "platforms", "international", "global", "corporation", "company", "co", "usa", "us",
+}
+
+# Bestand: header, vaste entries gesorteerd op sleutel, daarna een blob met strings
+_MAGIC = b"DPF1"
+_HEADER = struct.Struct("<4sIId")  # magic, aantal, offset van de blob, tijd van de snapshot
+_ENTRY = struct.Struct("<IHIHB3x")  # sleutel (offset, lengte), record (offset, lengte), actief
+
+_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class DpfRecord:
+    name: str
+    active: bool
+    url: str
+
+
+@dataclass(frozen=True)
+class DpfMatch:
+    organization: str
+    active: bool
+    url: str
+    # "exact", "prefix" of "fuzzy"
+    match: str
+
+
+def organization_key(name: str) -> str:
+    """Vergelijkbare vorm van een organisatienaam: zonder rechtsvorm en ruis."""
+    words = normalize_name(name).split()
+    meaningful = [word for word in words if word not in _LEGAL_WORDS]
+    return " ".join(meaningful or words)
+
+
+def parse_snapshot(data: bytes) -> list[DpfRecord]:
+    """Lees een export van de DPF-lijst, als JSON (lijst van objecten) of als CSV.
+
+    Kolomnamen worden ruim herkend ("name", "Organization Name", "status",
+    "url", "id"); zonder URL wordt de deelnemerspagina uit het id afgeleid.
+    """
+    text = data.decode("utf-8-sig", errors="replace").lstrip()
+    if text.startswith(("[", "{")):
+        rows = json.loads(text)
+        if isinstance(rows, dict):
+            rows = rows.get("participants") or rows.get("data") or []
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+
+    records = []
+    for row in rows:
+        fields = {str(k).strip().lower().replace(" ", "_"): v for k, v in row.items()}
+        name = _first(fields, "name", "organization_name", "organization", "legal_name")
+        if not name:
+            continue
+        status = _first(fields, "status", "active")
+        participant_id = _first(fields, "id", "participant_id")
+        url = _first(fields, "url", "participant_url", "link") or (
+            _PARTICIPANT_URL.format(id=participant_id) if participant_id else DPF_LIST_URL
+        )
+        records.append(
+            DpfRecord(
+                name=name,
+                active=status is None or status.lower() in ("active", "actief", "true", "1", "yes"),
+                url=url,
+            )
+        )
+    return records
+
+
+def _first(fields: dict, *keys: str) -> str | None:
+    for key in keys:
+        value = fields.get(key)
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+
+def build_index(records: Iterable[DpfRecord], path: Path, snapshot_at: float) -> int:
+    """Schrijf de index atomisch weg; lopende readers houden hun oude mmap."""
+    by_key: dict[bytes, DpfRecord] = {}
+    for record in records:
+        key = organization_key(record.name).encode()
+        if not key:
+            continue
+        # Dezelfde organisatie twee keer (oude en nieuwe inschrijving): actief wint
+        known = by_key.get(key)
+        if known is None or (record.active and not known.active):
+            by_key[key] = record
+
+    entries = bytearray()
+    blob = bytearray()
+    for key in sorted(by_key):
+        record = by_key[key]
+        value = f"{record.name}\x1f{record.url}".encode()
+        entries += _ENTRY.pack(len(blob), len(key), len(blob) + len(key), len(value), record.active)
+        blob += key
+        blob += value
+
+    def write(f) -> None:
+        f.write(_HEADER.pack(_MAGIC, len(by_key), _HEADER.size + len(entries), snapshot_at))
+        f.write(entries)
+        f.write(blob)
+
+    _write_atomic(path, write)
+    return len(by_key)
+
+
+def _write_atomic(path: Path, write: Callable) -> None:
+    """Schrijf naar een eigen tijdelijk bestand naast ``path`` en vervang dan in één keer.
+
+    Een vaste naam als ``dpf.tmp`` zou twee gelijktijdige schrijvers (warm-up en
+    refresh, of twee workers) door elkaar laten schrijven.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class DpfIndex:
+    """Memory-mapped index over de deelnemers van het EU-US Data Privacy Framework.
+
+    Exacte namen worden met binary search op de gesorteerde sleutels gevonden;
+    daarna volgen organisaties waarvan de naam met de zoekterm begint ("Slack"
+    → "Slack Technologies") en tot slot typo's binnen een kleine edit-afstand.
+    Het bestand wordt door alle workers gedeeld via de page cache.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self._blob, snapshot_at = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is geen DPF-index")
+        self.snapshot_at = datetime.fromtimestamp(snapshot_at, tz=timezone.utc)
+        self.mtime = os.stat(path).st_mtime
+        self._cache: dict[str, DpfMatch | None] = {}
+
+    def lookup(self, name: str) -> DpfMatch | None:
+        """De ene organisatie die bij deze naam hoort, of None bij geen of twijfel.
+
+        Alleen een exacte naam telt, of één enkele prefix-match waarvan de rest
+        van de naam niets onderscheidends toevoegt ("Slack Technologies"). Een
+        typo-match ("Sentry" → "Sentra, Inc.") of een langere naam ("Box" → "Box
+        Hill Institute") is een ander bedrijf zo vaak als het dezelfde is.
+        Zulke kandidaten blijven beschikbaar via ``candidates`` (check_dpf).
+        """
+        if name in self._cache:
+            return self._cache[name]
+        matches = self.candidates(name, limit=2)
+        first = matches[0] if matches else None
+        unique = first is not None and (
+            first.match == "exact"
+            or (first.match == "prefix" and len(matches) == 1 and _same_company(name, first))
+        )
+        match = first if unique else None
+        dpf_lookups.inc(match=match.match if match else ("ambiguous" if matches else "none"))
+        if len(self._cache) >= _CACHE_SIZE:
+            self._cache.clear()
+        self._cache[name] = match
+        return match
+
+    def candidates(self, name: str, limit: int = 5) -> list[DpfMatch]:
+        """Exacte, dan prefix- (op een woordgrens) en anders fuzzy matches."""
+        key = organization_key(name).encode()
+        if not key:
+            return []
+        found: list[DpfMatch] = []
+
+        start = self._bisect(key)
+        if start < self.count and self._key(start) == key:
+            found.append(self._match(start, "exact"))
+
+        # Langere namen die met de zoekterm beginnen, op een woordgrens
+        prefix = key + b" "
+        index = self._bisect(prefix)
+        while index < self.count and len(found) < limit and self._key(index).startswith(prefix):
+            found.append(self._match(index, "prefix"))
+            index += 1
+
+        if not found:
+            found = self._fuzzy(key.decode(), limit)
+        return found[:limit]
+
+    def _fuzzy(self, key: str, limit: int) -> list[DpfMatch]:
+        if len(key) < 4:
+            return []
+        max_distance = 1 if len(key) < 8 else 2
+        # Alleen sleutels met dezelfde eerste letter; de rest van een naam mag een typo hebben
+        first = key[0].encode()
+        index = self._bisect(first)
+        scored = []
+        while index < self.count:
+            key_offset, key_length, *_ = _ENTRY.unpack_from(
+                self._mm, _HEADER.size + index * _ENTRY.size
+            )
+            if self._mm[self._blob + key_offset : self._blob + key_offset + 1] != first:
+                break
+            if abs(key_length - len(key)) <= max_distance:
+                candidate = self._key(index).decode()
+                distance = osa_distance(key, candidate, max_distance + 1)
+                if distance <= max_distance:
+                    scored.append((distance, index))
+            index += 1
+        scored.sort()
+        return [self._match(index, "fuzzy") for _, index in scored[:limit]]
+
+    def _bisect(self, key: bytes) -> int:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _key(self, index: int) -> bytes:
+        key_offset, key_length, *_ = _ENTRY.unpack_from(self._mm, _HEADER.size + index * _ENTRY.size)
+        start = self._blob + key_offset
+        return self._mm[start : start + key_length]
+
+    def _match(self, index: int, how: str) -> DpfMatch:
+        _, _, offset, length, active = _ENTRY.unpack_from(
+            self._mm, _HEADER.size + index * _ENTRY.size
+        )
+        start = self._blob + offset
+        name, url = self._mm[start : start + length].decode().split("\x1f", 1)
+        return DpfMatch(organization=name, active=bool(active), url=url, match=how)
+
+
+def _same_company(name: str, match: DpfMatch) -> bool:
+    extra = organization_key(match.organization).split()[len(organization_key(name).split()) :]
+    return all(word in _DESCRIPTOR_WORDS for word in extra)
+
+
+def _index_path() -> Path:
+    return Path(settings.data_dir) / "dpf.idx"
+
+
+def _snapshot_path() -> Path:
+    return Path(settings.dpf_snapshot_path or Path(settings.data_dir) / "dpf-participants")
+
+
+_index: DpfIndex | None = None
+_checked_at = 0.0
+_index_lock = threading.Lock()
+_rebuild_lock = threading.Lock()
+
+
+@contextmanager
+def _exclusive() -> Iterator[None]:
+    """Eén schrijver tegelijk, tussen threads van dit proces én tussen workers."""
+    lock_path = _index_path().with_name("dpf.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with _rebuild_lock, open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def get_dpf_index() -> DpfIndex | None:
+    """De index van dit proces; opnieuw geopend als de refresh een nieuwe schreef."""
+    global _index, _checked_at
+    if time.monotonic() - _checked_at < 60 and _index is not None:
+        return _index
+    with _index_lock:
+        _checked_at = time.monotonic()
+        path = _index_path()
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return _index
+        if _index is None or _index.mtime != mtime:
+            try:
+                _index = DpfIndex(path)
+            except (OSError, ValueError, struct.error) as e:
+                logger.warning(f"DPF-index {path} niet te openen: {e}")
+    return _index
+
+
+def rebuild_index() -> int | None:
+    """Bouw de index uit de lokale snapshot als die nieuwer is dan de index.
+
+    Onder een lock: wie na een andere worker of thread aan de beurt is, ziet
+    een actuele index en bouwt niet nog eens.
+    """
+    snapshot, index = _snapshot_path(), _index_path()
+    with _exclusive():
+        try:
+            snapshot_mtime = os.stat(snapshot).st_mtime
+        except FileNotFoundError:
+            return None
+        if index.exists() and os.stat(index).st_mtime >= snapshot_mtime:
+            return None
+        count = build_index(parse_snapshot(snapshot.read_bytes()), index, snapshot_mtime)
+    logger.info(f"DPF-index gebouwd: {count} organisaties uit {snapshot}")
+    return count
+
+
+async def refresh_snapshot() -> None:
+    """Download een verse snapshot (als er een bron is ingesteld) en herbouw de index."""
+    import httpx
+
+    snapshot = _snapshot_path()
+    max_age = settings.dpf_refresh_hours * 3600
+    stale = not snapshot.exists() or time.time() - os.stat(snapshot).st_mtime > max_age
+    if settings.dpf_snapshot_url and stale:
+        async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
+            response = await client.get(settings.dpf_snapshot_url)
+            response.raise_for_status()
+        # Eerst controleren dat de download bruikbaar is, dan pas de oude vervangen
+        if not await asyncio.to_thread(parse_snapshot, response.content):
+            raise ValueError("DPF-snapshot bevat geen deelnemers")
+        await asyncio.to_thread(_store_snapshot, snapshot, response.content)
+    await asyncio.to_thread(rebuild_index)
+
+
+def _store_snapshot(snapshot: Path, content: bytes) -> None:
+    with _exclusive():
+        _write_atomic(snapshot, lambda f: f.write(content))
+
+
+async def run_refresh_loop() -> None:
+    """Achtergrondtaak: houd de snapshot en de index actueel."""
+    while True:
+        try:
+            await refresh_snapshot()
+        except Exception as e:
+            logger.warning(f"Verversen van de DPF-lijst mislukt: {e}")
+        await asyncio.sleep(settings.dpf_refresh_hours * 3600)
@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+
+from ..models import ComplianceResult, ResultVersion
+
+# Eén platte rij per tool, per check en per sub-verwerker
+EXPORT_COLUMNS = [
+    "version",
+    "checked_at",
+    "tool_name",
+    "tool_url",
+    "overall_status",
+    "record_type",
+    "summary",
+    "category",
+    "category_status",
+    "check_name",
+    "check_status",
+    "finding",
+    "source_urls",
+    "sub_processor",
+    "sub_processor_purpose",
+    "data_location",
+    "sub_processor_status",
+]
+
+# Aantal rijen per CSV/JSONL chunk en per Parquet row group
+_CHUNK_ROWS = 500
+
+
+def flatten_result(version: ResultVersion, result: ComplianceResult) -> Iterator[dict]:
+    """Maak platte export-rijen van één opgeslagen resultaat."""
+    base = dict.fromkeys(EXPORT_COLUMNS)
+    base.update(
+        version=version.version,
+        checked_at=version.created_at.isoformat(),
+        tool_name=result.tool_name,
+        tool_url=result.tool_url,
+        overall_status=result.overall_status.value,
+    )
+
+    yield {**base, "record_type": "tool", "summary": result.summary}
+
+    for category in result.categories:
+        for check in category.checks:
+            yield {
+                **base,
+                "record_type": "check",
+                "category": category.name,
+                "category_status": category.status.value,
+                "check_name": check.name,
+                "check_status": check.status.value,
+                "finding": check.finding,
+                "source_urls": " ".join(source.url for source in check.sources),
+            }
+
+    for sp in result.sub_processors:
+        yield {
+            **base,
+            "record_type": "sub_processor",
+            "sub_processor": sp.name,
+            "sub_processor_purpose": sp.purpose,
+            "data_location": sp.data_location,
+            "sub_processor_status": sp.status.value,
+            "source_urls": sp.source.url if sp.source else None,
+        }
+
+
+def export_rows(
+    results: Iterable[tuple[ResultVersion, ComplianceResult]],
+    sub_processor: str | None = None,
+) -> Iterator[dict]:
+    """Platte rijen voor alle resultaten, optioneel gefilterd op sub-verwerker.
+
+    Het sub-verwerker filter behoudt alle rijen van resultaten waarin een
+    sub-verwerker voorkomt waarvan de naam de zoekterm bevat.
+    """
+    needle = sub_processor.lower() if sub_processor else None
+    for version, result in results:
+        if needle and not any(needle in sp.name.lower() for sp in result.sub_processors):
+            continue
+        yield from flatten_result(version, result)
+
+
+def iter_jsonl(rows: Iterable[dict]) -> Iterator[bytes]:
+    buffer: list[str] = []
+    for row in rows:
+        buffer.append(json.dumps(row, ensure_ascii=False))
+        if len(buffer) >= _CHUNK_ROWS:
+            yield ("\n".join(buffer) + "\n").encode()
+            buffer.clear()
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode()
+
+
+def iter_csv(rows: Iterable[dict]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % _CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Schrijfbare stream die geschreven bytes verzamelt tot ze opgehaald worden."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_parquet(rows: Iterable[dict]) -> Iterator[bytes]:
+    """Schrijf Parquet row group voor row group en geef elke groep direct door.
+
+    Vereist de optionele dependency pyarrow.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("version", pa.int64()),
+            *((name, pa.string()) for name in EXPORT_COLUMNS[1:]),
+        ]
+    )
+    sink = _ChunkSink()
+    # Dictionary encoding maakt herhaalde waarden (statussen, categorieën) compact
+    writer = pq.ParquetWriter(sink, schema, compression="zstd", use_dictionary=True)
+    batch: list[dict] = []
+
+    def write_batch() -> bytes:
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        batch.clear()
+        return sink.drain()
+
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= _CHUNK_ROWS:
+                yield write_batch()
+        if batch:
+            yield write_batch()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,123 @@
+import importlib.util
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Netwerken van CDN's: hun IP's zeggen waar de edge staat, niet waar de data ligt
+CDN_ASNS = {
+    13335: "Cloudflare",
+    20940: "Akamai",
+    16625: "Akamai",
+    54113: "Fastly",
+    209242: "Cloudflare",
+    15133: "Edgecast",
+    60068: "CDN77",
+}
+
+
+@dataclass(frozen=True)
+class IpLocation:
+    country: str | None
+    asn: int | None
+    network: str | None
+
+    @property
+    def cdn(self) -> bool:
+        return self.asn in CDN_ASNS
+
+
+class GeoDatabase:
+    """IP naar land en AS uit lokale MaxMind-databases (.mmdb), memory-mapped.
+
+    Werkt met GeoLite2-Country plus GeoLite2-ASN, of met één database die
+    beide bevat (zoals de country_asn-export van IPinfo).
+    """
+
+    def __init__(self, country_path: Path, asn_path: Path | None):
+        import maxminddb
+
+        self._country = maxminddb.open_database(str(country_path), maxminddb.MODE_MMAP)
+        self._asn = (
+            maxminddb.open_database(str(asn_path), maxminddb.MODE_MMAP) if asn_path else None
+        )
+        self.mtime = _mtime(country_path, asn_path)
+
+    def locate(self, ip: str) -> IpLocation | None:
+        try:
+            record = self._country.get(ip) or {}
+            if self._asn is not None:
+                record = {**record, **(self._asn.get(ip) or {})}
+        except ValueError:
+            return None
+        if not record:
+            return None
+        return IpLocation(
+            country=_country_code(record.get("country")),
+            asn=_asn_number(record.get("autonomous_system_number") or record.get("asn")),
+            network=record.get("autonomous_system_organization") or record.get("as_name"),
+        )
+
+
+def _country_code(value) -> str | None:
+    if isinstance(value, dict):
+        value = value.get("iso_code")
+    return value.upper() if isinstance(value, str) and value else None
+
+
+def _asn_number(value) -> int | None:
+    if isinstance(value, str):
+        value = value.upper().removeprefix("AS")
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _mtime(*paths: Path | None) -> tuple[float, ...]:
+    return tuple(os.stat(path).st_mtime for path in paths if path is not None)
+
+
+def _database_paths() -> tuple[Path, Path | None]:
+    data_dir = Path(settings.data_dir)
+    country = Path(settings.geoip_country_db_path or data_dir / "GeoLite2-Country.mmdb")
+    asn = Path(settings.geoip_asn_db_path or data_dir / "GeoLite2-ASN.mmdb")
+    return country, asn if asn.exists() else None
+
+
+_database: GeoDatabase | None = None
+_checked_at = 0.0
+_database_lock = threading.Lock()
+
+
+def get_geo_database() -> GeoDatabase | None:
+    """De database van dit proces; opnieuw geopend als de bestanden vervangen zijn.
+
+    None als maxminddb niet geïnstalleerd is of er geen database staat; de
+    hosting-verrijking slaat zichzelf dan over.
+    """
+    global _database, _checked_at
+    if time.monotonic() - _checked_at < 60:
+        return _database
+    with _database_lock:
+        _checked_at = time.monotonic()
+        if importlib.util.find_spec("maxminddb") is None:
+            return _database
+        country, asn = _database_paths()
+        try:
+            mtime = _mtime(country, asn)
+        except FileNotFoundError:
+            return _database
+        if _database is None or _database.mtime != mtime:
+            # De oude niet sluiten: een lopende lookup kan hem nog gebruiken
+            try:
+                _database = GeoDatabase(country, asn)
+            except (OSError, ValueError) as e:
+                logger.warning(f"IP-geolocatie database {country} niet te openen: {e}")
+    return _database
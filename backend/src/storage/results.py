@@ -0,0 +1,269 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cached_property
+from pathlib import Path
+
+from ..config import settings
+from ..models import ComplianceResult, ResultVersion
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    tool_key     TEXT PRIMARY KEY,
+    created_at   REAL NOT NULL,
+    payload      BLOB NOT NULL,
+    content_hash BLOB
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS history (
+    version        INTEGER PRIMARY KEY AUTOINCREMENT,
+    tool_key       TEXT NOT NULL,
+    tool_name      TEXT NOT NULL,
+    overall_status TEXT NOT NULL,
+    created_at     REAL NOT NULL,
+    content_hash   BLOB NOT NULL,
+    payload        BLOB NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS history_tool ON history (tool_key, version);
+"""
+
+
+def encode_result(result: ComplianceResult) -> bytes:
+    """Compacte JSON, zlib-gecomprimeerd."""
+    return zlib.compress(result.model_dump_json().encode(), 6)
+
+
+def decode_result(payload: bytes) -> ComplianceResult:
+    return ComplianceResult.model_validate_json(zlib.decompress(payload))
+
+
+@dataclass(frozen=True)
+class ResultEnvelope:
+    """Een opgeslagen resultaat zoals het over de lijn gaat: één keer geëncodeerd.
+
+    ``payload`` is zlib-gecomprimeerde JSON en kan ongewijzigd als HTTP
+    ``Content-Encoding: deflate`` verstuurd worden. De ETag is de hash van
+    de inhoud, dus gelijk voor alle workers en stabiel over herhaalde checks.
+    """
+
+    tool_key: str
+    payload: bytes
+    content_hash: bytes
+    created_at: float
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.content_hash.hex()}"'
+
+    @cached_property
+    def json(self) -> bytes:
+        return zlib.decompress(self.payload)
+
+    @cached_property
+    def text(self) -> str:
+        return self.json.decode()
+
+    def result(self) -> ComplianceResult:
+        return ComplianceResult.model_validate_json(self.json)
+
+
+def _content_hash(json_bytes: bytes) -> bytes:
+    return hashlib.blake2b(json_bytes, digest_size=16).digest()
+
+
+class ResultStore:
+    """Gedeelde opslag van check-resultaten voor alle workers op de host.
+
+    SQLite in WAL-modus laat meerdere processen tegelijk lezen terwijl er één
+    schrijft, dus een POST /api/report vindt het resultaat ongeacht welke
+    uvicorn worker de check heeft gedraaid. Elke thread krijgt een eigen
+    verbinding; een lookup op primary key is een enkele B-tree zoekactie.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._migrate(self._connection())
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute(f"PRAGMA mmap_size={settings.result_store_mmap_bytes}")
+            self._local.conn = conn
+        return conn
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(_SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+        if "content_hash" not in columns:
+            # Databases van vóór de envelopes; de hash wordt bij lezen aangevuld
+            conn.execute("ALTER TABLE results ADD COLUMN content_hash BLOB")
+
+    def put(self, tool_key: str, result: ComplianceResult) -> ResultEnvelope:
+        """Sla het resultaat op als laatste versie én voeg het toe aan de historie.
+
+        Een versie die inhoudelijk gelijk is aan de vorige wordt niet opnieuw
+        aan de historie toegevoegd. Geeft de envelope terug die ook naar de
+        clients gaat, zodat het resultaat maar één keer geserialiseerd wordt.
+        """
+        json_bytes = result.model_dump_json().encode()
+        payload = zlib.compress(json_bytes, 6)
+        # Hash over de inhoud, zodat identieke herhaalde checks geen nieuwe versie geven
+        content_hash = _content_hash(json_bytes)
+        now = time.time()
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (tool_key, created_at, payload, content_hash) "
+                "VALUES (?, ?, ?, ?)",
+                (tool_key, now, payload, content_hash),
+            )
+            last = conn.execute(
+                "SELECT content_hash FROM history WHERE tool_key = ? ORDER BY version DESC LIMIT 1",
+                (tool_key,),
+            ).fetchone()
+            if last is None or last[0] != content_hash:
+                conn.execute(
+                    "INSERT INTO history "
+                    "(tool_key, tool_name, overall_status, created_at, content_hash, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        tool_key,
+                        result.tool_name,
+                        result.overall_status.value,
+                        now,
+                        content_hash,
+                        payload,
+                    ),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        envelope = ResultEnvelope(tool_key, payload, content_hash, now)
+        # JSON is er al; dan hoeft de eerste lezer niet te decomprimeren
+        envelope.__dict__["json"] = json_bytes
+        return envelope
+
+    def get_envelope(self, tool_key: str) -> ResultEnvelope | None:
+        """Het laatste resultaat als envelope, zonder het naar een model te parsen."""
+        row = self._connection().execute(
+            "SELECT payload, content_hash, created_at FROM results WHERE tool_key = ?",
+            (tool_key,),
+        ).fetchone()
+        if row is None:
+            return None
+        payload, content_hash, created_at = row
+        if content_hash is None:
+            content_hash = _content_hash(zlib.decompress(payload))
+        return ResultEnvelope(tool_key, payload, content_hash, created_at)
+
+    def get(self, tool_key: str) -> ComplianceResult | None:
+        row = self._connection().execute(
+            "SELECT payload FROM results WHERE tool_key = ?", (tool_key,)
+        ).fetchone()
+        return decode_result(row[0]) if row else None
+
+    def history(self, tool_key: str, limit: int = 50) -> list[ResultVersion]:
+        """Versies van een tool, nieuwste eerst (zonder de payloads te lezen)."""
+        rows = self._connection().execute(
+            "SELECT version, tool_name, overall_status, created_at FROM history "
+            "WHERE tool_key = ? ORDER BY version DESC LIMIT ?",
+            (tool_key, limit),
+        ).fetchall()
+        return [
+            ResultVersion(
+                version=version,
+                tool_name=tool_name,
+                overall_status=status,
+                created_at=datetime.fromtimestamp(created_at, tz=timezone.utc),
+            )
+            for version, tool_name, status, created_at in rows
+        ]
+
+    def get_version(self, tool_key: str, version: int) -> ComplianceResult | None:
+        row = self._connection().execute(
+            "SELECT payload FROM history WHERE tool_key = ? AND version = ?",
+            (tool_key, version),
+        ).fetchone()
+        return decode_result(row[0]) if row else None
+
+    def iter_history(
+        self,
+        statuses: list[str] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        latest_only: bool = True,
+        batch_size: int = 200,
+    ) -> Iterator[tuple[ResultVersion, ComplianceResult]]:
+        """Loop in batches over opgeslagen versies, oudste eerst.
+
+        Gebruikt een eigen read-only verbinding die van thread mag wisselen,
+        zodat een StreamingResponse (die elke stap in een threadpool draait)
+        de cursor veilig kan doorlopen zonder alles in het geheugen te laden.
+        """
+        where = []
+        params: list = []
+        if statuses:
+            where.append(f"overall_status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if since is not None:
+            where.append("created_at >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            where.append("created_at < ?")
+            params.append(until.timestamp())
+        if latest_only:
+            where.append("version IN (SELECT MAX(version) FROM history GROUP BY tool_key)")
+
+        query = "SELECT version, tool_name, overall_status, created_at, payload FROM history"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY version"
+
+        conn = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, timeout=5.0, check_same_thread=False
+        )
+        try:
+            cursor = conn.execute(query, params)
+            while rows := cursor.fetchmany(batch_size):
+                for version, tool_name, status, created_at, payload in rows:
+                    yield (
+                        ResultVersion(
+                            version=version,
+                            tool_name=tool_name,
+                            overall_status=status,
+                            created_at=datetime.fromtimestamp(created_at, tz=timezone.utc),
+                        ),
+                        decode_result(payload),
+                    )
+        finally:
+            conn.close()
+
+
+_store: ResultStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """De result store van dit proces, geopend bij eerste gebruik."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResultStore(Path(settings.data_dir) / "results.sqlite3")
+    return _store
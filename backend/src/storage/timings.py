@@ -0,0 +1,125 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS check_timings (
+    created_at       REAL NOT NULL,
+    research_seconds REAL NOT NULL,
+    pages_fetched    INTEGER NOT NULL,
+    writing_seconds  REAL NOT NULL,
+    checks           INTEGER NOT NULL,
+    sub_processors   INTEGER NOT NULL
+);
+"""
+
+# Alleen recente runs tellen mee; model en prompt veranderen in de tijd
+_WINDOW = 50
+
+
+@dataclass
+class TimingEstimate:
+    """Verwachte duur van de onderdelen van een check."""
+
+    research_seconds: float
+    pages_fetched: float
+    seconds_per_item: float
+    sub_processors: float
+
+
+@dataclass
+class CheckTiming:
+    """Gemeten duur van één afgeronde check."""
+
+    research_seconds: float
+    pages_fetched: int
+    writing_seconds: float
+    checks: int
+    sub_processors: int
+
+
+class TimingStore:
+    """Historische timings van checks, voor de voortgang en ETA van nieuwe runs.
+
+    Leeft in dezelfde SQLite database als de resultaten, zodat alle workers
+    van elkaars runs leren. De schatting wordt in het geheugen gecachet en
+    ververst na elke eigen run of na ``ttl`` seconden.
+    """
+
+    def __init__(self, path: Path, ttl: float = 300.0):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._estimate: TimingEstimate | None = None
+        self._estimated_at = 0.0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+    def record(self, timing: CheckTiming) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO check_timings VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(),
+                    timing.research_seconds,
+                    timing.pages_fetched,
+                    timing.writing_seconds,
+                    timing.checks,
+                    timing.sub_processors,
+                ),
+            )
+            self._estimate = None
+
+    def estimate(self) -> TimingEstimate:
+        """Gemiddelden over de laatste runs, of standaardwaarden zonder historie."""
+        with self._lock:
+            if self._estimate is None or time.monotonic() - self._estimated_at > self.ttl:
+                self._estimate = self._load_estimate()
+                self._estimated_at = time.monotonic()
+            return self._estimate
+
+    def _load_estimate(self) -> TimingEstimate:
+        row = self._conn.execute(
+            "SELECT COUNT(*), AVG(research_seconds), AVG(pages_fetched), "
+            "AVG(writing_seconds / (checks + sub_processors)), AVG(sub_processors) "
+            f"FROM (SELECT * FROM check_timings ORDER BY created_at DESC LIMIT {_WINDOW})"
+        ).fetchone()
+        if not row[0]:
+            # Grofweg: tweederde onderzoek, een derde uitschrijven
+            total = settings.estimated_check_seconds
+            return TimingEstimate(
+                research_seconds=total * 0.65,
+                pages_fetched=8.0,
+                seconds_per_item=total * 0.35 / 20,
+                sub_processors=6.0,
+            )
+        _, research, pages, per_item, sub_processors = row
+        return TimingEstimate(
+            research_seconds=research,
+            pages_fetched=max(pages, 1.0),
+            seconds_per_item=per_item,
+            sub_processors=sub_processors,
+        )
+
+
+_store: TimingStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_timing_store() -> TimingStore:
+    """De timing store van dit proces, geopend bij eerste gebruik."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TimingStore(Path(settings.data_dir) / "results.sqlite3")
+    return _store
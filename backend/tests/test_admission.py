@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from src.agent import admission as admission_module
+from src.agent.admission import AdmissionController, AdmissionRejected
+
+
+def _controller(**overrides) -> AdmissionController:
+    options = dict(
+        max_concurrent=1, max_queued=2, tokens_per_minute=0,
+        estimated_tokens_per_run=0, estimated_run_seconds=10.0,
+    )
+    return AdmissionController(**{**options, **overrides})
+
+
+def test_slots_are_granted_in_fifo_order():
+    controller = _controller()
+    first, second, third = controller.enqueue(), controller.enqueue(), controller.enqueue()
+    assert (first.granted, second.granted, third.granted) == (True, False, False)
+    assert [controller.status(t).position for t in (second, third)] == [1, 2]
+
+    first.release()
+    assert (second.granted, third.granted) == (True, False)
+    second.release()
+    assert third.granted
+
+
+def test_full_queue_rejects_new_runs():
+    controller = _controller(max_queued=1)
+    controller.enqueue()  # krijgt direct het slot
+    controller.enqueue()  # wacht
+    with pytest.raises(AdmissionRejected):
+        controller.enqueue()
+
+
+def test_token_bucket_refills_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(admission_module.time, "monotonic", lambda: now[0])
+    controller = _controller(
+        max_concurrent=4, tokens_per_minute=60_000, estimated_tokens_per_run=40_000
+    )
+    first, second = controller.enqueue(), controller.enqueue()
+    # 60k in de bucket: na de eerste reservering van 40k is er te weinig voor de tweede
+    assert (first.granted, second.granted) == (True, False)
+    assert controller.status(second).eta_seconds == pytest.approx(20.0)
+
+    now[0] += 20.0  # 20s × 1000 tokens/s bijgevuld
+    controller.dispatch()
+    assert second.granted
+
+
+def test_waiting_ticket_gets_the_slot_when_released():
+    async def scenario():
+        controller = _controller()
+        first, second = controller.enqueue(), controller.enqueue()
+        updates = []
+
+        async def wait():
+            async for status in second.wait():
+                updates.append(status.position)
+
+        waiter = asyncio.create_task(wait())
+        await asyncio.sleep(0)
+        first.release()
+        await asyncio.wait_for(waiter, timeout=1.0)
+        assert updates == [1] and second.granted
+
+    asyncio.run(scenario())
@@ -0,0 +1,48 @@
+import asyncio
+
+from src.storage.corpus import CorpusIndex
+
+
+def test_domain_filter_is_anchored(tmp_path):
+    index = CorpusIndex(tmp_path / "corpus.sqlite3")
+    index.add("https://slack.com/privacy", "slack.com", "encryption at rest")
+    index.add("https://trust.slack.com/security", "trust.slack.com", "encryption in transit")
+    index.add("https://notslack.com/privacy", "notslack.com", "encryption everywhere")
+
+    assert {hit.url for hit in index.search("encryption", "slack.com")} == {
+        "https://slack.com/privacy",
+        "https://trust.slack.com/security",
+    }
+    assert [hit.url for hit in index.search("encryption", "trust.slack.com")] == [
+        "https://trust.slack.com/security"
+    ]
+
+
+def test_search_joins_pages_by_index(tmp_path):
+    index = CorpusIndex(tmp_path / "corpus.sqlite3")
+    plan = index._connection().execute(
+        "EXPLAIN QUERY PLAN SELECT 1 FROM corpus_fts "
+        "JOIN corpus_pages p ON p.fts_rowid = corpus_fts.rowid WHERE corpus_fts MATCH 'x'"
+    ).fetchall()
+    assert not any(row[3].startswith("SCAN p") for row in plan)
+
+
+def test_fetched_page_is_indexed_before_truncation(tmp_path, monkeypatch):
+    from src.agent import tools
+    from src.fetch.client import FetchedPage
+
+    index = CorpusIndex(tmp_path / "corpus.sqlite3")
+    text = "Inleiding. " * 2000 + "Subprocessors are listed in Annex III."
+    page = FetchedPage(url="https://acme.example/dpa", content_type="text/html", text=text, truncated=False)
+
+    async def fetch_page(url):
+        return page
+
+    monkeypatch.setattr(tools, "fetch_page", fetch_page)
+    monkeypatch.setattr(tools, "get_corpus_index", lambda: index)
+    monkeypatch.setattr(tools.settings, "fetch_max_chars", 1000)
+
+    output = asyncio.run(tools.fetch_webpage.ainvoke({"url": page.url}))
+    assert "Annex III" not in output
+    assert output.endswith("[... tekst ingekort ...]")
+    assert [hit.url for hit in index.search("annex", "acme.example")] == [page.url]
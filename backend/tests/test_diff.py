@@ -0,0 +1,38 @@
+from src.models import CategoryResult, CheckResult, ComplianceResult
+from src.storage.diff import diff_results
+
+STORAGE = "Dataopslag & Verwerking"
+
+
+def _result(location: str, dpa: str = "DPA beschikbaar", status: str = "orange") -> ComplianceResult:
+    checks = [
+        CheckResult(name="Datalocatie", description="Waar wordt data opgeslagen", status=status, finding=location),
+        CheckResult(name="Verwerkersovereenkomst (DPA)", description="", status="green", finding=dpa),
+    ]
+    return ComplianceResult(
+        tool_name="Slack",
+        overall_status="orange",
+        summary="",
+        categories=[CategoryResult(name=STORAGE, status="orange", summary="", checks=checks)],
+    )
+
+
+def test_location_finding_change_with_same_status():
+    diff = diff_results(_result("Opslag in de VS (us-east-1)"), _result("Opslag in Ierland (eu-west-1)"), 1, 2)
+    [change] = diff.check_changes
+    assert change.check == "Datalocatie"
+    assert change.status is None
+    assert change.finding == ("Opslag in de VS (us-east-1)", "Opslag in Ierland (eu-west-1)")
+
+
+def test_whitespace_and_other_findings_are_unchanged():
+    old = _result("Opslag in de VS", dpa="DPA beschikbaar")
+    new = _result("Opslag  in de\nVS ", dpa="Er is een DPA te tekenen")
+    assert diff_results(old, new, 1, 2).check_changes == []
+
+
+def test_status_and_finding_change_together():
+    diff = diff_results(_result("Opslag in de VS"), _result("Opslag in de EU", status="green"), 1, 2)
+    [change] = diff.check_changes
+    assert (change.status.old, change.status.new) == ("orange", "green")
+    assert change.finding == ("Opslag in de VS", "Opslag in de EU")
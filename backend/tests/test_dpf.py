@@ -0,0 +1,60 @@
+import threading
+
+from src.storage import dpf
+from src.storage.dpf import DpfIndex, DpfRecord, build_index
+
+RECORDS = [
+    DpfRecord(name="Sentra, Inc.", active=True, url="https://example.org/sentra"),
+    DpfRecord(name="Twillio Corp", active=True, url="https://example.org/twillio"),
+    DpfRecord(name="Slack Technologies, LLC", active=True, url="https://example.org/slack"),
+    DpfRecord(name="Amazon Web Services, Inc.", active=True, url="https://example.org/aws"),
+    DpfRecord(name="Amazon Data Services", active=False, url="https://example.org/ads"),
+    DpfRecord(name="Box Hill Institute", active=True, url="https://example.org/boxhill"),
+]
+
+
+def _index(tmp_path) -> DpfIndex:
+    path = tmp_path / "dpf.idx"
+    build_index(RECORDS, path, 0.0)
+    return DpfIndex(path)
+
+
+def test_lookup_never_accepts_a_typo_match(tmp_path):
+    index = _index(tmp_path)
+    assert index.lookup("Sentry") is None
+    assert index.lookup("Twilio") is None
+    # Voor de agent blijven ze als gelabelde kandidaat zichtbaar
+    assert [m.match for m in index.candidates("Sentry")] == ["fuzzy"]
+
+
+def test_lookup_accepts_exact_and_single_prefix(tmp_path):
+    index = _index(tmp_path)
+    assert index.lookup("Sentra Inc").organization == "Sentra, Inc."
+    assert index.lookup("Slack").organization == "Slack Technologies, LLC"
+    # Twee organisaties beginnen met "Amazon": geen eenduidige match
+    assert index.lookup("Amazon") is None
+
+
+def test_lookup_rejects_a_prefix_that_names_another_company(tmp_path):
+    index = _index(tmp_path)
+    assert index.lookup("Box") is None
+    assert [m.organization for m in index.candidates("Box")] == ["Box Hill Institute"]
+
+
+def test_concurrent_rebuilds_publish_one_complete_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(dpf.settings, "data_dir", str(tmp_path))
+    monkeypatch.setattr(dpf.settings, "dpf_snapshot_path", "")
+    snapshot = tmp_path / "dpf-participants"
+    snapshot.write_text("name,status\n" + "".join(f"Org {i},Active\n" for i in range(2000)))
+
+    counts = []
+    threads = [threading.Thread(target=lambda: counts.append(dpf.rebuild_index())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Eén thread bouwt, de rest ziet een actuele index
+    assert sorted(counts, key=str) == [2000, None, None, None]
+    assert DpfIndex(tmp_path / "dpf.idx").count == 2000
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,62 @@
+import asyncio
+
+from src.agent import enrichment
+from src.agent.enrichment import _sub_processor_host, enrich_hosting
+from src.identity.catalog import CatalogEntry
+from src.identity.resolver import ToolResolver
+from src.models import ComplianceResult, HostingLocation, Source, SubProcessor
+
+
+def _sub_processor(name: str, data_location: str = "onbekend", source_url: str | None = None):
+    source = Source(url=source_url, title="", quote=None) if source_url else None
+    return SubProcessor(
+        name=name, purpose="", data_location=data_location, status="orange", source=source
+    )
+
+
+def _resolver(tmp_path) -> ToolResolver:
+    resolver = ToolResolver(
+        [CatalogEntry(name="AWS", url="https://aws.amazon.com")], tmp_path / "results.sqlite3"
+    )
+    resolver.learn("Google", "https://www.google.com", "search")
+    return resolver
+
+
+def test_sub_processor_host_never_comes_from_a_loose_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(enrichment, "get_tool_resolver", lambda: _resolver(tmp_path))
+
+    # Exacte catalogusnaam geeft de host van de dienst, niet de webwinkel
+    assert _sub_processor_host("AWS") == "aws.amazon.com"
+    assert _sub_processor_host("sendgrid.com") == "sendgrid.com"
+    # Geleerde aliassen en tikfouten niet
+    assert _sub_processor_host("Google") is None
+    assert _sub_processor_host("AWX") is None
+
+
+def test_hosting_ignores_cited_sources_and_keeps_agent_locations(tmp_path, monkeypatch):
+    monkeypatch.setattr(enrichment, "get_tool_resolver", lambda: _resolver(tmp_path))
+    monkeypatch.setattr(enrichment, "get_geo_database", lambda: object())
+    looked_up = []
+
+    async def locate_domains(domains):
+        looked_up.extend(domain for domain in domains if domain)
+        return {
+            domain: [HostingLocation(host=domain, ip="3.3.3.3", country="US")]
+            for domain in domains if domain
+        }
+
+    monkeypatch.setattr(enrichment, "locate_domains", locate_domains)
+    result = ComplianceResult(
+        tool_name="Slack", tool_url="https://slack.com", overall_status="orange", summary="",
+        categories=[],
+        sub_processors=[
+            _sub_processor("Twilio", source_url="https://www.dataprivacyframework.gov/list"),
+            _sub_processor("AWS", data_location="Ierland (EU)"),
+        ],
+    )
+    asyncio.run(enrich_hosting(result))
+
+    assert sorted(looked_up) == ["aws.amazon.com", "slack.com"]
+    twilio, aws = result.sub_processors
+    assert twilio.hosting == [] and twilio.data_location == "onbekend"
+    assert aws.hosting and aws.data_location == "Ierland (EU)"
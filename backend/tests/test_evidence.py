@@ -0,0 +1,46 @@
+from src.checks.evidence import EvidenceCollector, extract_evidence
+from src.models import CategoryResult, CheckResult, ComplianceResult, Source
+
+GENERIC = (
+    "Under the GDPR, a personal data breach must be reported within 72 hours and without "
+    "undue delay. Data at rest and in transit should be protected. Many providers use "
+    "model clauses or data centres in Frankfurt. Read about data residency and retention."
+)
+VENDOR = (
+    "All customer content is encrypted at rest with AES-256. We retain backups for 30 days. "
+    "We will notify you without undue delay after becoming aware of a breach."
+)
+
+
+def test_generic_gdpr_text_is_no_evidence():
+    assert extract_evidence("https://blog.example.org/gdpr", GENERIC) == []
+
+
+def test_vendor_statements_are_evidence():
+    facts = {item.fact for item in extract_evidence("https://slack.com/security", VENDOR)}
+    assert facts == {"Encryptie at rest", "Bewaartermijn", "Meldplicht datalekken"}
+
+
+def _check(name: str, sources: list[Source]) -> CheckResult:
+    return CheckResult(name=name, description="", status="orange", finding="", sources=sources)
+
+
+def test_attach_only_to_checks_without_sources():
+    own = Source(url="https://slack.com/trust", title="Trust", quote=None)
+    result = ComplianceResult(
+        tool_name="Slack", tool_url="https://slack.com", overall_status="orange", summary="",
+        categories=[CategoryResult(name="Beveiliging", status="orange", summary="", checks=[
+            _check("Encryptie", [own]),
+            _check("Incident response", []),
+        ])],
+        sub_processors=[],
+    )
+    collector = EvidenceCollector()
+    collector.add(extract_evidence("https://slack.com/security", VENDOR))
+    collector.attach_to(result)
+
+    encryption, breach = result.categories[0].checks
+    assert encryption.sources == [own]
+    assert [(s.url, s.title) for s in breach.sources] == [
+        ("https://slack.com/security", "Meldplicht datalekken")
+    ]
@@ -0,0 +1,31 @@
+import asyncio
+import threading
+
+import httpx
+
+from src.fetch import client
+
+
+def test_html_is_parsed_off_the_event_loop(monkeypatch):
+    parsed_on = []
+    html_text = client._html_text
+
+    def recording_html_text(body: bytes, encoding: str) -> str:
+        parsed_on.append(threading.get_ident())
+        return html_text(body, encoding)
+
+    monkeypatch.setattr(client, "_html_text", recording_html_text)
+    response = httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"})
+
+    async def chunks():
+        yield b"<main>Data wordt in de EU opgeslagen.</main></body>"
+
+    async def read():
+        loop_thread = threading.get_ident()
+        html = b"<html><body><script>track()</script><nav>Menu</nav>"
+        page = await client._read_html("https://example.org", response, html, chunks())
+        return loop_thread, page
+
+    loop_thread, page = asyncio.run(read())
+    assert page.text == "Data wordt in de EU opgeslagen."
+    assert parsed_on and parsed_on[0] != loop_thread
@@ -0,0 +1,53 @@
+import httpx
+import openai
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.agent.llm import ResilientChatModel
+from src.config import settings
+
+
+class _Deployment(BaseChatModel):
+    """Faalt de eerste ``failures`` aanroepen met een timeout en antwoordt daarna."""
+
+    name: str
+    failures: int = 0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "test"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise openai.APITimeoutError(request=httpx.Request("POST", "https://test.invalid"))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.name))])
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "llm_retry_base_delay_seconds", 0.0)
+    monkeypatch.setattr(settings, "llm_retry_max_delay_seconds", 0.0)
+
+
+def _model(targets, max_retries: int = 1) -> ResilientChatModel:
+    return ResilientChatModel(call_type="test", targets=targets, timeout=1.0, max_retries=max_retries)
+
+
+def test_invoke_falls_back_to_the_next_deployment():
+    primary, fallback = _Deployment(name="primary", failures=1), _Deployment(name="fallback")
+    assert _model([primary, fallback]).invoke("hoi").content == "fallback"
+    assert (primary.calls, fallback.calls) == (1, 1)
+
+
+def test_invoke_retries_and_then_gives_up():
+    flaky = _Deployment(name="flaky", failures=1)
+    assert _model([flaky]).invoke("hoi").content == "flaky"
+
+    broken = _Deployment(name="broken", failures=10)
+    with pytest.raises(openai.APITimeoutError):
+        _model([broken], max_retries=2).invoke("hoi")
+    assert broken.calls == 3
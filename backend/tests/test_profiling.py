@@ -0,0 +1,75 @@
+import asyncio
+import json
+import time
+import tracemalloc
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src import profiling
+from src.api.routes import router
+from src.config import settings
+
+
+@pytest.fixture
+def profiles_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profiling_interval_seconds", 0.001)
+    # install() zet een profiler voor de loop van de test; daarna weer uit
+    monkeypatch.setattr(profiling, "_profiler", None)
+    return tmp_path / "profiles"
+
+
+async def _profile_busy_check(reason: str) -> str:
+    profiling.install(asyncio.get_running_loop())
+    async with profiling.profiled("slack@slack.com", "check", reason) as profile:
+        for _ in range(3):
+            # Langer dan het GIL-switchinterval, zodat de sampler midden in de task kijkt
+            _busy(0.03)
+            await asyncio.sleep(0)
+    return profile.check_id
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(i * i for i in range(1000))
+
+
+def test_sampled_check_writes_cpu_profile_without_tracemalloc(profiles_dir):
+    check_id = asyncio.run(_profile_busy_check("sampled"))
+
+    directory = profiles_dir / check_id
+    meta = json.loads((directory / "meta.json").read_text())
+    assert meta["tool"] == "slack@slack.com" and meta["reason"] == "sampled"
+    assert meta["samples"] > 0 and meta["memory"] is False
+    assert "_busy" in (directory / "cpu.folded").read_text()
+    assert not (directory / "memory.json").exists()
+    assert not tracemalloc.is_tracing()
+
+
+def test_admin_check_also_profiles_memory(profiles_dir):
+    check_id = asyncio.run(_profile_busy_check("admin"))
+
+    memory = json.loads((profiles_dir / check_id / "memory.json").read_text())
+    assert memory["peak_traced_bytes"] > 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_admin_endpoints_require_the_token(profiles_dir, monkeypatch):
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    monkeypatch.setattr(settings, "admin_token", "")
+    assert client.get("/api/admin/profiles").status_code == 404
+
+    monkeypatch.setattr(settings, "admin_token", "geheim")
+    assert client.get("/api/admin/profiles").status_code == 403
+    assert client.get("/api/admin/profiles", headers={"X-Admin-Token": "fout"}).status_code == 403
+    response = client.get("/api/admin/profiles", headers={"X-Admin-Token": "geheim"})
+    assert response.status_code == 200 and response.json() == []
+    # Profileren via X-Profile is ook alleen voor beheerders
+    response = client.post("/api/report", json={"tool_name": "Slack"}, headers={"X-Profile": "1"})
+    assert response.status_code == 403
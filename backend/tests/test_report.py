@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from docx import Document
+
+from src.models import CategoryResult, CheckResult, ComplianceResult, Source, SubProcessor
+from src.report.generator import generate_report
+from src.report.html import render_html
+
+SCRIPT = "<script>alert(1)</script>"
+
+
+def _result(**overrides) -> ComplianceResult:
+    values = dict(
+        tool_name=f"Acme {SCRIPT}",
+        tool_url="https://acme.example/?a=1&b=2",
+        overall_status="orange",
+        summary='Samenvatting met "quotes" & <b>tags</b>',
+        categories=[
+            CategoryResult(
+                name="Datalocatie",
+                status="orange",
+                summary="Opslag in de VS",
+                checks=[
+                    CheckResult(
+                        name="Opslaglocatie",
+                        description="",
+                        status="orange",
+                        finding=f"Data staat in de VS {SCRIPT}",
+                        sources=[
+                            Source(url="javascript:alert(1)", title="x", quote=f"We host in {SCRIPT}"),
+                            Source(url='https://acme.example/"onmouseover="x', title="y", quote=None),
+                        ],
+                    )
+                ],
+            )
+        ],
+        sub_processors=[
+            SubProcessor(
+                name=f"Evil {SCRIPT}", purpose="Hosting", data_location="US", status="red"
+            )
+        ],
+        sources_consulted=[Source(url="javascript:alert(2)", title=f"Titel {SCRIPT}")],
+    )
+    values.update(overrides)
+    return ComplianceResult(**values)
+
+
+def _html(result: ComplianceResult) -> str:
+    return "".join(render_html(result, datetime(2025, 1, 31, 12, 0)))
+
+
+def test_html_escapes_vendor_text():
+    page = _html(_result())
+    assert SCRIPT not in page
+    assert page.count("&lt;script&gt;alert(1)&lt;/script&gt;") >= 5
+    assert "<q>We host in &lt;script&gt;" in page
+    assert "&lt;b&gt;tags&lt;/b&gt;" in page
+    assert "&quot;quotes&quot; &amp;" in page
+
+
+def test_html_links_only_http_sources():
+    page = _html(_result())
+    assert 'href="javascript' not in page
+    assert "javascript:alert(2)" in page
+    # Een aanhalingsteken in de URL kan het href-attribuut niet verlaten
+    assert 'href="https://acme.example/&quot;onmouseover=&quot;x"' in page
+    assert 'href="https://acme.example/?a=1&amp;b=2"' in page
+
+
+def test_html_renders_all_sections():
+    page = _html(_result())
+    for heading in ("Opslaglocatie", "Evil", "Titel"):
+        assert heading in page
+    assert page.rstrip().endswith("</html>")
+
+
+def test_reports_drop_control_characters():
+    result = _result(tool_name="Acme\x0b", summary="Samen\x01vatting\tmet tab")
+    document = Document(generate_report(result))
+    text = "\n".join(paragraph.text for paragraph in document.paragraphs)
+    assert "Samenvatting\tmet tab" in text
+    assert "\x0b" not in text
+    assert "Acme\x0b" not in _html(result)
@@ -0,0 +1,54 @@
+from src.identity.catalog import CatalogEntry
+from src.identity.resolver import ToolResolver
+
+CATALOG = [
+    CatalogEntry(name="Notion", url="https://www.notion.so"),
+    CatalogEntry(name="Slack", url="https://slack.com"),
+]
+
+
+def test_exact_alias_and_domain_resolve(tmp_path):
+    resolver = ToolResolver(CATALOG, tmp_path / "results.sqlite3")
+    assert resolver.resolve("notion").key == "notion@notion.so"
+    assert resolver.resolve("https://slack.com/intl/nl-nl").key == "slack@slack.com"
+
+
+def test_fuzzy_match_is_only_a_suggestion(tmp_path):
+    resolver = ToolResolver(CATALOG, tmp_path / "results.sqlite3")
+    identity = resolver.resolve("Motion")
+    assert identity.name == "Motion"
+    assert identity.key == "motion"
+    assert resolver.suggest("Motion").name == "Notion"
+    assert resolver.suggest("Notion") is None
+
+
+def test_catalog_host_is_exact_only(tmp_path):
+    catalog = [
+        CatalogEntry(name="AWS", url="https://aws.amazon.com"),
+        CatalogEntry(name="Google Forms", url="https://docs.google.com/forms"),
+    ]
+    resolver = ToolResolver(catalog, tmp_path / "results.sqlite3")
+    resolver.learn("Amazon", "https://www.amazon.com", "search")
+    assert resolver.catalog_host("aws") == "aws.amazon.com"
+    assert resolver.catalog_host("Google Forms") is None
+    assert resolver.catalog_host("Amazon") is None
+    assert resolver.catalog_host("AWX") is None
+
+
+def test_learned_app_store_url_does_not_claim_the_host(tmp_path):
+    resolver = ToolResolver(CATALOG, tmp_path / "results.sqlite3")
+    resolver.learn("Keynote", "https://apps.apple.com/nl/app/keynote/id409183694", "search_tool")
+    assert resolver.resolve("https://apps.apple.com/nl/app/keynote/id409183694").name == "Keynote"
+    assert resolver.resolve("https://apps.apple.com/nl/app/pages/id409201541").name != "Keynote"
+    assert resolver.resolve("keynote").name == "Keynote"
+
+
+def test_old_host_aliases_with_a_path_are_dropped(tmp_path):
+    path = tmp_path / "results.sqlite3"
+    resolver = ToolResolver(CATALOG, path)
+    aliases = {"site:apps.apple.com", "site:apps.apple.com/nl/app/keynote"}
+    resolver._store(aliases, resolver.resolve("Keynote"), "search_tool")
+
+    reopened = ToolResolver(CATALOG, path)
+    assert reopened.resolve("https://apps.apple.com/nl/app/pages").name != "Keynote"
+    assert reopened.resolve("https://apps.apple.com/nl/app/keynote").name == "Keynote"
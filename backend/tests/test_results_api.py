@@ -0,0 +1,68 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.agent.admission import AdmissionRejected
+from src.api import routes
+from src.config import settings
+from src.identity.resolver import ToolIdentity
+from src.models import ComplianceResult
+from src.storage.results import ResultStore
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = ResultStore(tmp_path / "results.sqlite3")
+    store.put("slack", ComplianceResult(
+        tool_name="Slack", tool_url="https://slack.com", overall_status="green", summary="ok",
+        categories=[], sub_processors=[],
+    ))
+    monkeypatch.setattr(routes, "get_result_store", lambda: store)
+    monkeypatch.setattr(routes, "resolve_tool", lambda name: ToolIdentity(name=name))
+
+    started = []
+
+    class Rejected:
+        """Een nieuwe run die direct op een volle wachtrij stuit."""
+
+        async def __aiter__(self):
+            raise AdmissionRejected("druk")
+            yield
+
+        def close(self):
+            pass
+
+    def subscribe(tool_key, tool_name, profile=False):
+        started.append(tool_key)
+        return Rejected()
+
+    monkeypatch.setattr(routes.runs, "subscribe", subscribe)
+    app = FastAPI()
+    app.include_router(routes.router)
+    test_client = TestClient(app)
+    test_client.started = started
+    return test_client
+
+
+def test_result_is_deflated_only_when_accepted(client):
+    deflated = client.get("/api/result/Slack", headers={"Accept-Encoding": "gzip, deflate"})
+    assert deflated.headers["content-encoding"] == "deflate"
+    assert deflated.json()["tool_name"] == "Slack"
+
+    refused = client.get("/api/result/Slack", headers={"Accept-Encoding": "deflate;q=0, gzip"})
+    assert "content-encoding" not in refused.headers
+    assert refused.json()["tool_name"] == "Slack"
+
+
+def test_check_does_not_replay_unless_enabled(client, monkeypatch):
+    # Standaard (TTL 0) start elke check een nieuwe run
+    body = client.post("/api/check", json={"tool_name": "Slack"}).text
+    assert "Recent resultaat" not in body and client.started == ["slack"]
+
+    monkeypatch.setattr(settings, "result_replay_ttl_seconds", 3600)
+    body = client.post("/api/check", json={"tool_name": "Slack"}).text
+    assert "Recent resultaat" in body and client.started == ["slack"]
+
+    # refresh slaat het opgeslagen resultaat altijd over
+    body = client.post("/api/check", json={"tool_name": "Slack", "refresh": True}).text
+    assert "Recent resultaat" not in body and client.started == ["slack", "slack"]
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from src.agent import runs as runs_module
+from src.agent.admission import AdmissionController
+from src.agent.runs import RunRegistry
+from src.models import ProgressUpdate
+
+
+@pytest.fixture
+def admission(monkeypatch) -> AdmissionController:
+    """Een eigen wachtrij en een run die een slot vasthoudt tot hij wordt afgebroken."""
+    controller = AdmissionController(
+        max_concurrent=1, max_queued=4, tokens_per_minute=0,
+        estimated_tokens_per_run=0, estimated_run_seconds=1.0,
+    )
+
+    async def run_compliance_check(tool_name: str):
+        ticket = controller.enqueue()
+        try:
+            async for _ in ticket.wait():
+                yield ProgressUpdate(step="queued", message="", progress=0.0)
+            yield ProgressUpdate(step="agent", message=tool_name, progress=0.1)
+            await asyncio.Event().wait()
+        finally:
+            ticket.release()
+
+    monkeypatch.setattr(runs_module, "run_compliance_check", run_compliance_check)
+    return controller
+
+
+async def _next(subscription) -> ProgressUpdate:
+    return await asyncio.wait_for(subscription.__aiter__().__anext__(), timeout=1.0)
+
+
+def test_last_subscriber_leaving_cancels_the_run(admission):
+    async def scenario():
+        registry = RunRegistry()
+        subscription = registry.subscribe("slack", "Slack")
+        assert (await _next(subscription)).step == "agent"
+        assert admission.running == 1
+        task = subscription._run.task
+
+        subscription.close()
+        await asyncio.wait([task], timeout=1.0)
+
+        assert task.cancelled()
+        assert admission.running == 0
+        assert not registry.active("slack")
+
+    asyncio.run(scenario())
+
+
+def test_second_subscriber_keeps_the_run_alive(admission):
+    async def scenario():
+        registry = RunRegistry()
+        first = registry.subscribe("slack", "Slack")
+        assert (await _next(first)).step == "agent"
+        second = registry.subscribe("slack", "Slack")
+        # Haakt aan bij dezelfde run en krijgt direct de laatste voortgang
+        assert second._run is first._run
+        assert (await _next(second)).step == "agent"
+
+        first.close()
+        await asyncio.sleep(0.05)
+        assert not first._run.task.done()
+        assert admission.running == 1
+        assert registry.active("slack")
+
+        second.close()
+        await asyncio.wait([second._run.task], timeout=1.0)
+        assert second._run.task.cancelled()
+        assert admission.running == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.config import settings
+from src.search.backends import BraveBackend, SearchResult, SearxngBackend, StandInBackend
+from src.search.fanout import SearchService, SearchUnavailable, build_backends
+
+
+def _results(query: str, max_results: int) -> list[tuple[str, str, str]]:
+    return [(f"{query} {i}", f"https://example.org/{i}", "") for i in range(max_results)]
+
+
+def _backend(name: str, latency: float, error_rate: float = 0.0) -> StandInBackend:
+    return StandInBackend(name, _results, latency=lambda: latency, error_rate=error_rate)
+
+
+def test_cancelled_loser_is_not_ranked_first():
+    service = SearchService(
+        [_backend("slower", 0.3), _backend("slow", 0.2), _backend("fast", 0.01)],
+        fanout=2, sufficient=1,
+    )
+    for _ in range(3):
+        asyncio.run(service.search("slack", max_results=3))
+
+    # "slower" verliest steeds en wordt afgebroken, maar telt wel als traag
+    assert service.stats["slower"].latency >= 0.2
+    assert service.ranked()[0].name == "fast"
+
+
+def test_all_backends_failing_is_not_an_empty_result():
+    service = SearchService([_backend("a", 0.0, error_rate=1.0), _backend("b", 0.0, error_rate=1.0)])
+    with pytest.raises(SearchUnavailable):
+        asyncio.run(service.search("slack"))
+
+
+def test_no_hits_is_still_an_empty_result():
+    service = SearchService([StandInBackend("a", lambda query, max_results: [])])
+    assert asyncio.run(service.search("slack")) == []
+
+
+def test_brave_and_searxng_parse_their_responses():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "api.search.brave.com":
+            assert request.headers["X-Subscription-Token"] == "key"
+            assert request.url.params["count"] == "3"
+            return httpx.Response(200, json={"web": {"results": [
+                {"title": "Slack", "url": "https://slack.com", "description": "Chat"},
+                {"title": "Zonder URL"},
+            ]}})
+        assert request.url.path == "/searx/search" and request.url.params["format"] == "json"
+        return httpx.Response(200, json={"results": [
+            {"title": "Slack privacy", "url": "https://slack.com/privacy", "content": "Policy"},
+        ]})
+
+    transport = httpx.MockTransport(handler)
+    brave = BraveBackend("key", timeout=1.0, transport=transport)
+    searxng = SearxngBackend("https://search.example.org/searx/", timeout=1.0, transport=transport)
+
+    assert asyncio.run(brave.search("slack", 3)) == [
+        SearchResult(title="Slack", url="https://slack.com", snippet="Chat", backend="brave")
+    ]
+    assert [r.url for r in asyncio.run(searxng.search("slack", 3))] == ["https://slack.com/privacy"]
+
+
+def test_retired_bing_and_unconfigured_backends_are_skipped(monkeypatch):
+    monkeypatch.setattr(settings, "search_backends", ["bing", "ddgs", "brave", "searxng"])
+    monkeypatch.setattr(settings, "brave_search_api_key", "")
+    monkeypatch.setattr(settings, "searxng_url", "https://search.example.org")
+    assert [backend.name for backend in build_backends()] == ["ddgs", "searxng"]
@@ -0,0 +1,69 @@
+import asyncio
+import typing
+
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+from src.agent import structured
+from src.agent.structured import _FILLED_AFTERWARDS, RESPONSE_FORMAT, _validate, strict_schema
+from src.models import ComplianceResult
+
+
+def _nested_models(model: type[BaseModel], seen: set) -> None:
+    seen.add(model)
+    for name, field in model.model_fields.items():
+        if name in _FILLED_AFTERWARDS:
+            continue
+        for arg in typing.get_args(field.annotation) or (field.annotation,):
+            for inner in typing.get_args(arg) or (arg,):
+                if isinstance(inner, type) and issubclass(inner, BaseModel) and inner not in seen:
+                    _nested_models(inner, seen)
+
+
+def test_every_field_survives_strict_schema():
+    schema = strict_schema(ComplianceResult, omit=_FILLED_AFTERWARDS)
+    models: set[type[BaseModel]] = set()
+    _nested_models(ComplianceResult, models)
+
+    for model in models:
+        node = schema if model is ComplianceResult else schema["$defs"][model.__name__]
+        expected = set(model.model_fields) - _FILLED_AFTERWARDS
+        assert set(node["properties"]) == expected, model.__name__
+        assert set(node["required"]) == expected, model.__name__
+        assert node["additionalProperties"] is False
+
+
+def test_source_title_is_kept():
+    source = RESPONSE_FORMAT["json_schema"]["schema"]["$defs"]["Source"]
+    assert source["properties"]["title"] == {"type": "string"}
+
+
+def test_schema_conforming_answer_validates():
+    answer = """{
+      "tool_name": "Slack", "tool_url": "https://slack.com", "overall_status": "orange",
+      "summary": "s",
+      "categories": [{"name": "Beveiliging", "status": "green", "summary": "s", "checks": [
+        {"name": "Encryptie", "description": "d", "status": "green", "finding": "f",
+         "sources": [{"url": "https://slack.com/security", "title": "Security", "quote": null}]}
+      ]}],
+      "sub_processors": [{"name": "AWS", "purpose": "hosting", "data_location": "VS",
+        "status": "orange", "source": null}],
+      "sources_consulted": [{"url": "https://slack.com/privacy", "title": "Privacy", "quote": null}]
+    }"""
+    result = _validate(answer)
+    assert result.categories[0].checks[0].sources[0].title == "Security"
+    assert result.sources_consulted[0].title == "Privacy"
+
+
+def test_repair_reports_its_tokens(monkeypatch):
+    class RepairModel:
+        async def ainvoke(self, messages):
+            return AIMessage(
+                content='{"tool_name": "Slack", "overall_status": "orange", "summary": "s", '
+                '"categories": [], "sub_processors": [], "sources_consulted": []}',
+                usage_metadata={"input_tokens": 900, "output_tokens": 100, "total_tokens": 1000},
+            )
+
+    monkeypatch.setattr(structured, "_get_repair_model", RepairModel)
+    result, tokens = asyncio.run(structured.parse_result("geen json", "Slack"))
+    assert result.tool_name == "Slack" and tokens == 1000
@@ -2,7 +2,9 @@
 // Dit omzeilt de EPERM-restricties op bedrijfslaptops.
 import { createRequire } from "module";
 import { fileURLToPath } from "url";
-import { dirname, resolve } from "path";
+import { dirname, resolve, join, extname } from "path";
+import { readdirSync, readFileSync, writeFileSync, statSync } from "fs";
+import { gzipSync, brotliCompressSync, constants as zlibConstants } from "zlib";
 
 const __dirname = dirname(fileURLToPath(import.meta.url));
 const require = createRequire(import.meta.url);
@@ -36,4 +38,33 @@ await build({
   },
 });
 
+// Precomprimeer tekst-assets zodat de backend ze niet bij het opstarten
+// hoeft te comprimeren (zie backend/src/static_files.py)
+const COMPRESSIBLE = new Set([".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".wasm"]);
+
+function precompress(dir) {
+  let count = 0;
+  for (const name of readdirSync(dir)) {
+    const path = join(dir, name);
+    if (statSync(path).isDirectory()) {
+      count += precompress(path);
+      continue;
+    }
+    if (!COMPRESSIBLE.has(extname(name))) continue;
+    const content = readFileSync(path);
+    writeFileSync(`${path}.gz`, gzipSync(content, { level: 9 }));
+    writeFileSync(
+      `${path}.br`,
+      brotliCompressSync(content, {
+        params: { [zlibConstants.BROTLI_PARAM_QUALITY]: zlibConstants.BROTLI_MAX_QUALITY },
+      })
+    );
+    count += 1;
+  }
+  return count;
+}
+
+const compressed = precompress(resolve(__dirname, "dist"));
+console.log(`${compressed} bestanden gecomprimeerd (gzip + brotli)`);
+
 console.log("Build voltooid! Output in frontend/dist/");
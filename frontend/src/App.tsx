@@ -19,8 +19,7 @@ export default function App() {
   const [error, setError] = useState("");
   const cancelRef = useRef<(() => void) | null>(null);
 
-  const handleToolSelect = useCallback((name: string, _url: string) => {
-    const cleanName = name.split(" - ")[0].split(" | ")[0].split(" — ")[0].trim();
+  const runCheck = useCallback((cleanName: string, refresh: boolean) => {
     setToolName(cleanName);
     setState("loading");
     setError("");
@@ -35,12 +34,24 @@ export default function App() {
       (err) => {
         setError(err);
         setState("error");
-      }
+      },
+      refresh
     );
 
     cancelRef.current = cancel;
   }, []);
 
+  const handleToolSelect = useCallback(
+    (name: string, _url: string) => {
+      const cleanName = name.split(" - ")[0].split(" | ")[0].split(" — ")[0].trim();
+      runCheck(cleanName, false);
+    },
+    [runCheck]
+  );
+
+  // Een nieuwe run, ook als de server nog een recent resultaat heeft
+  const handleRefresh = useCallback(() => runCheck(toolName, true), [runCheck, toolName]);
+
   const handleReset = useCallback(() => {
     if (cancelRef.current) cancelRef.current();
     setState("home");
@@ -229,7 +240,7 @@ export default function App() {
 
         {state === "result" && result && (
           <div className="pt-4">
-            <ResultView result={result} onReset={handleReset} />
+            <ResultView result={result} onReset={handleReset} onRefresh={handleRefresh} />
           </div>
         )}
 
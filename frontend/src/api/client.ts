@@ -20,6 +20,23 @@ export interface SubProcessor {
   data_location: string;
   status: "green" | "orange" | "red";
   source?: Source;
+  dpf?: DpfParticipation | null;
+  hosting?: HostingLocation[];
+}
+
+export interface HostingLocation {
+  host: string;
+  ip: string;
+  country?: string | null;
+  asn?: number | null;
+  network?: string | null;
+  cdn: boolean;
+}
+
+export interface DpfParticipation {
+  organization: string;
+  active: boolean;
+  url: string;
 }
 
 export interface CategoryResult {
@@ -44,6 +61,12 @@ export interface ProgressUpdate {
   step: string;
   message: string;
   progress: number;
+  queue_position?: number | null;
+  eta_seconds?: number | null;
+  pages_fetched?: number | null;
+  checks_resolved?: number | null;
+  checks_total?: number | null;
+  sub_processors_resolved?: number | null;
 }
 
 export interface LeadData {
@@ -73,14 +96,15 @@ export function startComplianceCheck(
   toolName: string,
   onProgress: (update: ProgressUpdate) => void,
   onResult: (result: ComplianceResult) => void,
-  onError: (error: string) => void
+  onError: (error: string) => void,
+  refresh = false
 ): () => void {
   const controller = new AbortController();
 
   fetch("/api/check", {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ tool_name: toolName }),
+    body: JSON.stringify({ tool_name: toolName, refresh }),
     signal: controller.signal,
   })
     .then(async (response) => {
@@ -150,6 +174,10 @@ export async function submitLead(lead: LeadData): Promise<boolean> {
   }
 }
 
+export function reportHtmlUrl(toolName: string): string {
+  return `/api/report/${encodeURIComponent(toolName)}/html`;
+}
+
 export async function downloadReport(toolName: string): Promise<void> {
   const response = await fetch("/api/report", {
     method: "POST",
@@ -1,6 +1,6 @@
 import { useState } from "react";
 import type { LeadData } from "../api/client";
-import { downloadReport, submitLead } from "../api/client";
+import { downloadReport, reportHtmlUrl, submitLead } from "../api/client";
 
 export default function ContactForm({ toolName }: { toolName: string }) {
   const [form, setForm] = useState<LeadData>({
@@ -53,6 +53,14 @@ export default function ContactForm({ toolName }: { toolName: string }) {
           Check je downloads map. We nemen binnenkort contact met je op om te bespreken
           hoe je jouw tools verantwoord kunt inzetten.
         </p>
+        <a
+          href={reportHtmlUrl(toolName)}
+          target="_blank"
+          rel="noopener noreferrer"
+          className="inline-block mb-4 text-sm font-semibold text-samhoud-blue hover:underline"
+        >
+          Bekijk het rapport in je browser
+        </a>
         <p className="text-xs text-samhoud-blue-pale">
           Heb je vragen? Mail ons op data.team@samhoud.com
         </p>
@@ -2,17 +2,20 @@ import type { ProgressUpdate } from "../api/client";
 
 const STEPS = [
   { key: "start", label: "Check starten", icon: "rocket" },
-  { key: "tool_0", label: "Website zoeken", icon: "search" },
-  { key: "tool_1", label: "Privacy policy lezen", icon: "doc" },
-  { key: "tool_2", label: "Security analyseren", icon: "shield" },
-  { key: "tool_3", label: "Sub-verwerkers zoeken", icon: "chain" },
-  { key: "tool_4", label: "Sub-verwerkers checken", icon: "verify" },
-  { key: "tool_5", label: "Datarechten beoordelen", icon: "rights" },
-  { key: "tool_6", label: "Certificaten checken", icon: "cert" },
-  { key: "tool_7", label: "Eindoordeel bepalen", icon: "result" },
+  { key: "search", label: "Website zoeken", icon: "search" },
+  { key: "discover", label: "Compliance-pagina's vinden", icon: "chain" },
+  { key: "fetch", label: "Pagina's lezen", icon: "doc" },
+  { key: "checks", label: "Checks beoordelen", icon: "shield" },
+  { key: "sub_processors", label: "Sub-verwerkers beoordelen", icon: "verify" },
   { key: "parsing", label: "Verwerken", icon: "done" },
 ];
 
+function formatEta(seconds: number): string {
+  if (seconds < 60) return "minder dan een minuut";
+  const minutes = Math.round(seconds / 60);
+  return minutes === 1 ? "ongeveer 1 minuut" : `ongeveer ${minutes} minuten`;
+}
+
 function StepIcon({ icon, active, done }: { icon: string; active: boolean; done: boolean }) {
   const color = done ? "text-status-green" : active ? "text-samhoud-blue" : "text-samhoud-blue-pale";
   const icons: Record<string, JSX.Element> = {
@@ -139,9 +142,14 @@ export default function ProgressView({
       </div>
 
       {/* Current message */}
-      <p className="text-center text-samhoud-blue-soft text-sm mb-6">
-        {update.message}
-      </p>
+      <div className="text-center mb-6">
+        <p className="text-samhoud-blue-soft text-sm">{update.message}</p>
+        {update.step !== "queued" && update.eta_seconds != null && (
+          <p className="text-samhoud-blue-pale text-xs mt-1">
+            Nog {formatEta(update.eta_seconds)}
+          </p>
+        )}
+      </div>
 
       {/* Cancel */}
       <div className="text-center">
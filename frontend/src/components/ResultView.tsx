@@ -30,24 +30,37 @@ const STATUS_EXPLANATIONS = {
 export default function ResultView({
   result,
   onReset,
+  onRefresh,
 }: {
   result: ComplianceResult;
   onReset: () => void;
+  onRefresh: () => void;
 }) {
   const statusInfo = STATUS_EXPLANATIONS[result.overall_status];
 
   return (
     <div className="max-w-3xl mx-auto space-y-6 animate-fade-in-up">
-      {/* Back button */}
-      <button
-        onClick={onReset}
-        className="inline-flex items-center gap-1.5 text-sm text-samhoud-blue-soft hover:text-samhoud-blue transition-colors cursor-pointer"
-      >
-        <svg className="w-4 h-4" fill="none" viewBox="0 0 24 24" stroke="currentColor" strokeWidth={2}>
-          <path d="M15 19l-7-7 7-7" />
-        </svg>
-        Nieuwe check
-      </button>
+      {/* Back and refresh buttons */}
+      <div className="flex items-center justify-between">
+        <button
+          onClick={onReset}
+          className="inline-flex items-center gap-1.5 text-sm text-samhoud-blue-soft hover:text-samhoud-blue transition-colors cursor-pointer"
+        >
+          <svg className="w-4 h-4" fill="none" viewBox="0 0 24 24" stroke="currentColor" strokeWidth={2}>
+            <path d="M15 19l-7-7 7-7" />
+          </svg>
+          Nieuwe check
+        </button>
+        <button
+          onClick={onRefresh}
+          className="inline-flex items-center gap-1.5 text-sm text-samhoud-blue-soft hover:text-samhoud-blue transition-colors cursor-pointer"
+        >
+          <svg className="w-4 h-4" fill="none" viewBox="0 0 24 24" stroke="currentColor" strokeWidth={2}>
+            <path d="M4 4v5h5M20 20v-5h-5M5.1 15a7 7 0 0011.8 2.9L20 15M4 9l3.1-2.9A7 7 0 0118.9 9" />
+          </svg>
+          Opnieuw checken
+        </button>
+      </div>
 
       {/* Tool header */}
       <div className="glass-card rounded-2xl p-8 text-center">
@@ -168,6 +181,29 @@ export default function ResultView({
                       <path d="M15 11a3 3 0 11-6 0 3 3 0 016 0z" />
                     </svg>
                     <span className="text-xs text-samhoud-blue-soft">{sp.data_location}</span>
+                    {sp.dpf && (
+                      <a
+                        href={sp.dpf.url}
+                        target="_blank"
+                        rel="noopener noreferrer"
+                        title={sp.dpf.organization}
+                        className={`ml-2 text-xs font-semibold hover:underline ${
+                          sp.dpf.active ? "text-status-green" : "text-status-red"
+                        }`}
+                      >
+                        {sp.dpf.active ? "DPF actief" : "DPF niet actief"}
+                      </a>
+                    )}
+                    {sp.hosting && sp.hosting.length > 0 && (
+                      <span
+                        title={sp.hosting
+                          .map((h) => `${h.host} → ${h.ip}${h.network ? ` (${h.network})` : ""}`)
+                          .join("\n")}
+                        className="ml-2 text-xs text-samhoud-blue-pale"
+                      >
+                        Hosting: {[...new Set(sp.hosting.map((h) => (h.cdn ? "CDN" : h.country ?? "?")))].join(", ")}
+                      </span>
+                    )}
                   </div>
                 </div>
                 <StatusPill status={sp.status} />